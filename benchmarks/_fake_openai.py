@@ -0,0 +1,84 @@
+"""Tiny OpenAI-compatible HTTP server for local benchmarks.
+
+Serves ``POST /v1/embeddings`` and ``POST /v1/chat/completions`` with a fixed
+artificial latency so client-side overhead and concurrency can be measured
+without a real provider.
+"""
+
+from __future__ import annotations
+
+import json
+import threading
+import time
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Iterator
+
+
+def _handler(latency_s: float, dim: int):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+        disable_nagle_algorithm = True
+
+        def log_message(self, *args) -> None:  # noqa: D401, ANN002
+            pass
+
+        def _send_json(self, body: dict) -> None:
+            data = json.dumps(body).encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def do_POST(self) -> None:  # noqa: N802
+            length = int(self.headers.get("Content-Length") or 0)
+            req = json.loads(self.rfile.read(length) or b"{}")
+            time.sleep(latency_s)
+            if self.path.endswith("/embeddings"):
+                inputs = req.get("input") or []
+                if isinstance(inputs, str):
+                    inputs = [inputs]
+                data = [
+                    {
+                        "object": "embedding",
+                        "index": i,
+                        "embedding": [float((i + j) % 7) for j in range(dim)],
+                    }
+                    for i, _ in enumerate(inputs)
+                ]
+                self._send_json(
+                    {"object": "list", "data": data, "model": req.get("model"), "usage": {}}
+                )
+            else:
+                self._send_json(
+                    {
+                        "id": "cmpl-1",
+                        "object": "chat.completion",
+                        "created": int(time.time()),
+                        "model": req.get("model"),
+                        "choices": [
+                            {
+                                "index": 0,
+                                "message": {"role": "assistant", "content": "ok"},
+                                "finish_reason": "stop",
+                            }
+                        ],
+                    }
+                )
+
+    return Handler
+
+
+@contextmanager
+def fake_openai_server(latency_s: float = 0.05, dim: int = 8) -> Iterator[str]:
+    """Run the fake server in a background thread and yield its ``base_url``."""
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _handler(latency_s, dim))
+    server.daemon_threads = True
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield f"http://127.0.0.1:{server.server_address[1]}/v1"
+    finally:
+        server.shutdown()
+        server.server_close()
@@ -0,0 +1,55 @@
+"""Compare the ``token`` and ``offsets`` strategies of ``split_text``.
+
+Doubles the document length each row; the ``offsets`` engine should keep a
+flat us/char column (linear time) while ``token`` re-encodes on every probe.
+
+    python benchmarks/bench_chunker_offsets.py [--max-words 64000]
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+
+from kit_chunker.splitters import split_text
+from kit_chunker.tokenizers import get_token_estimator
+
+
+def _make_text(words: int) -> str:
+    vocab = ["contract", "party", "shall", "clause", "hereby", "agreement", "term", "notice."]
+    return " ".join(vocab[i % len(vocab)] + str(i % 97) for i in range(words))
+
+
+def _time(text: str, strategy: str, est, max_tokens: int, overlap: int) -> tuple[float, int]:
+    t0 = time.perf_counter()
+    chunks = split_text(
+        text, max_tokens=max_tokens, overlap=overlap, strategy=strategy, token_estimator=est
+    )
+    return time.perf_counter() - t0, len(chunks)
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--min-words", type=int, default=2000)
+    ap.add_argument("--max-words", type=int, default=64000)
+    ap.add_argument("--max-tokens", type=int, default=512)
+    ap.add_argument("--overlap", type=int, default=64)
+    ap.add_argument("--estimator", default="tiktoken")
+    args = ap.parse_args()
+
+    est = get_token_estimator(args.estimator)
+    print(f"estimator={type(est).__name__} max_tokens={args.max_tokens} overlap={args.overlap}")
+    print(f"{'words':>8} {'chars':>9} {'strategy':>8} {'chunks':>7} {'sec':>8} {'us/char':>8}")
+    words = args.min_words
+    while words <= args.max_words:
+        text = _make_text(words)
+        for strategy in ("token", "offsets"):
+            elapsed, n_chunks = _time(text, strategy, est, args.max_tokens, args.overlap)
+            per_char = elapsed / len(text) * 1e6
+            row = f"{words:>8} {len(text):>9} {strategy:>8} {n_chunks:>7}"
+            print(f"{row} {elapsed:>8.3f} {per_char:>8.3f}")
+        words *= 2
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+"""Embedding throughput vs ``concurrency`` against a local fake server.
+
+Each request sleeps ``--latency`` seconds server-side, so throughput should
+grow roughly linearly with the number of batches kept in flight.
+
+    python benchmarks/bench_embed_concurrency.py [--texts 2048] [--latency 0.05]
+"""
+
+from __future__ import annotations
+
+import argparse
+import logging
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(__file__))
+
+from _fake_openai import fake_openai_server  # noqa: E402
+from kit_common.config import Settings  # noqa: E402
+from kit_llm.client import get_default_client  # noqa: E402
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--texts", type=int, default=2048)
+    ap.add_argument("--batch-size", type=int, default=64)
+    ap.add_argument("--latency", type=float, default=0.05)
+    ap.add_argument("--levels", default="1,2,4,8,16")
+    args = ap.parse_args()
+
+    logging.getLogger("kit_llm.client").disabled = True
+    texts = [f"chunk {i}" for i in range(args.texts)]
+    with fake_openai_server(latency_s=args.latency) as base_url:
+        st = Settings(
+            openai_api_key="bench", openai_base_url=base_url, llm_embed_model="fake-embed"
+        )
+        client = get_default_client(st)
+        print(f"texts={args.texts} batch_size={args.batch_size} latency={args.latency}s")
+        print(f"{'concurrency':>11} {'sec':>7} {'texts/s':>9}")
+        for level in (int(x) for x in args.levels.split(",")):
+            t0 = time.perf_counter()
+            vecs = client.embed_texts(texts, batch_size=args.batch_size, concurrency=level)
+            elapsed = time.perf_counter() - t0
+            assert len(vecs) == len(texts)
+            print(f"{level:>11} {elapsed:>7.3f} {len(texts) / elapsed:>9.0f}")
+
+
+if __name__ == "__main__":
+    main()
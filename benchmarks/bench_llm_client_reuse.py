@@ -0,0 +1,57 @@
+"""Per-call overhead of ``kit_llm.chat.chat`` with and without client reuse.
+
+Runs small chat calls against a local fake server (near-zero latency) so the
+measured time is dominated by settings loading, client construction and
+connection setup.
+
+    python benchmarks/bench_llm_client_reuse.py [--calls 200]
+"""
+
+from __future__ import annotations
+
+import argparse
+import logging
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(__file__))
+
+from _fake_openai import fake_openai_server  # noqa: E402
+from kit_llm.chat import chat  # noqa: E402
+from kit_llm.client import clear_client_cache  # noqa: E402
+
+
+def _run(calls: int, reuse: bool) -> list[float]:
+    samples = []
+    msgs = [{"role": "user", "content": "ping"}]
+    for _ in range(calls):
+        if not reuse:
+            clear_client_cache()
+        t0 = time.perf_counter()
+        chat(msgs)
+        samples.append((time.perf_counter() - t0) * 1000)
+    return samples
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--calls", type=int, default=200)
+    args = ap.parse_args()
+
+    logging.getLogger("kit_llm.client").disabled = True
+    with fake_openai_server(latency_s=0.0) as base_url:
+        os.environ.update(
+            OPENAI_API_KEY="bench", OPENAI_BASE_URL=base_url, LLM_CHAT_MODEL="fake-chat"
+        )
+        print(f"{'mode':>10} {'p50 ms':>8} {'p95 ms':>8}")
+        for label, reuse in (("new/call", False), ("cached", True)):
+            clear_client_cache()
+            samples = sorted(_run(args.calls, reuse))
+            p95 = samples[int(len(samples) * 0.95) - 1]
+            print(f"{label:>10} {statistics.median(samples):>8.2f} {p95:>8.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""Chunk counts for ``split_pdf`` page mode vs document (cross-page) mode.
+
+Uses a real PDF when ``--pdf`` is given, otherwise synthetic pages that mix
+short pages with paragraphs running across page breaks.
+
+    python benchmarks/bench_pdf_cross_page.py [--pdf file.pdf] [--max-tokens 400]
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import time
+
+from kit_chunker import pdf as pdf_mod
+from kit_chunker.tokenizers import get_token_estimator
+
+
+def _synthetic_pages(n: int, seed: int = 7) -> list[tuple[int, str]]:
+    rnd = random.Random(seed)
+    words = ["clause", "party", "agreement", "shall", "notice", "term", "hereby", "obligation"]
+    pages = []
+    for i in range(1, n + 1):
+        # every fifth page is a short header/footer-like page
+        n_words = rnd.randint(10, 40) if i % 5 == 0 else rnd.randint(150, 450)
+        pages.append((i, " ".join(rnd.choice(words) for _ in range(n_words))))
+    return pages
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--pdf")
+    ap.add_argument("--pages", type=int, default=200)
+    ap.add_argument("--max-tokens", type=int, default=400)
+    ap.add_argument("--overlap", type=int, default=40)
+    ap.add_argument("--estimator", default="tiktoken")
+    args = ap.parse_args()
+
+    est = get_token_estimator(args.estimator)
+    if args.pdf:
+        path = args.pdf
+    else:
+        pages = _synthetic_pages(args.pages)
+        pdf_mod.extract_text_from_pdf = lambda p, **kw: pages  # type: ignore[assignment]
+        path = "synthetic.pdf"
+
+    counts = {}
+    print(f"{'mode':>9} {'chunks':>7} {'tokens':>8} {'sec':>7}")
+    for mode in ("page", "document"):
+        t0 = time.perf_counter()
+        chunks = pdf_mod.split_pdf(
+            path, max_tokens=args.max_tokens, overlap=args.overlap, token_estimator=est, mode=mode
+        )
+        elapsed = time.perf_counter() - t0
+        counts[mode] = len(chunks)
+        tokens = sum(c.tokens or 0 for c in chunks)
+        print(f"{mode:>9} {len(chunks):>7} {tokens:>8} {elapsed:>7.3f}")
+    reduction = 1 - counts["document"] / max(1, counts["page"])
+    print(f"chunk/vector count reduction: {reduction:.1%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""Recall, memory and QPS of ``NumpyBackend`` with and without quantization.
+
+Builds a synthetic clustered dataset, takes exact float32 top-k as ground truth
+and reports recall@k, bytes per vector and queries per second for float,
+scalar (int8) and binary codes, with and without float rescoring. ``scan B``
+is what every query reads (must be in RAM); ``float B`` is only touched for the
+rescored shortlist and can stay on disk (``NumpyBackend(path, mmap=True)``).
+
+    python benchmarks/bench_vector_quantization.py [--points 50000] [--dim 384] [--k 10]
+"""
+
+from __future__ import annotations
+
+import argparse
+import logging
+import time
+
+import numpy as np
+
+from kit_vector import CollectionParams, NumpyBackend
+
+
+def _dataset(points: int, dim: int, queries: int, seed: int = 0) -> tuple[np.ndarray, np.ndarray]:
+    rng = np.random.default_rng(seed)
+    centers = rng.standard_normal((max(1, points // 100), dim), dtype=np.float32)
+    data = centers[rng.integers(0, len(centers), points)]
+    data += 0.5 * rng.standard_normal((points, dim), dtype=np.float32)
+    picks = rng.integers(0, points, queries)
+    qs = data[picks] + 0.3 * rng.standard_normal((queries, dim), dtype=np.float32)
+    return data, qs
+
+
+def _bytes_per_vector(backend: NumpyBackend, name: str, rescore: bool) -> tuple[float, float]:
+    col = backend._collections[name]
+    floats = col.matrix[0].nbytes
+    if col.codes is None:
+        return floats, 0.0
+    scales = 0 if col.scales is None else col.scales[0].nbytes
+    return col.codes[0].nbytes + scales, floats if rescore else 0.0
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--points", type=int, default=50_000)
+    ap.add_argument("--dim", type=int, default=384)
+    ap.add_argument("--queries", type=int, default=200)
+    ap.add_argument("--k", type=int, default=10)
+    ap.add_argument("--oversampling", type=float, default=4.0)
+    args = ap.parse_args()
+
+    logging.getLogger("kit_vector.numpy_backend").disabled = True
+    data, queries = _dataset(args.points, args.dim, args.queries)
+    ids = [str(i) for i in range(args.points)]
+    configs = [
+        ("float32", None, True),
+        ("scalar", "scalar", True),
+        ("scalar/raw", "scalar", False),
+        ("binary", "binary", True),
+        ("binary/raw", "binary", False),
+    ]
+    truth: list[set[str]] = []
+    print(f"{'mode':>11} {'recall@k':>9} {'scan B':>7} {'float B':>8} {'qps':>8}")
+    for label, quantization, rescore in configs:
+        backend = NumpyBackend()
+        name = label.replace("/", "_")
+        params = CollectionParams(
+            name=name,
+            vector_size=args.dim,
+            distance="cosine",
+            quantization=quantization,
+            oversampling=args.oversampling,
+            rescore=rescore,
+        )
+        backend.ensure_collection(params)
+        backend.upsert(name, data, [], ids=ids)
+        t0 = time.perf_counter()
+        hits = [backend.search(name, q, k=args.k) for q in queries]
+        elapsed = time.perf_counter() - t0
+        found = [{h.id for h in hs} for hs in hits]
+        if not truth:
+            truth = found
+        recall = np.mean([len(f & t) / args.k for f, t in zip(found, truth)])
+        scan, floats = _bytes_per_vector(backend, name, rescore)
+        qps = len(queries) / elapsed
+        print(f"{label:>11} {recall:>9.3f} {scan:>7.0f} {floats:>8.0f} {qps:>8.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""``QdrantBackend.search_batch`` vs one ``search`` call per query.
+
+The Qdrant client is replaced by an in-process stand-in that scores a random
+collection with NumPy and sleeps ``--rtt-ms`` per request, so the table shows
+what batching saves in round trips independently of a running server.
+
+    python benchmarks/bench_vector_search_batch.py [--queries 32] [--rtt-ms 2]
+"""
+
+from __future__ import annotations
+
+import argparse
+import logging
+import statistics
+import time
+import types
+
+import numpy as np
+
+import kit_vector.qdrant_backend as qb
+from kit_vector import QdrantBackend
+
+
+class _SimulatedClient:
+    def __init__(self, data: np.ndarray, rtt_s: float):
+        self.data = data
+        self.rtt_s = rtt_s
+
+    def _top(self, vector, limit: int) -> list:  # noqa: ANN001
+        scores = self.data @ np.asarray(vector, dtype=np.float32)
+        idx = np.argpartition(-scores, limit)[:limit]
+        return [types.SimpleNamespace(id=int(i), score=float(scores[i]), payload={}) for i in idx]
+
+    def search(self, collection_name, query_vector, limit, query_filter=None):  # noqa: ANN001, ARG002
+        time.sleep(self.rtt_s)
+        return self._top(query_vector, limit)
+
+    def search_batch(self, collection_name, requests):  # noqa: ANN001, ARG002
+        time.sleep(self.rtt_s)
+        return [self._top(r.vector, r.limit) for r in requests]
+
+    def query_batch_points(self, collection_name, requests):  # noqa: ANN001, ARG002
+        time.sleep(self.rtt_s)
+        return [types.SimpleNamespace(points=self._top(r.query, r.limit)) for r in requests]
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--points", type=int, default=20_000)
+    ap.add_argument("--dim", type=int, default=384)
+    ap.add_argument("--queries", type=int, default=32)
+    ap.add_argument("--rtt-ms", type=float, default=2.0)
+    ap.add_argument("--repeat", type=int, default=5)
+    args = ap.parse_args()
+
+    logging.getLogger("kit_common.retry").disabled = True
+    rng = np.random.default_rng(0)
+    data = rng.standard_normal((args.points, args.dim), dtype=np.float32)
+    queries = rng.standard_normal((args.queries, args.dim), dtype=np.float32)
+    qb.QdrantClient = lambda **_: _SimulatedClient(data, args.rtt_ms / 1000)  # type: ignore[assignment]
+    backend = QdrantBackend(url="http://simulated")
+
+    def _loop() -> None:
+        for q in queries:
+            backend.search("bench", q, k=10)
+
+    def _batch() -> None:
+        backend.search_batch("bench", queries, k=10)
+
+    print(f"{'mode':>8} {'queries':>8} {'ms/run':>8} {'qps':>10}")
+    for label, fn in (("loop", _loop), ("batch", _batch)):
+        samples = []
+        for _ in range(args.repeat):
+            t0 = time.perf_counter()
+            fn()
+            samples.append(time.perf_counter() - t0)
+        ms = statistics.median(samples) * 1000
+        print(f"{label:>8} {args.queries:>8} {ms:>8.1f} {args.queries / (ms / 1000):>10.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,17 +1,37 @@
 from __future__ import annotations
 
-from .tokenizers import TokenEstimator, get_token_estimator
+from .tokenizers import (
+    TokenEstimator,
+    OffsetTokenEstimator,
+    BatchTokenEstimator,
+    CachedTokenEstimator,
+    get_token_estimator,
+    clear_token_estimators,
+    count_many,
+)
 from .splitters import split_text, split_markdown
-from .pdf import extract_text_from_pdf, split_pdf
+from .pdf import extract_text_from_pdf, iter_pdf_pages, split_pdf, iter_split_pdf
+from .streaming import iter_split_text, iter_split_markdown
+from .batch import split_documents
 from .errors import ChunkerError
 
 __all__ = [
     "TokenEstimator",
+    "OffsetTokenEstimator",
+    "BatchTokenEstimator",
+    "CachedTokenEstimator",
     "get_token_estimator",
+    "clear_token_estimators",
+    "count_many",
     "split_text",
     "split_markdown",
+    "iter_split_text",
+    "iter_split_markdown",
     "extract_text_from_pdf",
+    "iter_pdf_pages",
     "split_pdf",
+    "iter_split_pdf",
+    "split_documents",
     "ChunkerError",
 ]
 
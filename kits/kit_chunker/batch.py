@@ -0,0 +1,132 @@
+from __future__ import annotations
+
+import os
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Executor, Future, ProcessPoolExecutor, wait
+from itertools import islice
+from typing import Any, Callable, Iterable, Iterator
+
+from kit_common.models import Chunk, Document
+from .tokenizers import TokenEstimator, get_token_estimator
+from .splitters import split_text, split_markdown
+from .pdf import split_pdf
+
+# estimator built once per worker process by _init_worker
+_worker_est: TokenEstimator | None = None
+
+
+def _init_worker(estimator: str) -> None:
+    global _worker_est
+    _worker_est = get_token_estimator(estimator)
+
+
+def _detect_kind(doc: Document) -> str:
+    src = (doc.source or "").lower()
+    if src.endswith(".pdf") and not doc.text:
+        return "pdf"
+    if src.endswith((".md", ".markdown")):
+        return "markdown"
+    return "text"
+
+
+def _split_one(doc: Document, kind: str, opts: dict, est: TokenEstimator) -> list[Chunk]:
+    if kind == "auto":
+        kind = _detect_kind(doc)
+    common = dict(
+        max_tokens=opts["max_tokens"],
+        overlap=opts["overlap"],
+        strategy=opts["strategy"],
+        token_estimator=est,
+        doc_id=doc.id,
+        source=doc.source,
+    )
+    if kind == "pdf":
+        # for PDFs the document source is the file path
+        return split_pdf(doc.source or "", **common)
+    if kind == "markdown":
+        return split_markdown(doc.text, **common)
+    return split_text(doc.text, **common)
+
+
+def _split_batch(docs: list[Document], kind: str, opts: dict) -> list[tuple[str, list[Chunk]]]:
+    est = _worker_est or get_token_estimator(opts["estimator"])
+    return [(d.id, _split_one(d, kind, opts, est)) for d in docs]
+
+
+def _batches(docs: Iterable[Document], size: int) -> Iterator[list[Document]]:
+    it = iter(docs)
+    while batch := list(islice(it, size)):
+        yield batch
+
+
+def _bounded_map(
+    ex: Executor, fn: Callable, batches: Iterator, *args: Any, limit: int, ordered: bool = True
+) -> Iterator:
+    # submit fn(batch, *args) keeping at most `limit` futures in flight
+    pending: deque[Future] = deque()
+
+    def _fill() -> None:
+        while len(pending) < limit:
+            batch = next(batches, None)
+            if batch is None:
+                return
+            pending.append(ex.submit(fn, batch, *args))
+
+    _fill()
+    while pending:
+        if ordered:
+            fut = pending.popleft()
+        else:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            fut = done.pop()
+            pending.remove(fut)
+        result = fut.result()
+        _fill()
+        yield result
+
+
+def split_documents(
+    docs: Iterable[Document],
+    *,
+    workers: int | None = None,
+    kind: str = "auto",
+    max_tokens: int = 512,
+    overlap: int = 64,
+    strategy: str = "token",
+    estimator: str = "tiktoken",
+    chunksize: int = 16,
+    ordered: bool = True,
+    max_pending: int | None = None,
+) -> Iterator[tuple[str, list[Chunk]]]:
+    """Chunk many documents across a process pool, yielding ``(doc_id, chunks)``.
+
+    ``kind`` is ``"text"``, ``"markdown"``, ``"pdf"`` (``source`` is the path) or
+    ``"auto"`` (picked from the ``source`` suffix). Documents are sent to workers
+    ``chunksize`` at a time and at most ``max_pending`` batches are in flight, so
+    ``docs`` can be a lazy iterable. Results come back in input order when
+    ``ordered`` is true, otherwise as batches complete. ``workers=0`` runs inline.
+    """
+    opts = dict(max_tokens=max_tokens, overlap=overlap, strategy=strategy, estimator=estimator)
+    batches = _batches(docs, max(1, chunksize))
+
+    if workers == 0:
+        est = get_token_estimator(estimator)
+        for batch in batches:
+            for d in batch:
+                yield d.id, _split_one(d, kind, opts, est)
+        return
+
+    n_workers = workers or os.cpu_count() or 1
+    with ProcessPoolExecutor(
+        max_workers=n_workers, initializer=_init_worker, initargs=(estimator,)
+    ) as ex:
+        for results in _bounded_map(
+            ex,
+            _split_batch,
+            batches,
+            kind,
+            opts,
+            limit=max_pending or 2 * n_workers,
+            ordered=ordered,
+        ):
+            yield from results
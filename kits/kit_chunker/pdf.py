@@ -1,22 +1,154 @@
 from __future__ import annotations
 
-from typing import List, Tuple
+from bisect import bisect_right
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterable, Iterator, List, Tuple
 
 from kit_common.models import Chunk
 from kit_common.utils import make_id
-from .tokenizers import TokenEstimator, get_token_estimator
-from .splitters import split_text
+from .tokenizers import TokenEstimator, count_many, get_token_estimator
+from .splitters import _fits_whole, _whole_chunk, split_text
+from .streaming import _WINDOW_CHARS, _iter_split_pieces
 
+# joins pages in "document" mode so paragraphs can continue across a page break
+_PAGE_SEP = "\n\n"
 
-def extract_text_from_pdf(path: str) -> list[tuple[int, str]]:
+
+# reader opened once per extraction worker by _init_pdf_worker
+_worker_reader = None
+
+
+def _init_pdf_worker(path: str) -> None:
+    global _worker_reader
+    from pypdf import PdfReader  # local import to keep optional
+
+    _worker_reader = PdfReader(path)
+
+
+def _extract_pages(page_nums: list[int]) -> list[tuple[int, str]]:
+    return [(i, _worker_reader.pages[i - 1].extract_text() or "") for i in page_nums]  # type: ignore[union-attr]
+
+
+def iter_pdf_pages(
+    path: str,
+    *,
+    pages: Iterable[int] | None = None,
+    workers: int = 1,
+    pages_per_task: int = 4,
+) -> Iterator[tuple[int, str]]:
+    """Yield ``(page_num, text)`` lazily, in page order.
+
+    ``pages`` limits extraction to the given 1-based page numbers. With
+    ``workers > 1`` pages are extracted in a process pool whose workers each open
+    the PDF once and keep a bounded number of page batches in flight, so the
+    caller can consume page 1 while later pages are still being extracted.
+    """
     from pypdf import PdfReader  # local import to keep optional
 
     reader = PdfReader(path)
-    pages: list[tuple[int, str]] = []
-    for i, p in enumerate(reader.pages, start=1):
-        txt = p.extract_text() or ""
-        pages.append((i, txt))
-    return pages
+    page_nums = list(pages) if pages is not None else list(range(1, len(reader.pages) + 1))
+    if workers <= 1:
+        for i in page_nums:
+            yield i, reader.pages[i - 1].extract_text() or ""
+        return
+
+    from .batch import _batches, _bounded_map  # local import: batch imports this module
+
+    with ProcessPoolExecutor(
+        max_workers=workers, initializer=_init_pdf_worker, initargs=(path,)
+    ) as ex:
+        for extracted in _bounded_map(
+            ex, _extract_pages, _batches(page_nums, max(1, pages_per_task)), limit=2 * workers
+        ):
+            yield from extracted
+
+
+def extract_text_from_pdf(
+    path: str, *, pages: Iterable[int] | None = None, workers: int = 1
+) -> list[tuple[int, str]]:
+    return list(iter_pdf_pages(path, pages=pages, workers=workers))
+
+
+def _split_page(
+    page_num: int,
+    text: str,
+    *,
+    max_tokens: int,
+    overlap: int,
+    strategy: str,
+    est: TokenEstimator,
+    source: str | None,
+    doc_id: str | None,
+    total: int | None = None,
+) -> list[Chunk]:
+    if total is not None and _fits_whole(text, total, max_tokens, strategy):
+        page_chunks = [_whole_chunk(text, total, doc_id, source)]
+    else:
+        page_chunks = split_text(
+            text,
+            max_tokens=max_tokens,
+            overlap=overlap,
+            strategy=strategy,
+            token_estimator=est,
+            doc_id=doc_id,
+            source=source,
+        )
+    for ch in page_chunks:
+        ch.page = page_num
+        # Recompute id to include page
+        start, end = ch.start or 0, ch.end or 0
+        ch.id = make_id(
+            str(doc_id or source or ""), str(page_num), str(start), str(end), ch.text[:32]
+        )
+        ch.metadata["source"] = source
+    return page_chunks
+
+
+def _split_pages_as_document(
+    page_iter: Iterable[tuple[int, str]],
+    *,
+    max_tokens: int,
+    overlap: int,
+    strategy: str,
+    est: TokenEstimator,
+    source: str | None,
+    doc_id: str | None,
+) -> Iterator[Chunk]:
+    # chunk all pages as one stream; offsets are into the pages joined by _PAGE_SEP
+    page_starts: list[int] = []
+    page_nums: list[int] = []
+
+    def _pieces() -> Iterator[str]:
+        offset = 0
+        for page_num, text in page_iter:
+            if page_starts:
+                yield _PAGE_SEP
+                offset += len(_PAGE_SEP)
+            page_starts.append(offset)
+            page_nums.append(page_num)
+            yield text
+            offset += len(text)
+
+    for ch in _iter_split_pieces(
+        _pieces(),
+        0,
+        window_chars=_WINDOW_CHARS,
+        max_tokens=max_tokens,
+        overlap=overlap,
+        strategy=strategy,
+        est=est,
+        doc_id=doc_id,
+        source=source,
+    ):
+        start, end = ch.start or 0, ch.end or 0
+        first = page_nums[bisect_right(page_starts, start) - 1]
+        last = page_nums[bisect_right(page_starts, max(start, end - 1)) - 1]
+        ch.page = first
+        ch.id = make_id(str(doc_id or source or ""), str(first), str(start), str(end), ch.text[:32])
+        ch.metadata["source"] = source
+        ch.metadata["page_start"] = first
+        ch.metadata["page_end"] = last
+        yield ch
 
 
 def split_pdf(
@@ -24,28 +156,113 @@ def split_pdf(
     *,
     max_tokens: int = 512,
     overlap: int = 64,
+    strategy: str = "token",
     token_estimator: TokenEstimator | None = None,
     source: str | None = None,
     doc_id: str | None = None,
+    pages: Iterable[int] | None = None,
+    workers: int = 1,
+    mode: str = "page",
 ) -> list[Chunk]:
+    """Chunk a PDF.
+
+    ``mode="page"`` chunks every page on its own. ``mode="document"`` chunks the
+    pages as one stream so short pages and paragraphs across page breaks share
+    chunks; ``page`` is then the first page and ``metadata`` carries
+    ``page_start``/``page_end``.
+    """
     est = token_estimator or get_token_estimator()
-    pages = extract_text_from_pdf(path)
+    if workers > 1:
+        # pipelined: chunk early pages while the pool extracts later ones
+        return list(
+            iter_split_pdf(
+                path,
+                max_tokens=max_tokens,
+                overlap=overlap,
+                strategy=strategy,
+                token_estimator=est,
+                source=source,
+                doc_id=doc_id,
+                pages=pages,
+                workers=workers,
+                mode=mode,
+            )
+        )
+    page_texts = extract_text_from_pdf(path, pages=pages)
+    if mode == "document":
+        return list(
+            _split_pages_as_document(
+                page_texts,
+                max_tokens=max_tokens,
+                overlap=overlap,
+                strategy=strategy,
+                est=est,
+                source=source,
+                doc_id=doc_id,
+            )
+        )
+    # batch-count all pages; pages under max_tokens skip the splitter entirely
+    totals = count_many(est, [text for _, text in page_texts])
     chunks: list[Chunk] = []
-    for page_num, text in pages:
-        page_chunks = split_text(
-            text,
+    for (page_num, text), total in zip(page_texts, totals):
+        chunks.extend(
+            _split_page(
+                page_num,
+                text,
+                max_tokens=max_tokens,
+                overlap=overlap,
+                strategy=strategy,
+                est=est,
+                source=source,
+                doc_id=doc_id,
+                total=total,
+            )
+        )
+    return chunks
+
+
+def iter_split_pdf(
+    path: str,
+    *,
+    max_tokens: int = 512,
+    overlap: int = 64,
+    strategy: str = "token",
+    token_estimator: TokenEstimator | None = None,
+    source: str | None = None,
+    doc_id: str | None = None,
+    pages: Iterable[int] | None = None,
+    workers: int = 1,
+    mode: str = "page",
+) -> Iterator[Chunk]:
+    """Generator variant of ``split_pdf``: pages are extracted lazily and chunked as they arrive."""
+    est = token_estimator or get_token_estimator()
+    if mode == "document":
+        yield from _split_pages_as_document(
+            iter_pdf_pages(path, pages=pages, workers=workers),
             max_tokens=max_tokens,
             overlap=overlap,
-            strategy="token",
-            token_estimator=est,
-            doc_id=doc_id,
+            strategy=strategy,
+            est=est,
             source=source,
+            doc_id=doc_id,
         )
-        for ch in page_chunks:
-            ch.page = page_num
-            # Recompute id to include page
-            start, end = ch.start or 0, ch.end or 0
-            ch.id = make_id(str(doc_id or source or ""), str(page_num), str(start), str(end), ch.text[:32])
-            ch.metadata["source"] = source
-        chunks.extend(page_chunks)
-    return chunks
+        return
+    from .batch import _batches
+
+    # batch-count pages as they arrive, one group per worker's worth of pages,
+    # so short pages skip the splitter here as they do in split_pdf
+    page_iter = iter_pdf_pages(path, pages=pages, workers=workers)
+    for group in _batches(page_iter, max(1, workers)):
+        totals = count_many(est, [text for _, text in group])
+        for (page_num, text), total in zip(group, totals):
+            yield from _split_page(
+                page_num,
+                text,
+                max_tokens=max_tokens,
+                overlap=overlap,
+                strategy=strategy,
+                est=est,
+                source=source,
+                doc_id=doc_id,
+                total=total,
+            )
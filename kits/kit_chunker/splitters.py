@@ -1,11 +1,15 @@
 from __future__ import annotations
 
 import re
+from bisect import bisect_right
 from typing import Iterable
 
 from kit_common.models import Chunk
 from kit_common.utils import make_id
-from .tokenizers import TokenEstimator, get_token_estimator
+from .tokenizers import TokenEstimator, count_many, get_token_estimator, supports_offsets
+
+# how far (in tokens) the offsets engine walks back to start an overlap on a word
+_WORD_BACKOFF_TOKENS = 16
 
 
 def _find_split_boundary(text: str, start: int, end: int) -> int:
@@ -18,6 +22,91 @@ def _find_split_boundary(text: str, start: int, end: int) -> int:
     return end
 
 
+def _fits_whole(text: str, tokens: int, max_tokens: int, strategy: str) -> bool:
+    # token/offsets strategies return a text that fits as exactly one chunk
+    return bool(text) and tokens <= max_tokens and strategy != "paragraph"
+
+
+def _whole_chunk(text: str, tokens: int, doc_id: str | None, source: str | None) -> Chunk:
+    cid = make_id(str(doc_id or source or ""), str(None), "0", str(len(text)), text[:32])
+    return Chunk(
+        id=cid,
+        doc_id=doc_id,
+        text=text,
+        start=0,
+        end=len(text),
+        tokens=tokens,
+        metadata={"source": source},
+    )
+
+
+def _is_word_start(text: str, pos: int) -> bool:
+    return pos == 0 or text[pos].isspace() or text[pos - 1].isspace()
+
+
+def _split_text_offsets(
+    text: str,
+    *,
+    max_tokens: int,
+    overlap: int,
+    est: TokenEstimator,
+    doc_id: str | None,
+    source: str | None,
+) -> list[Chunk]:
+    # encode the whole text once and cut chunks/overlaps by token index
+    offsets: list[int] = est.token_offsets(text)  # type: ignore[attr-defined]
+    n = len(text)
+    n_tok = len(offsets)
+    max_tokens = max(1, max_tokens)
+    spans: list[tuple[int, int]] = []
+
+    def _char(i: int) -> int:
+        return offsets[i] if i < n_tok else n
+
+    ts = 0
+    while ts < n_tok:
+        te = min(ts + max_tokens, n_tok)
+        if te < n_tok:
+            # snap to the same whitespace/period boundary as the token strategy,
+            # then back to the token that holds it so counts stay exact
+            snapped = _find_split_boundary(text, _char(ts), _char(te))
+            if snapped < _char(te):
+                k = bisect_right(offsets, snapped, ts + 1, te) - 1
+                if k > ts:
+                    te = k
+        spans.append((_char(ts), _char(te)))
+        if te >= n_tok:
+            break
+        if overlap <= 0:
+            ts = te
+            continue
+        # step back overlap tokens, then further back to the start of a word
+        next_ts = max(te - overlap, ts + 1)
+        floor = max(ts + 1, next_ts - _WORD_BACKOFF_TOKENS)
+        k = next_ts
+        while k > floor and not _is_word_start(text, offsets[k]):
+            k -= 1
+        ts = k if _is_word_start(text, offsets[k]) else next_ts
+    # te - ts can differ from a slice's own count at BPE merge boundaries, so
+    # recount the slices (in one batch) to keep Chunk.tokens == est.count(text)
+    parts = [text[start:end] for start, end in spans]
+    chunks: list[Chunk] = []
+    for (start, end), part, tokens in zip(spans, parts, count_many(est, parts)):
+        cid = make_id(str(doc_id or source or ""), str(None), str(start), str(end), part[:32])
+        chunks.append(
+            Chunk(
+                id=cid,
+                doc_id=doc_id,
+                text=part,
+                start=start,
+                end=end,
+                tokens=tokens,
+                metadata={"source": source},
+            )
+        )
+    return chunks
+
+
 def split_text(
     text: str,
     *,
@@ -34,9 +123,16 @@ def split_text(
     if not text:
         return []
 
-    if strategy not in {"token", "paragraph"}:
+    if strategy not in {"token", "paragraph", "offsets"}:
+        strategy = "token"
+    if strategy == "offsets" and not supports_offsets(est):
         strategy = "token"
 
+    if strategy == "offsets":
+        return _split_text_offsets(
+            text, max_tokens=max_tokens, overlap=overlap, est=est, doc_id=doc_id, source=source
+        )
+
     if strategy == "paragraph":
         paragraphs = [p for p in re.split(r"\n\n+", text) if p.strip()]
         cur_offset = 0
@@ -140,6 +236,7 @@ def split_markdown(
     max_tokens: int = 512,
     overlap: int = 64,
     header_regex: str = r"^#{1,6}\s+.+$",
+    strategy: str = "token",
     token_estimator: TokenEstimator | None = None,
     doc_id: str | None = None,
     source: str | None = None,
@@ -169,17 +266,22 @@ def split_markdown(
         sections.append(("\n".join(cur), cur_start))
 
     chunks: list[Chunk] = []
-    for sec_text, sec_start in sections:
-        # reuse split_text token strategy for the section
-        sub_chunks = split_text(
-            sec_text,
-            max_tokens=max_tokens,
-            overlap=overlap,
-            strategy="token",
-            token_estimator=est,
-            doc_id=doc_id,
-            source=source,
-        )
+    # one batched count decides which sections fit in a single chunk
+    totals = count_many(est, [sec_text for sec_text, _ in sections])
+    for (sec_text, sec_start), total in zip(sections, totals):
+        if _fits_whole(sec_text, total, max_tokens, strategy):
+            sub_chunks = [_whole_chunk(sec_text, total, doc_id, source)]
+        else:
+            # reuse split_text token strategy for the section
+            sub_chunks = split_text(
+                sec_text,
+                max_tokens=max_tokens,
+                overlap=overlap,
+                strategy=strategy,
+                token_estimator=est,
+                doc_id=doc_id,
+                source=source,
+            )
         # adjust offsets to original markdown string
         for ch in sub_chunks:
             ch.start = (ch.start or 0) + sec_start
@@ -0,0 +1,196 @@
+from __future__ import annotations
+
+import os
+import re
+from typing import Iterable, Iterator
+
+from kit_common.models import Chunk
+from kit_common.utils import make_id
+from .tokenizers import TokenEstimator, get_token_estimator
+from .splitters import split_text
+
+TextSource = str | os.PathLike | Iterable[str]
+
+_READ_CHARS = 1 << 16
+_WINDOW_CHARS = 1 << 20
+
+
+def _iter_pieces(stream: TextSource, read_chars: int = _READ_CHARS) -> Iterator[str]:
+    # a str/PathLike is a file path; anything else is an iterable of text pieces
+    if isinstance(stream, (str, os.PathLike)):
+        with open(stream, "r", encoding="utf-8") as f:
+            while True:
+                piece = f.read(read_chars)
+                if not piece:
+                    return
+                yield piece
+    else:
+        yield from stream
+
+
+def _iter_lines(stream: TextSource, max_line: int = _WINDOW_CHARS) -> Iterator[tuple[str, bool]]:
+    # re-chunk arbitrary pieces into (segment, ends_line) without the line terminator;
+    # a line longer than max_line chars comes out in several segments so memory stays bounded
+    parts: list[str] = []
+    size = 0
+    for piece in _iter_pieces(stream):
+        start = 0
+        while (nl := piece.find("\n", start)) >= 0:
+            parts.append(piece[start:nl])
+            yield "".join(parts), True
+            parts, size = [], 0
+            start = nl + 1
+        if start < len(piece):
+            parts.append(piece[start:])
+            size += len(piece) - start
+            if size >= max_line:
+                yield "".join(parts), False
+                parts, size = [], 0
+    if parts:
+        yield "".join(parts), True
+
+
+def _shift(ch: Chunk, base: int, doc_id: str | None, source: str | None) -> Chunk:
+    ch.start = (ch.start or 0) + base
+    ch.end = (ch.end or 0) + base
+    ch.id = make_id(
+        str(doc_id or source or ""), str(None), str(ch.start), str(ch.end), ch.text[:32]
+    )
+    return ch
+
+
+def _iter_split_pieces(
+    pieces: Iterable[str],
+    base: int,
+    *,
+    window_chars: int,
+    max_tokens: int,
+    overlap: int,
+    strategy: str,
+    est: TokenEstimator,
+    doc_id: str | None,
+    source: str | None,
+) -> Iterator[Chunk]:
+    # Sliding window: split the buffered text, emit every chunk but the last
+    # (it may be cut short by the window edge) and restart the buffer at its start.
+    it = iter(pieces)
+    buf = ""
+    buf_start = base
+    limit = window_chars
+    eof = False
+    while True:
+        parts = [buf]
+        size = len(buf)
+        while not eof and size < limit:
+            piece = next(it, None)
+            if piece is None:
+                eof = True
+            else:
+                parts.append(piece)
+                size += len(piece)
+        buf = "".join(parts)
+        if not buf:
+            return
+        chunks = split_text(
+            buf,
+            max_tokens=max_tokens,
+            overlap=overlap,
+            strategy=strategy,
+            token_estimator=est,
+            doc_id=doc_id,
+            source=source,
+        )
+        if eof:
+            for ch in chunks:
+                yield _shift(ch, buf_start, doc_id, source)
+            return
+        if len(chunks) < 2:
+            # a single chunk spans the whole window; read further before cutting
+            limit += window_chars
+            continue
+        for ch in chunks[:-1]:
+            yield _shift(ch, buf_start, doc_id, source)
+        cut = chunks[-1].start or 0
+        buf = buf[cut:]
+        buf_start += cut
+        limit = window_chars
+
+
+def iter_split_text(
+    stream: TextSource,
+    *,
+    max_tokens: int = 512,
+    overlap: int = 64,
+    strategy: str = "token",
+    token_estimator: TokenEstimator | None = None,
+    doc_id: str | None = None,
+    source: str | None = None,
+    window_chars: int = _WINDOW_CHARS,
+) -> Iterator[Chunk]:
+    """Generator variant of ``split_text`` for a file path or an iterable of text pieces.
+
+    Only about ``window_chars`` characters are held in memory; chunk offsets are
+    absolute positions in the full stream. With ``strategy="offsets"`` each window
+    is re-encoded from the start of its first chunk, so a BPE estimator that would
+    merge tokens across that point can place later boundaries differently from
+    ``split_text`` on the whole text.
+    """
+    est = token_estimator or get_token_estimator()
+    yield from _iter_split_pieces(
+        _iter_pieces(stream),
+        0,
+        window_chars=window_chars,
+        max_tokens=max_tokens,
+        overlap=overlap,
+        strategy=strategy,
+        est=est,
+        doc_id=doc_id,
+        source=source,
+    )
+
+
+def iter_split_markdown(
+    stream: TextSource,
+    *,
+    max_tokens: int = 512,
+    overlap: int = 64,
+    header_regex: str = r"^#{1,6}\s+.+$",
+    strategy: str = "token",
+    token_estimator: TokenEstimator | None = None,
+    doc_id: str | None = None,
+    source: str | None = None,
+    window_chars: int = _WINDOW_CHARS,
+) -> Iterator[Chunk]:
+    """Generator variant of ``split_markdown``; sections are streamed, not buffered whole."""
+    est = token_estimator or get_token_estimator()
+    header_re = re.compile(header_regex)
+    lines = _iter_lines(stream, window_chars)
+    state: dict = {"seg": next(lines, None), "offset": 0, "line_start": True}
+
+    def _section() -> Iterator[str]:
+        # yield the current section's text; stop before the next header line
+        first = True
+        while state["seg"] is not None:
+            text, ends_line = state["seg"]
+            if state["line_start"] and not first:
+                if header_re.match(text):
+                    return
+                yield "\n"
+            yield text
+            first = False
+            state["offset"] += len(text) + ends_line
+            state["line_start"] = ends_line
+            state["seg"] = next(lines, None)
+
+    while state["seg"] is not None:
+        yield from _iter_split_pieces(
+            _section(),
+            state["offset"],
+            window_chars=window_chars,
+            max_tokens=max_tokens,
+            overlap=overlap,
+            strategy=strategy,
+            est=est,
+            doc_id=doc_id,
+            source=source,
+        )
@@ -1,36 +1,195 @@
 from __future__ import annotations
 
+import threading
+from collections import OrderedDict
 from math import ceil
-from typing import Protocol
+from typing import Any, Protocol, runtime_checkable
 
 
 class TokenEstimator(Protocol):
     def count(self, text: str) -> int: ...
 
 
+@runtime_checkable
+class OffsetTokenEstimator(Protocol):
+    """Estimator that can also report where each token starts in the text.
+
+    ``token_offsets(text)`` returns one character offset per token, in order,
+    so a whole document can be encoded once and cut by token index.
+    """
+
+    def count(self, text: str) -> int: ...
+
+    def token_offsets(self, text: str) -> list[int]: ...
+
+
+@runtime_checkable
+class BatchTokenEstimator(Protocol):
+    """Estimator that counts many texts in one call (e.g. tiktoken's threaded batch encode)."""
+
+    def count(self, text: str) -> int: ...
+
+    def count_many(self, texts: list[str]) -> list[int]: ...
+
+
 class _TiktokenEstimator:
-    def __init__(self):
+    def __init__(self, encoding: str = "cl100k_base"):
         import tiktoken  # local import
 
+        self.encoding = encoding
         try:
-            self.enc = tiktoken.get_encoding("cl100k_base")
+            self.enc = tiktoken.get_encoding(encoding)
         except Exception:  # pragma: no cover - safe fallback
             self.enc = tiktoken.get_encoding("cl100k_base")
 
     def count(self, text: str) -> int:
         return len(self.enc.encode(text))
 
+    def encode_many(self, texts: list[str], *, num_threads: int = 8) -> list[list[int]]:
+        return self.enc.encode_batch(texts, num_threads=num_threads)
+
+    def count_many(self, texts: list[str], *, num_threads: int = 8) -> list[int]:
+        return [len(t) for t in self.encode_many(texts, num_threads=num_threads)]
+
+    def token_offsets(self, text: str) -> list[int]:
+        tokens = self.enc.encode(text)
+        _, offsets = self.enc.decode_with_offsets(tokens)
+        return offsets
+
 
 class _CharEstimator:
     def count(self, text: str) -> int:
         return int(ceil(len(text) / 4))
 
+    def count_many(self, texts: list[str]) -> list[int]:
+        return [int(ceil(len(t) / 4)) for t in texts]
+
+    def token_offsets(self, text: str) -> list[int]:
+        return list(range(0, len(text), 4))
+
+
+class CachedTokenEstimator:
+    """Bounded LRU cache in front of another estimator's ``count``.
+
+    Entries are keyed by ``(len(text), hash(text))`` so cached texts are not
+    kept alive. Other attributes (e.g. ``token_offsets``) pass through.
+    """
 
-def get_token_estimator(name: str = "tiktoken") -> TokenEstimator:
+    def __init__(self, inner: TokenEstimator, maxsize: int = 4096):
+        self.inner = inner
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._cache: OrderedDict[tuple[int, int], int] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.inner, name)
+
+    def count(self, text: str) -> int:
+        key = (len(text), hash(text))
+        with self._lock:
+            n = self._cache.get(key)
+            if n is not None:
+                self._cache.move_to_end(key)
+                self.hits += 1
+                return n
+            self.misses += 1
+        n = self.inner.count(text)
+        with self._lock:
+            self._cache[key] = n
+            if len(self._cache) > self.maxsize:
+                self._cache.popitem(last=False)
+        return n
+
+    def count_many(self, texts: list[str]) -> list[int]:
+        keys = [(len(t), hash(t)) for t in texts]
+        out: list[int | None] = [None] * len(texts)
+        miss_idx: list[int] = []
+        with self._lock:
+            for i, key in enumerate(keys):
+                n = self._cache.get(key)
+                if n is None:
+                    miss_idx.append(i)
+                else:
+                    self._cache.move_to_end(key)
+                    out[i] = n
+            self.hits += len(texts) - len(miss_idx)
+            self.misses += len(miss_idx)
+        if miss_idx:
+            counts = count_many(self.inner, [texts[i] for i in miss_idx])
+            with self._lock:
+                for i, n in zip(miss_idx, counts):
+                    out[i] = n
+                    self._cache[keys[i]] = n
+                while len(self._cache) > self.maxsize:
+                    self._cache.popitem(last=False)
+        return out  # type: ignore[return-value]
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "size": len(self._cache)}
+
+    def clear(self) -> None:
+        with self._lock:
+            self._cache.clear()
+            self.hits = 0
+            self.misses = 0
+
+
+def supports_offsets(est: TokenEstimator) -> bool:
+    return isinstance(est, OffsetTokenEstimator)
+
+
+def count_many(est: TokenEstimator, texts: list[str]) -> list[int]:
+    """Count tokens for many texts, batched when the estimator supports it."""
+    if not texts:
+        return []
+    if isinstance(est, BatchTokenEstimator):
+        return est.count_many(texts)
+    return [est.count(t) for t in texts]
+
+
+# process-wide registry: (name, encoding, cache_size) -> shared estimator
+_registry: dict[tuple[str, str, int], TokenEstimator] = {}
+_registry_lock = threading.Lock()
+
+
+def _build_estimator(name: str, encoding: str) -> TokenEstimator:
     if name == "tiktoken":
         try:
-            return _TiktokenEstimator()
+            return _TiktokenEstimator(encoding)
         except Exception:  # pragma: no cover - fallback when tiktoken missing
             return _CharEstimator()
     return _CharEstimator()
 
+
+def get_token_estimator(
+    name: str = "tiktoken", *, encoding: str = "cl100k_base", cache_size: int = 4096
+) -> TokenEstimator:
+    """Return the shared estimator for ``name``/``encoding``, building it on first use.
+
+    ``cache_size`` > 0 wraps it in a :class:`CachedTokenEstimator`; ``0`` disables
+    the count cache.
+    """
+    key = (name, encoding if name == "tiktoken" else "", max(0, cache_size))
+    est = _registry.get(key)
+    if est is not None:
+        return est
+    with _registry_lock:
+        est = _registry.get(key)
+        if est is None:
+            base_key = (key[0], key[1], 0)
+            base = _registry.get(base_key)
+            if base is None:
+                base = _build_estimator(name, encoding)
+                _registry[base_key] = base
+            est = CachedTokenEstimator(base, cache_size) if key[2] else base
+            _registry[key] = est
+    return est
+
+
+def clear_token_estimators() -> None:
+    """Drop all shared estimators (e.g. after changing tiktoken's cache dir)."""
+    with _registry_lock:
+        _registry.clear()
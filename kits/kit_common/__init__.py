@@ -5,6 +5,7 @@ from .logging import get_logger
 from .models import Document, Chunk, Embedding, SearchResult, QARequest, QAResponse
 from .errors import KitError, ConfigError, ExternalServiceError, ValidationError
 from .utils import normalize_text, make_id
+from .retry import RetryPolicy, CircuitBreaker, CircuitOpenError, RetryMetrics, get_retry_policy
 
 __all__ = [
     "Settings",
@@ -22,5 +23,10 @@ __all__ = [
     "ValidationError",
     "normalize_text",
     "make_id",
+    "RetryPolicy",
+    "CircuitBreaker",
+    "CircuitOpenError",
+    "RetryMetrics",
+    "get_retry_policy",
 ]
 
@@ -12,8 +12,14 @@ class Settings(BaseModel):
     openai_base_url: str | None = None
     llm_chat_model: str | None = None
     llm_embed_model: str | None = None
+    llm_rpm: int | None = None
+    llm_tpm: int | None = None
+    llm_rate_limit_db: str | None = None
     qdrant_url: str | None = None
     qdrant_api_key: str | None = None
+    qdrant_prefer_grpc: bool = False
+    vector_backend: str = "qdrant"
+    vector_path: str | None = None
     log_level: str = "INFO"
 
 
@@ -23,18 +29,30 @@ def _read_env() -> dict[str, str | None]:
         "openai_base_url": os.getenv("OPENAI_BASE_URL"),
         "llm_chat_model": os.getenv("LLM_CHAT_MODEL"),
         "llm_embed_model": os.getenv("LLM_EMBED_MODEL"),
+        "llm_rpm": os.getenv("LLM_RPM"),
+        "llm_tpm": os.getenv("LLM_TPM"),
+        "llm_rate_limit_db": os.getenv("LLM_RATE_LIMIT_DB"),
         "qdrant_url": os.getenv("QDRANT_URL"),
         "qdrant_api_key": os.getenv("QDRANT_API_KEY"),
+        "qdrant_prefer_grpc": os.getenv("QDRANT_PREFER_GRPC", "false"),
+        "vector_backend": os.getenv("VECTOR_BACKEND", "qdrant"),
+        "vector_path": os.getenv("VECTOR_PATH"),
         "log_level": os.getenv("LOG_LEVEL", "INFO"),
     }
 
 
-def load_settings(env_file: str | None = None) -> Settings:
+_default_env_loaded = False
+
+
+def load_settings(env_file: str | None = None, *, reload: bool = False) -> Settings:
+    global _default_env_loaded
     if env_file is not None:
         _load_dotenv(env_file)
-    else:
-        # Load default .env if present
+    elif reload or not _default_env_loaded:
+        # Load default .env if present; once per process unless reload=True,
+        # since dotenv never overrides variables that are already set
         _load_dotenv()
+        _default_env_loaded = True
 
     values = _read_env()
     return Settings(**values)
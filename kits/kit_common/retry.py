@@ -0,0 +1,316 @@
+from __future__ import annotations
+
+import asyncio
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from functools import lru_cache
+from typing import Any, Awaitable, Callable, TypeVar
+
+from .errors import ExternalServiceError
+from .logging import get_logger
+
+T = TypeVar("T")
+
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+
+class CircuitOpenError(ExternalServiceError):
+    """Call shed because the circuit breaker is open."""
+
+
+class RetryMetrics:
+    """Thread-safe counters for calls made through a :class:`RetryPolicy`."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.calls = 0
+        self.retries = 0
+        self.failures = 0
+        self.shed = 0
+
+    def incr(self, name: str, n: int = 1) -> None:
+        with self._lock:
+            setattr(self, name, getattr(self, name) + n)
+
+    def snapshot(self) -> dict[str, int]:
+        with self._lock:
+            return {
+                "calls": self.calls,
+                "retries": self.retries,
+                "failures": self.failures,
+                "shed": self.shed,
+            }
+
+
+class CircuitBreaker:
+    """Opens after ``failure_threshold`` consecutive failed calls.
+
+    While open every call is shed; after ``reset_timeout_s`` one trial call is
+    let through (half-open) and its outcome closes or re-opens the circuit.
+    """
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout_s: float = 30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout_s = reset_timeout_s
+        self._lock = threading.Lock()
+        self._failures = 0
+        self._opened_at: float | None = None
+        self._trial = False
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            if self._opened_at is None:
+                return "closed"
+            if time.monotonic() - self._opened_at >= self.reset_timeout_s:
+                return "half_open"
+            return "open"
+
+    def allow(self) -> bool:
+        with self._lock:
+            if self._opened_at is None:
+                return True
+            if time.monotonic() - self._opened_at >= self.reset_timeout_s and not self._trial:
+                self._trial = True
+                return True
+            return False
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+            self._trial = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            if self._trial or self._failures >= self.failure_threshold:
+                self._opened_at = time.monotonic()
+            self._trial = False
+
+    def release(self) -> None:
+        """Give back a half-open trial whose call ended without a verdict."""
+        with self._lock:
+            self._trial = False
+
+
+@lru_cache(maxsize=1)
+def _transport_errors() -> tuple[type[BaseException], ...]:
+    # connection/timeout errors of the optional client libraries, imported lazily
+    errors: list[type[BaseException]] = [ConnectionError, TimeoutError]
+    try:
+        import httpx
+
+        errors.append(httpx.TransportError)
+    except ImportError:  # pragma: no cover - httpx ships with openai and qdrant-client
+        pass
+    try:
+        import openai
+
+        errors.append(openai.APIConnectionError)
+    except ImportError:  # pragma: no cover
+        pass
+    try:
+        from qdrant_client.http.exceptions import ResponseHandlingException
+
+        errors.append(ResponseHandlingException)
+    except ImportError:  # pragma: no cover
+        pass
+    return tuple(errors)
+
+
+def _status(e: BaseException) -> int | None:
+    status = getattr(e, "status_code", None) or getattr(e, "status", None)
+    return status if isinstance(status, int) else None
+
+
+def _headers(e: BaseException) -> Any:
+    headers = getattr(e, "headers", None)
+    if headers is None:
+        headers = getattr(getattr(e, "response", None), "headers", None)
+    return headers
+
+
+def retry_after_s(e: BaseException) -> float | None:
+    """Server-requested wait from ``retry-after-ms`` / ``retry-after`` headers, if any."""
+    headers = _headers(e)
+    if not headers:
+        return None
+    try:
+        ms = headers.get("retry-after-ms")
+        if ms is not None:
+            return max(0.0, float(ms) / 1000.0)
+        value = headers.get("retry-after")
+        if value is None:
+            return None
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except Exception:  # noqa: BLE001 - malformed header: fall back to backoff
+        return None
+
+
+class RetryPolicy:
+    """Exponential backoff with full jitter, header-aware waits and a deadline.
+
+    ``call(fn, op=...)`` runs ``fn`` up to ``max_attempts`` times while it raises
+    retryable errors (``retry_statuses`` or connection/timeouts, including the
+    openai, httpx and qdrant-client transport errors). The wait before
+    retry ``n`` is the server's ``Retry-After`` when given, otherwise
+    ``uniform(0, min(max_delay_s, base_delay_s * 2**n))``. No retry starts past
+    ``deadline_s`` from the first attempt. The last error is re-raised as is.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_attempts: int = 3,
+        base_delay_s: float = 0.5,
+        max_delay_s: float = 20.0,
+        deadline_s: float | None = 60.0,
+        retry_statuses: tuple[int, ...] = RETRY_STATUSES,
+        breaker: CircuitBreaker | None = None,
+        metrics: RetryMetrics | None = None,
+        sleep: Callable[[float], None] = time.sleep,
+        rng: Callable[[], float] = random.random,
+    ):
+        self.max_attempts = max(1, max_attempts)
+        self.base_delay_s = base_delay_s
+        self.max_delay_s = max_delay_s
+        self.deadline_s = deadline_s
+        self.retry_statuses = retry_statuses
+        self.breaker = breaker
+        self.metrics = metrics or RetryMetrics()
+        self._sleep = sleep
+        self._rng = rng
+        self._log = get_logger(__name__)
+
+    def is_retryable(self, e: BaseException) -> bool:
+        if isinstance(e, _transport_errors()):
+            return True
+        return _status(e) in self.retry_statuses
+
+    def delay_for(self, attempt: int, e: BaseException) -> float:
+        hinted = retry_after_s(e)
+        if hinted is not None:
+            return min(hinted, self.max_delay_s)
+        return self._rng() * min(self.max_delay_s, self.base_delay_s * (2**attempt))
+
+    def _before(self, op: str) -> None:
+        self.metrics.incr("calls")
+        if self.breaker is not None and not self.breaker.allow():
+            self.metrics.incr("shed")
+            raise CircuitOpenError(f"{op} shed: circuit open")
+
+    def _next_delay(self, attempt: int, e: BaseException, started: float, op: str) -> float | None:
+        # None means give up and re-raise `e`
+        if not self.is_retryable(e):
+            if _status(e) is not None:
+                # the service answered (e.g. a 4xx): that counts as healthy for the breaker
+                self._healthy()
+            else:
+                # no answer from the service: neither a success nor a failure
+                self._released()
+            return None
+        if attempt + 1 >= self.max_attempts:
+            self._failed()
+            return None
+        delay = self.delay_for(attempt, e)
+        if self.deadline_s is not None and time.monotonic() - started + delay > self.deadline_s:
+            self._failed()
+            return None
+        self.metrics.incr("retries")
+        self._log.info(
+            "retry",
+            extra={"op": op, "attempt": attempt + 1, "status": _status(e), "delay_s": delay},
+        )
+        return delay
+
+    def _failed(self) -> None:
+        self.metrics.incr("failures")
+        if self.breaker is not None:
+            self.breaker.record_failure()
+
+    def _healthy(self) -> None:
+        if self.breaker is not None:
+            self.breaker.record_success()
+
+    def _released(self) -> None:
+        if self.breaker is not None:
+            self.breaker.release()
+
+    def call(self, fn: Callable[[], T], *, op: str = "call") -> T:
+        self._before(op)
+        try:
+            return self._run(fn, op)
+        except Exception:
+            raise
+        except BaseException:
+            # interrupted mid-call or mid-backoff: a half-open trial must not keep the circuit shut
+            self._released()
+            raise
+
+    def _run(self, fn: Callable[[], T], op: str) -> T:
+        started = time.monotonic()
+        attempt = 0
+        while True:
+            try:
+                result = fn()
+            except Exception as e:  # noqa: BLE001
+                delay = self._next_delay(attempt, e, started, op)
+                if delay is None:
+                    raise
+                self._sleep(delay)
+                attempt += 1
+                continue
+            self._healthy()
+            return result
+
+    async def acall(self, fn: Callable[[], Awaitable[T]], *, op: str = "call") -> T:
+        self._before(op)
+        try:
+            return await self._arun(fn, op)
+        except Exception:
+            raise
+        except BaseException:
+            # cancelled mid-call or mid-backoff: a half-open trial must not keep the circuit shut
+            self._released()
+            raise
+
+    async def _arun(self, fn: Callable[[], Awaitable[T]], op: str) -> T:
+        started = time.monotonic()
+        attempt = 0
+        while True:
+            try:
+                result = await fn()
+            except Exception as e:  # noqa: BLE001
+                delay = self._next_delay(attempt, e, started, op)
+                if delay is None:
+                    raise
+                await asyncio.sleep(delay)
+                attempt += 1
+                continue
+            self._healthy()
+            return result
+
+
+# process-wide policies per service so every client shares one breaker and metrics
+_policies: dict[str, RetryPolicy] = {}
+_policies_lock = threading.Lock()
+
+
+def get_retry_policy(service: str) -> RetryPolicy:
+    with _policies_lock:
+        policy = _policies.get(service)
+        if policy is None:
+            policy = RetryPolicy(breaker=CircuitBreaker())
+            _policies[service] = policy
+        return policy
+
+
+def set_retry_policy(service: str, policy: RetryPolicy) -> None:
+    with _policies_lock:
+        _policies[service] = policy
@@ -0,0 +1,27 @@
+from __future__ import annotations
+
+from .manifest import Manifest
+from .indexer import IncrementalIndexer, IndexStats, point_id
+from .pipeline import (
+    Checkpoint,
+    Pipeline,
+    Stage,
+    extract_document,
+    normalize_document,
+    chunk_document,
+    ingest_pipeline,
+)
+
+__all__ = [
+    "Manifest",
+    "IncrementalIndexer",
+    "IndexStats",
+    "point_id",
+    "Checkpoint",
+    "Pipeline",
+    "Stage",
+    "extract_document",
+    "normalize_document",
+    "chunk_document",
+    "ingest_pipeline",
+]
@@ -0,0 +1,156 @@
+from __future__ import annotations
+
+import json
+import uuid
+from typing import Iterable
+
+from pydantic import BaseModel
+from kit_common.config import load_settings
+from kit_common.logging import get_logger
+from kit_common.models import Chunk
+from kit_common.utils import make_id
+from kit_llm.client import LLMClient, get_default_client
+from kit_vector.base import VectorBackend
+from .manifest import Manifest
+
+
+def point_id(chunk_id: str) -> str:
+    """Stable UUID point id for a ``make_id`` chunk id (Qdrant only accepts UUIDs or ints)."""
+    try:
+        return str(uuid.UUID(chunk_id[:32]))
+    except ValueError:
+        return chunk_id
+
+
+class IndexStats(BaseModel):
+    added: int = 0
+    updated: int = 0
+    unchanged: int = 0
+    deleted: int = 0
+
+
+class IncrementalIndexer:
+    """Re-index documents into ``collection`` touching only chunks whose content changed.
+
+    A chunk's hash covers the embedding model, its text and its payload
+    (``Chunk.model_dump()``). New and changed chunks are embedded and upserted,
+    chunks that disappeared from a document are deleted from the backend, and
+    unchanged chunks cost one manifest lookup. Upserts go out every
+    ``flush_size`` chunks; deletes are sent once at the end of the run, skipping
+    any chunk a document still lists. The manifest is written only after the
+    backend accepted the matching writes, so an interrupted run is redone on
+    the next call instead of being lost.
+    """
+
+    def __init__(
+        self,
+        backend: VectorBackend,
+        collection: str,
+        manifest: Manifest,
+        *,
+        client: LLMClient | None = None,
+        embed_model: str | None = None,
+        batch_size: int = 64,
+        flush_size: int = 1024,
+    ):
+        self.backend = backend
+        self.collection = collection
+        self.manifest = manifest
+        self.client = client or get_default_client()
+        self.embed_model = embed_model or load_settings().llm_embed_model or ""
+        self.batch_size = batch_size
+        self.flush_size = flush_size
+        self._log = get_logger(__name__)
+
+    def chunk_hash(self, chunk: Chunk) -> str:
+        body = json.dumps(chunk.model_dump(), sort_keys=True, ensure_ascii=False, default=str)
+        return make_id(self.embed_model, body)
+
+    def index(self, docs: Iterable[tuple[str, list[Chunk]]], *, prune: bool = False) -> IndexStats:
+        """Sync ``(doc_id, chunks)`` pairs with the collection.
+
+        With ``prune=True`` documents recorded in the manifest but absent from
+        ``docs`` are removed from the backend as well.
+        """
+        stats = IndexStats()
+        seen: set[str] = set()
+        # every chunk id some document still lists in this run; never deleted
+        live: set[str] = set()
+        entries: dict[str, dict[str, str]] = {}
+        shrunk: dict[str, dict[str, str]] = {}
+        pending: list[Chunk] = []
+        stale: list[str] = []
+        for doc_id, chunks in docs:
+            seen.add(doc_id)
+            old = self.manifest.chunks(self.collection, doc_id)
+            new: dict[str, str] = {}
+            for c in chunks:
+                h = self.chunk_hash(c)
+                if c.id in new:
+                    continue
+                new[c.id] = h
+                if c.id not in old:
+                    stats.added += 1
+                    pending.append(c)
+                elif old[c.id] != h:
+                    stats.updated += 1
+                    pending.append(c)
+                else:
+                    stats.unchanged += 1
+            live.update(new)
+            gone = [cid for cid in old if cid not in new]
+            stats.deleted += len(gone)
+            stale.extend(gone)
+            if gone:
+                # recorded only after the deletes at the end of the run
+                shrunk[doc_id] = new
+            elif old != new:
+                entries[doc_id] = new
+            if len(pending) >= self.flush_size:
+                self._flush(pending, entries)
+                pending, entries = [], {}
+        if prune:
+            for doc_id in self.manifest.doc_ids(self.collection) - seen:
+                gone = list(self.manifest.chunks(self.collection, doc_id))
+                stats.deleted += len(gone)
+                stale.extend(gone)
+                shrunk[doc_id] = {}
+        self._flush(pending, entries)
+        self._delete_stale(stale, live, shrunk)
+        self._log.info(
+            "incremental_index", extra={"collection": self.collection, **stats.model_dump()}
+        )
+        return stats
+
+    def remove(self, doc_ids: list[str]) -> int:
+        """Delete every chunk of ``doc_ids`` from the backend and the manifest."""
+        stale = [cid for d in doc_ids for cid in self.manifest.chunks(self.collection, d)]
+        self._delete_stale(stale, set(), {d: {} for d in doc_ids})
+        return len(stale)
+
+    def _flush(self, pending: list[Chunk], entries: dict[str, dict[str, str]]) -> None:
+        if pending:
+            vectors = self.client.embed_array(
+                [c.text for c in pending],
+                model=self.embed_model or None,
+                batch_size=self.batch_size,
+            )
+            self.backend.upsert(
+                self.collection,
+                vectors,
+                [c.model_dump() for c in pending],
+                ids=[point_id(c.id) for c in pending],
+            )
+        if entries:
+            self.manifest.replace(self.collection, entries)
+
+    def _delete_stale(
+        self, stale: list[str], live: set[str], entries: dict[str, dict[str, str]]
+    ) -> None:
+        # once per run: a chunk that moved to another document (and may have been
+        # upserted by an earlier flush) is still live and must survive
+        doomed = [cid for cid in dict.fromkeys(stale) if cid not in live]
+        if doomed:
+            self.backend.delete(self.collection, [point_id(cid) for cid in doomed])
+        if entries:
+            self.manifest.replace(self.collection, entries)
@@ -0,0 +1,63 @@
+from __future__ import annotations
+
+import sqlite3
+import threading
+
+
+class Manifest:
+    """SQLite record of which chunks (and content hashes) each document has in a collection.
+
+    ``path=":memory:"`` keeps the manifest in process; use a file to make
+    re-indexing incremental across runs.
+    """
+
+    def __init__(self, path: str = ":memory:"):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS manifest ("
+            "collection TEXT NOT NULL, doc_id TEXT NOT NULL, chunk_id TEXT NOT NULL, "
+            "hash TEXT NOT NULL, PRIMARY KEY (collection, doc_id, chunk_id))"
+        )
+        self._conn.commit()
+
+    def chunks(self, collection: str, doc_id: str) -> dict[str, str]:
+        """``{chunk_id: hash}`` recorded for one document."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT chunk_id, hash FROM manifest WHERE collection = ? AND doc_id = ?",
+                (collection, doc_id),
+            ).fetchall()
+        return dict(rows)
+
+    def doc_ids(self, collection: str) -> set[str]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT DISTINCT doc_id FROM manifest WHERE collection = ?", (collection,)
+            ).fetchall()
+        return {r[0] for r in rows}
+
+    def replace(self, collection: str, docs: dict[str, dict[str, str]]) -> None:
+        """Overwrite the entries of every document in ``docs`` in one transaction."""
+        with self._lock:
+            with self._conn:
+                self._conn.executemany(
+                    "DELETE FROM manifest WHERE collection = ? AND doc_id = ?",
+                    [(collection, d) for d in docs],
+                )
+                self._conn.executemany(
+                    "INSERT INTO manifest (collection, doc_id, chunk_id, hash) VALUES (?, ?, ?, ?)",
+                    [
+                        (collection, d, cid, h)
+                        for d, entries in docs.items()
+                        for cid, h in entries.items()
+                    ],
+                )
+
+    def remove(self, collection: str, doc_ids: list[str]) -> None:
+        self.replace(collection, {d: {} for d in doc_ids})
+
+    def close(self) -> None:
+        self._conn.close()
@@ -0,0 +1,470 @@
+from __future__ import annotations
+
+import os
+import queue
+import sqlite3
+import threading
+import time
+from bisect import bisect_right
+from concurrent.futures import Executor, ProcessPoolExecutor
+from functools import partial
+from typing import Any, Callable, Iterable, Literal
+
+import numpy as np
+from kit_chunker.splitters import split_markdown, split_text
+from kit_chunker.tokenizers import get_token_estimator
+from kit_common.logging import get_logger
+from kit_common.models import Chunk, Document
+from kit_common.utils import make_id, normalize_text
+from kit_llm.client import LLMClient, get_default_client
+from kit_vector.base import VectorBackend
+from .indexer import point_id
+
+# end-of-input marker; each worker consumes exactly one
+_DONE = object()
+
+
+class Checkpoint:
+    """SQLite set of item keys that made it through the last stage of a pipeline.
+
+    Keys are scoped by ``name`` so several pipelines can share one file.
+    """
+
+    def __init__(self, path: str = ":memory:", *, name: str = "default"):
+        self.path = path
+        self.name = name
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS checkpoints ("
+            "name TEXT NOT NULL, key TEXT NOT NULL, done REAL NOT NULL, "
+            "PRIMARY KEY (name, key))"
+        )
+        self._conn.commit()
+
+    def done(self, keys: list[str]) -> set[str]:
+        found: set[str] = set()
+        with self._lock:
+            for i in range(0, len(keys), 500):
+                part = keys[i : i + 500]
+                marks = ",".join("?" * len(part))
+                rows = self._conn.execute(
+                    f"SELECT key FROM checkpoints WHERE name = ? AND key IN ({marks})",
+                    [self.name, *part],
+                ).fetchall()
+                found.update(r[0] for r in rows)
+        return found
+
+    def mark(self, keys: list[str]) -> None:
+        now = time.time()
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO checkpoints (name, key, done) VALUES (?, ?, ?)",
+                [(self.name, k, now) for k in keys],
+            )
+            self._conn.commit()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM checkpoints WHERE name = ?", (self.name,))
+            self._conn.commit()
+
+    def close(self) -> None:
+        self._conn.close()
+
+
+class Stage:
+    """One pipeline step run by its own pool of ``workers``.
+
+    With ``batch_size == 1`` ``fn(value)`` returns the value for the next stage;
+    otherwise ``fn(values)`` gets up to ``batch_size`` values (waiting at most
+    ``linger_s`` to fill a batch) and returns one result per value. ``None``
+    ends an item early, which counts as finished. ``mode="process"`` runs ``fn``
+    in a process pool, so it and its values must be picklable; thread workers
+    still do the queueing. The input queue holds ``queue_size`` items (default
+    ``2 * workers * batch_size``); a full queue blocks the stage before it.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        fn: Callable[[Any], Any],
+        *,
+        workers: int = 1,
+        mode: Literal["thread", "process"] = "thread",
+        batch_size: int = 1,
+        queue_size: int | None = None,
+        linger_s: float = 0.05,
+    ):
+        self.name = name
+        self.fn = fn
+        self.workers = max(1, workers)
+        self.mode = mode
+        self.batch_size = max(1, batch_size)
+        self.queue_size = queue_size or 2 * self.workers * self.batch_size
+        self.linger_s = linger_s
+
+
+class StageStats:
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.items = 0
+        self.errors = 0
+        self.calls = 0
+        self.busy_s = 0.0
+        self.max_latency_s = 0.0
+        self.blocked_s = 0.0
+
+    def record(self, items: int, latency_s: float) -> None:
+        with self._lock:
+            self.items += items
+            self.calls += 1
+            self.busy_s += latency_s
+            self.max_latency_s = max(self.max_latency_s, latency_s)
+
+    def failed(self, items: int) -> None:
+        with self._lock:
+            self.errors += items
+
+    def blocked(self, seconds: float) -> None:
+        with self._lock:
+            self.blocked_s += seconds
+
+    def snapshot(self, elapsed_s: float, queued: int) -> dict[str, float]:
+        with self._lock:
+            return {
+                "items": self.items,
+                "errors": self.errors,
+                "queued": queued,
+                "items_per_s": round(self.items / elapsed_s, 2) if elapsed_s > 0 else 0.0,
+                "avg_latency_ms": round(1000 * self.busy_s / self.calls, 2) if self.calls else 0.0,
+                "max_latency_ms": round(1000 * self.max_latency_s, 2),
+                "blocked_ms": round(1000 * self.blocked_s, 2),
+            }
+
+
+class Pipeline:
+    """Stages connected by bounded queues, each stage with its own worker pool.
+
+    Every stage works on different items at the same time, so end-to-end
+    throughput is set by the slowest stage; bounded queues push back on faster
+    upstream stages (and on the source iterable) instead of buffering. Items
+    are identified by ``key(item)`` (default ``item.id``); with a
+    :class:`Checkpoint` finished keys are recorded and skipped on the next run,
+    so an interrupted or partially failed run resumes where it stopped. A
+    failing ``fn`` call is logged and counted, and its items are not
+    checkpointed.
+    """
+
+    def __init__(
+        self,
+        stages: list[Stage],
+        *,
+        checkpoint: Checkpoint | None = None,
+        key: Callable[[Any], str] | None = None,
+    ):
+        if not stages:
+            raise ValueError("Pipeline needs at least one stage")
+        self.stages = stages
+        self.checkpoint = checkpoint
+        self.key = key or (lambda item: str(item.id))
+        self._log = get_logger(__name__)
+        self._lock = threading.Lock()
+        self._stats = {s.name: StageStats() for s in stages}
+        self._queues: list[queue.Queue] = []
+        self._alive: list[int] = []
+        self._started = 0.0
+        self._finished: float | None = None
+        self.submitted = 0
+        self.skipped = 0
+        self.failed: list[tuple[str, str, str]] = []
+
+    def stats(self) -> dict[str, dict[str, float]]:
+        """Per-stage counters; ``items_per_s`` is over the wall time of the run so far."""
+        end = self._finished or time.perf_counter()
+        elapsed = end - self._started if self._started else 0.0
+        out = {}
+        for i, s in enumerate(self.stages):
+            queued = self._queues[i].qsize() if self._queues else 0
+            out[s.name] = self._stats[s.name].snapshot(elapsed, queued)
+        return out
+
+    def run(self, items: Iterable[Any]) -> dict[str, dict[str, float]]:
+        """Push ``items`` through every stage and block until the last one drains."""
+        self._queues = [queue.Queue(maxsize=s.queue_size) for s in self.stages]
+        self._alive = [s.workers for s in self.stages]
+        self._stats = {s.name: StageStats() for s in self.stages}
+        self.submitted = self.skipped = 0
+        self.failed = []
+        self._started, self._finished = time.perf_counter(), None
+        pools: list[Executor | None] = [
+            ProcessPoolExecutor(max_workers=s.workers) if s.mode == "process" else None
+            for s in self.stages
+        ]
+        threads = [
+            threading.Thread(
+                target=self._worker, args=(i, pools[i]), name=f"{s.name}-{n}", daemon=True
+            )
+            for i, s in enumerate(self.stages)
+            for n in range(s.workers)
+        ]
+        for t in threads:
+            t.start()
+        try:
+            self._feed(items)
+        finally:
+            for _ in range(self.stages[0].workers):
+                self._queues[0].put(_DONE)
+            for t in threads:
+                t.join()
+            for pool in pools:
+                if pool is not None:
+                    pool.shutdown()
+            self._finished = time.perf_counter()
+        stats = self.stats()
+        self._log.info(
+            "pipeline_done",
+            extra={
+                "submitted": self.submitted,
+                "skipped": self.skipped,
+                "failed": len(self.failed),
+                "elapsed_ms": int((self._finished - self._started) * 1000),
+            },
+        )
+        return stats
+
+    def _feed(self, items: Iterable[Any]) -> None:
+        first = self._queues[0]
+        batch: list[tuple[str, Any]] = []
+
+        def _flush() -> None:
+            done = self.checkpoint.done([k for k, _ in batch]) if self.checkpoint else set()
+            for k, item in batch:
+                if k in done:
+                    self.skipped += 1
+                    continue
+                first.put((k, item))
+                self.submitted += 1
+            batch.clear()
+
+        for item in items:
+            batch.append((self.key(item), item))
+            if len(batch) >= 256 or not self.checkpoint:
+                _flush()
+        _flush()
+
+    def _take(self, i: int) -> tuple[list[tuple[str, Any]], bool]:
+        stage, inq = self.stages[i], self._queues[i]
+        first = inq.get()
+        if first is _DONE:
+            return [], True
+        batch = [first]
+        deadline = time.monotonic() + stage.linger_s
+        while len(batch) < stage.batch_size:
+            try:
+                nxt = inq.get(timeout=max(0.0, deadline - time.monotonic()))
+            except queue.Empty:
+                break
+            if nxt is _DONE:
+                return batch, True
+            batch.append(nxt)
+        return batch, False
+
+    def _worker(self, i: int, pool: Executor | None) -> None:
+        try:
+            last = False
+            while not last:
+                batch, last = self._take(i)
+                if batch:
+                    self._process(i, batch, pool)
+        finally:
+            with self._lock:
+                self._alive[i] -= 1
+                closing = self._alive[i] == 0
+            if closing and i + 1 < len(self.stages):
+                for _ in range(self.stages[i + 1].workers):
+                    self._queues[i + 1].put(_DONE)
+
+    def _process(self, i: int, batch: list[tuple[str, Any]], pool: Executor | None) -> None:
+        stage, stats = self.stages[i], self._stats[self.stages[i].name]
+        keys = [k for k, _ in batch]
+        arg: Any = [v for _, v in batch] if stage.batch_size > 1 else batch[0][1]
+        t0 = time.perf_counter()
+        try:
+            out = pool.submit(stage.fn, arg).result() if pool is not None else stage.fn(arg)
+            outs = list(out) if stage.batch_size > 1 else [out]
+            if len(outs) != len(keys):
+                raise ValueError(f"stage returned {len(outs)} results for {len(keys)} items")
+        except Exception as e:  # noqa: BLE001
+            self._record_failure(stage, keys, e)
+            return
+        stats.record(len(keys), time.perf_counter() - t0)
+        last = i + 1 == len(self.stages)
+        finished = []
+        t1 = time.perf_counter()
+        for k, v in zip(keys, outs):
+            if v is None or last:
+                finished.append(k)
+            else:
+                self._queues[i + 1].put((k, v))
+        stats.blocked(time.perf_counter() - t1)
+        if finished and self.checkpoint is not None:
+            # a raising checkpoint must not kill the worker: its stage would stop
+            # reading its queue and the stages feeding it would block forever
+            try:
+                self.checkpoint.mark(finished)
+            except Exception as e:  # noqa: BLE001
+                self._record_failure(stage, finished, e)
+
+    def _record_failure(self, stage: Stage, keys: list[str], e: Exception) -> None:
+        self._stats[stage.name].failed(len(keys))
+        with self._lock:
+            self.failed.extend((k, stage.name, str(e)) for k in keys)
+        self._log.info(
+            "pipeline_stage_error",
+            extra={"stage": stage.name, "count": len(keys), "error": str(e)},
+        )
+
+
+def extract_document(doc: Document) -> Document:
+    """Fill ``doc.text`` from ``doc.source`` when it is empty.
+
+    PDFs are read page by page; ``metadata["page_offsets"]`` keeps
+    ``[page, start]`` pairs so chunks can be mapped back to pages.
+    """
+    if doc.text or not doc.source:
+        return doc
+    if doc.source.lower().endswith(".pdf"):
+        from kit_chunker.pdf import iter_pdf_pages  # local import: pypdf is optional
+
+        parts: list[str] = []
+        offsets: list[list[int]] = []
+        pos = 0
+        for page, text in iter_pdf_pages(doc.source):
+            offsets.append([page, pos])
+            parts.append(text)
+            pos += len(text) + 2
+        meta = {**doc.metadata, "page_offsets": offsets}
+        return doc.model_copy(update={"text": "\n\n".join(parts), "metadata": meta})
+    with open(doc.source, encoding="utf-8") as f:
+        return doc.model_copy(update={"text": f.read()})
+
+
+def normalize_document(doc: Document) -> Document:
+    """``normalize_text`` per page, keeping ``page_offsets`` in step."""
+    offsets = doc.metadata.get("page_offsets")
+    if not offsets:
+        return doc.model_copy(update={"text": normalize_text(doc.text)})
+    bounds = [start for _, start in offsets] + [len(doc.text) + 2]
+    parts = [normalize_text(doc.text[a : b - 2]) for a, b in zip(bounds, bounds[1:])]
+    new_offsets, pos = [], 0
+    for (page, _), text in zip(offsets, parts):
+        new_offsets.append([page, pos])
+        pos += len(text) + 2
+    meta = {**doc.metadata, "page_offsets": new_offsets}
+    return doc.model_copy(update={"text": "\n\n".join(parts), "metadata": meta})
+
+
+def chunk_document(
+    doc: Document,
+    *,
+    max_tokens: int = 512,
+    overlap: int = 64,
+    strategy: str = "token",
+    estimator: str = "tiktoken",
+) -> list[Chunk]:
+    est = get_token_estimator(estimator)
+    is_markdown = (doc.source or "").lower().endswith((".md", ".markdown"))
+    splitter = split_markdown if is_markdown else split_text
+    chunks = splitter(
+        doc.text,
+        max_tokens=max_tokens,
+        overlap=overlap,
+        strategy=strategy,
+        token_estimator=est,
+        doc_id=doc.id,
+        source=doc.source,
+    )
+    offsets = doc.metadata.get("page_offsets")
+    if offsets:
+        starts = [start for _, start in offsets]
+        for c in chunks:
+            if c.start is not None and c.page is None:
+                c.page = offsets[max(0, bisect_right(starts, c.start) - 1)][0]
+                # page-aware id, the scheme split_pdf uses for PDF chunks
+                c.id = make_id(
+                    str(doc.id or doc.source or ""),
+                    str(c.page),
+                    str(c.start),
+                    str(c.end),
+                    c.text[:32],
+                )
+    return chunks
+
+
+def ingest_pipeline(
+    backend: VectorBackend,
+    collection: str,
+    *,
+    client: LLMClient | None = None,
+    embed_model: str | None = None,
+    checkpoint: Checkpoint | None = None,
+    max_tokens: int = 512,
+    overlap: int = 64,
+    strategy: str = "token",
+    estimator: str = "tiktoken",
+    extract_workers: int = 4,
+    chunk_workers: int | None = None,
+    embed_workers: int = 2,
+    embed_batch: int = 8,
+    upsert_workers: int = 2,
+) -> Pipeline:
+    """Extract → normalize → chunk → embed → upsert pipeline over ``Document`` items.
+
+    Extraction, embedding and upserts are I/O bound and run on threads;
+    normalizing and chunking run in process pools (``chunk_workers`` defaults
+    to the CPU count). ``embed_batch`` documents share one ``embed_array`` call.
+    PDF chunk ids include the page as :func:`split_pdf` ids do, and points use
+    :func:`point_id` of the chunk id like the :class:`IncrementalIndexer`.
+    """
+    llm = client or get_default_client()
+    cpu = chunk_workers or os.cpu_count() or 1
+
+    def _embed(batch: list[list[Chunk]]) -> list[tuple[list[Chunk], np.ndarray]]:
+        texts = [c.text for chunks in batch for c in chunks]
+        vectors = llm.embed_array(texts, model=embed_model) if texts else np.empty((0, 0))
+        out, pos = [], 0
+        for chunks in batch:
+            out.append((chunks, vectors[pos : pos + len(chunks)]))
+            pos += len(chunks)
+        return out
+
+    def _upsert(item: tuple[list[Chunk], np.ndarray]) -> None:
+        chunks, vectors = item
+        if chunks:
+            backend.upsert(
+                collection,
+                vectors,
+                [c.model_dump() for c in chunks],
+                ids=[point_id(c.id) for c in chunks],
+            )
+        return None
+
+    chunk = partial(
+        chunk_document,
+        max_tokens=max_tokens,
+        overlap=overlap,
+        strategy=strategy,
+        estimator=estimator,
+    )
+    return Pipeline(
+        [
+            Stage("extract", extract_document, workers=extract_workers),
+            Stage("normalize", normalize_document, workers=max(1, cpu // 2), mode="process"),
+            Stage("chunk", chunk, workers=cpu, mode="process"),
+            Stage("embed", _embed, workers=embed_workers, batch_size=embed_batch),
+            Stage("upsert", _upsert, workers=upsert_workers),
+        ],
+        checkpoint=checkpoint,
+    )
@@ -1,15 +1,37 @@
 from __future__ import annotations
 
-from .client import LLMClient, get_default_client
-from .embed import embed_texts
-from .chat import chat
+from .client import (
+    LLMClient,
+    AsyncLLMClient,
+    get_default_client,
+    get_default_async_client,
+    clear_client_cache,
+)
+from .embed import embed_texts, embed_array, aembed_texts
+from .chat import chat, achat, chat_stream, achat_stream
+from .cache import EmbeddingStore, CachedLLMClient, ChatCache, CachedChatClient
+from .ratelimit import RateLimiter, get_rate_limiter
 from .errors import LLMError
 
 __all__ = [
     "LLMClient",
+    "AsyncLLMClient",
     "get_default_client",
+    "get_default_async_client",
+    "clear_client_cache",
     "embed_texts",
+    "embed_array",
+    "aembed_texts",
     "chat",
+    "achat",
+    "chat_stream",
+    "achat_stream",
+    "EmbeddingStore",
+    "CachedLLMClient",
+    "ChatCache",
+    "CachedChatClient",
+    "RateLimiter",
+    "get_rate_limiter",
     "LLMError",
 ]
 
@@ -0,0 +1,60 @@
+from __future__ import annotations
+
+from typing import NamedTuple
+
+from kit_chunker.tokenizers import TokenEstimator, count_many, get_token_estimator
+
+
+class BatchPlan(NamedTuple):
+    start: int
+    end: int
+    tokens: int
+
+
+def plan_batches(
+    texts: list[str],
+    *,
+    max_items: int = 64,
+    max_tokens: int | None = None,
+    token_counts: list[int] | None = None,
+    token_estimator: TokenEstimator | None = None,
+) -> list[BatchPlan]:
+    """Pack ``texts`` (in order) into request batches.
+
+    Each batch holds at most ``max_items`` texts and, when ``max_tokens`` is set,
+    at most ``max_tokens`` estimated tokens; a single text above the budget gets
+    a batch of its own. ``token_counts`` skips re-estimating texts whose counts
+    are already known (e.g. ``Chunk.tokens``).
+    """
+    max_items = max(1, max_items)
+    if token_counts is None:
+        if max_tokens is None:
+            token_counts = [0] * len(texts)
+        else:
+            token_counts = count_many(token_estimator or get_token_estimator(), texts)
+    plans: list[BatchPlan] = []
+    start, used = 0, 0
+    for i, n in enumerate(token_counts):
+        full = i - start >= max_items or (
+            max_tokens is not None and i > start and used + n > max_tokens
+        )
+        if full:
+            plans.append(BatchPlan(start, i, used))
+            start, used = i, 0
+        used += n
+    if start < len(texts):
+        plans.append(BatchPlan(start, len(texts), used))
+    return plans
+
+
+_TOO_LARGE_HINTS = ("too large", "too many tokens", "maximum context", "max_tokens", "token limit")
+
+
+def is_batch_too_large(e: BaseException | None) -> bool:
+    """True when a provider error says the request carried too many tokens."""
+    if e is None:
+        return False
+    status = getattr(e, "status_code", None) or getattr(e, "status", None)
+    if status == 413:
+        return True
+    return status == 400 and any(h in str(e).lower() for h in _TOO_LARGE_HINTS)
@@ -0,0 +1,431 @@
+from __future__ import annotations
+
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable
+
+import numpy as np
+from kit_common.logging import get_logger
+from kit_common.utils import make_id
+from .client import LLMClient, _embed_log_fields
+
+
+def embedding_key(model: str, normalize: bool, text: str) -> str:
+    return make_id(model, str(bool(normalize)), text)
+
+
+class EmbeddingStore:
+    """SQLite store of float32 vectors keyed by :func:`embedding_key`.
+
+    ``max_entries`` bounds the table; the least recently used rows are evicted
+    after each write. ``path=":memory:"`` keeps the store in process.
+    """
+
+    def __init__(self, path: str = ":memory:", *, max_entries: int | None = None):
+        self.path = path
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS embeddings ("
+            "key TEXT PRIMARY KEY, dim INTEGER NOT NULL, vec BLOB NOT NULL, "
+            "last_used REAL NOT NULL)"
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS embeddings_last_used ON embeddings(last_used)"
+        )
+        self._conn.commit()
+
+    def get_many(self, keys: list[str]) -> dict[str, np.ndarray]:
+        found: dict[str, np.ndarray] = {}
+        if not keys:
+            return found
+        now = time.time()
+        with self._lock:
+            for i in range(0, len(keys), 500):
+                part = keys[i : i + 500]
+                marks = ",".join("?" * len(part))
+                rows = self._conn.execute(
+                    f"SELECT key, vec FROM embeddings WHERE key IN ({marks})", part
+                ).fetchall()
+                for key, blob in rows:
+                    found[key] = np.frombuffer(blob, dtype=np.float32)
+                self._conn.executemany(
+                    "UPDATE embeddings SET last_used = ? WHERE key = ?", [(now, k) for k, _ in rows]
+                )
+            self._conn.commit()
+        return found
+
+    def put_many(self, items: dict[str, Any]) -> None:
+        if not items:
+            return
+        now = time.time()
+        rows = []
+        for key, vec in items.items():
+            arr = np.asarray(vec, dtype=np.float32)
+            rows.append((key, int(arr.shape[0]), arr.tobytes(), now))
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO embeddings (key, dim, vec, last_used) VALUES (?, ?, ?, ?)",
+                rows,
+            )
+            if self.max_entries is not None:
+                self._conn.execute(
+                    "DELETE FROM embeddings WHERE key IN ("
+                    "SELECT key FROM embeddings ORDER BY last_used DESC LIMIT -1 OFFSET ?)",
+                    (self.max_entries,),
+                )
+            self._conn.commit()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return int(self._conn.execute("SELECT COUNT(*) FROM embeddings").fetchone()[0])
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+class CachedLLMClient:
+    """Wrap any ``LLMClient`` so ``embed_texts`` only sends cache misses to the provider.
+
+    Vectors are keyed by ``(model, normalize, text)``; results are merged back in
+    input order. Everything else (``chat`` ...) is delegated to the wrapped client.
+    """
+
+    def __init__(self, client: LLMClient, store: EmbeddingStore | None = None):
+        self.client = client
+        self.store = store if store is not None else EmbeddingStore()
+        self.hits = 0
+        self.misses = 0
+        self._log = get_logger(__name__)
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.client, name)
+
+    def _model(self, model: str | None) -> str | None:
+        if model:
+            return model
+        settings = getattr(self.client, "settings", None)
+        return getattr(settings, "llm_embed_model", None)
+
+    def _lookup(
+        self, texts: list[str], mdl: str, normalize: bool
+    ) -> tuple[list[str], dict, dict[str, str]]:
+        keys = [embedding_key(mdl, normalize, t) for t in texts]
+        cached = self.store.get_many(list(dict.fromkeys(keys)))
+        # dedupe misses so repeated texts within one call are embedded once
+        miss: dict[str, str] = {}
+        for key, text in zip(keys, texts):
+            if key not in cached and key not in miss:
+                miss[key] = text
+        return keys, cached, miss
+
+    @staticmethod
+    def _cache_fields(keys: list[str], miss: dict[str, str]) -> dict[str, Any]:
+        # unique keys: a text repeated within one call is looked up and embedded once
+        unique = len(set(keys))
+        hits = unique - len(miss)
+        return {"cache_hits": hits, "cache_misses": len(miss), "hit_rate": round(hits / unique, 4)}
+
+    def _record(self, fields: dict[str, Any], t0: float) -> None:
+        with self.store._lock:
+            self.hits += fields["cache_hits"]
+            self.misses += fields["cache_misses"]
+        if not fields["cache_misses"]:
+            # nothing went to the wrapped client, so it logged no embed_total for this call
+            self._log.info(
+                "embed_total",
+                extra={
+                    "texts": 0,
+                    "elapsed_ms": int((time.perf_counter() - t0) * 1000),
+                    **fields,
+                },
+            )
+
+    def embed_texts(
+        self,
+        texts: list[str],
+        *,
+        model: str | None = None,
+        batch_size: int = 64,
+        normalize: bool = True,
+        timeout_s: float = 60.0,
+        **kwargs: Any,
+    ) -> list[list[float]]:
+        mdl = self._model(model)
+        if not texts or not mdl:
+            # nothing to key on; let the wrapped client validate
+            return self.client.embed_texts(
+                texts,
+                model=model,
+                batch_size=batch_size,
+                normalize=normalize,
+                timeout_s=timeout_s,
+                **kwargs,
+            )
+        t0 = time.perf_counter()
+        keys, cached, miss = self._lookup(texts, mdl, normalize)
+        fields = self._cache_fields(keys, miss)
+        fresh: dict[str, list[float]] = {}
+        if miss:
+            with _embed_log_fields(fields):
+                vecs = self.client.embed_texts(
+                    list(miss.values()),
+                    model=mdl,
+                    batch_size=batch_size,
+                    normalize=normalize,
+                    timeout_s=timeout_s,
+                    **kwargs,
+                )
+            fresh = dict(zip(miss.keys(), vecs))
+            self.store.put_many(fresh)
+        self._record(fields, t0)
+        return [fresh[k] if k in fresh else cached[k].tolist() for k in keys]
+
+    def embed_array(
+        self,
+        texts: list[str],
+        *,
+        model: str | None = None,
+        batch_size: int = 64,
+        normalize: bool = True,
+        timeout_s: float = 60.0,
+        **kwargs: Any,
+    ) -> np.ndarray:
+        mdl = self._model(model)
+        if not texts or not mdl:
+            return self.client.embed_array(
+                texts,
+                model=model,
+                batch_size=batch_size,
+                normalize=normalize,
+                timeout_s=timeout_s,
+                **kwargs,
+            )
+        t0 = time.perf_counter()
+        keys, cached, miss = self._lookup(texts, mdl, normalize)
+        fields = self._cache_fields(keys, miss)
+        fresh: dict[str, np.ndarray] = {}
+        if miss:
+            with _embed_log_fields(fields):
+                arr = self.client.embed_array(
+                    list(miss.values()),
+                    model=mdl,
+                    batch_size=batch_size,
+                    normalize=normalize,
+                    timeout_s=timeout_s,
+                    **kwargs,
+                )
+            fresh = dict(zip(miss.keys(), arr))
+            self.store.put_many(fresh)
+        dim = len(next(iter(fresh.values()))) if fresh else len(next(iter(cached.values())))
+        out = np.empty((len(texts), dim), dtype=np.float32)
+        for i, k in enumerate(keys):
+            out[i] = fresh[k] if k in fresh else cached[k]
+        self._record(fields, t0)
+        return out
+
+    def stats(self) -> dict[str, float]:
+        with self.store._lock:
+            hits, misses = self.hits, self.misses
+        total = hits + misses
+        return {"hits": hits, "misses": misses, "hit_rate": hits / total if total else 0.0}
+
+
+def chat_key(model: str, messages: list[dict], temperature: float, tools: list[dict] | None) -> str:
+    return make_id(
+        model,
+        json.dumps(messages, sort_keys=True, ensure_ascii=False, default=str),
+        repr(float(temperature)),
+        json.dumps(tools or [], sort_keys=True, ensure_ascii=False, default=str),
+    )
+
+
+class ChatCache:
+    """In-process LRU of chat responses with a time-to-live.
+
+    Exact entries are keyed by :func:`chat_key`. ``semantic_threshold`` also
+    keeps the embedding of each request's last message, scoped by everything
+    before it (model, earlier messages, temperature, tools); a new request whose
+    embedding has cosine similarity >= the threshold within the same scope
+    reuses that answer.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_entries: int = 1024,
+        ttl_s: float | None = 3600.0,
+        semantic_threshold: float | None = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.max_entries = max(1, max_entries)
+        self.ttl_s = ttl_s
+        self.semantic_threshold = semantic_threshold
+        self._clock = clock
+        self._lock = threading.Lock()
+        # key -> (expires_at, response, scope)
+        self._entries: OrderedDict[str, tuple[float | None, dict, str | None]] = OrderedDict()
+        self._vectors: dict[str, dict[str, np.ndarray]] = {}
+
+    def _drop(self, key: str) -> None:
+        _, _, scope = self._entries.pop(key)
+        if scope is not None:
+            vecs = self._vectors.get(scope)
+            if vecs is not None:
+                vecs.pop(key, None)
+                if not vecs:
+                    del self._vectors[scope]
+
+    def _live(self, key: str) -> dict | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, response, _ = entry
+        if expires_at is not None and self._clock() >= expires_at:
+            self._drop(key)
+            return None
+        self._entries.move_to_end(key)
+        return response
+
+    def get(self, key: str) -> dict | None:
+        with self._lock:
+            return self._live(key)
+
+    def get_similar(self, scope: str, vec: np.ndarray) -> tuple[dict, float] | None:
+        """Best live response in ``scope`` at or above the threshold, with its similarity."""
+        if self.semantic_threshold is None:
+            return None
+        with self._lock:
+            vecs = self._vectors.get(scope)
+            if not vecs:
+                return None
+            keys = list(vecs)
+            sims = np.stack([vecs[k] for k in keys]) @ vec
+            for i in np.argsort(-sims):
+                if sims[i] < self.semantic_threshold:
+                    return None
+                response = self._live(keys[i])
+                if response is not None:
+                    return response, float(sims[i])
+            return None
+
+    def put(
+        self, key: str, response: dict, *, scope: str | None = None, vec: np.ndarray | None = None
+    ) -> None:
+        expires_at = None if self.ttl_s is None else self._clock() + self.ttl_s
+        with self._lock:
+            if key in self._entries:
+                self._drop(key)
+            if vec is None:
+                scope = None
+            self._entries[key] = (expires_at, response, scope)
+            if scope is not None:
+                self._vectors.setdefault(scope, {})[key] = vec  # type: ignore[assignment]
+            while len(self._entries) > self.max_entries:
+                self._drop(next(iter(self._entries)))
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._vectors.clear()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+
+def _unit(vec: np.ndarray) -> np.ndarray:
+    norm = float(np.linalg.norm(vec))
+    return vec / norm if norm > 0 else vec
+
+
+class CachedChatClient:
+    """Wrap any ``LLMClient`` so repeated ``chat`` requests are answered from a :class:`ChatCache`.
+
+    Hits never touch the network and carry ``"cached": "exact"`` or
+    ``"semantic"``. Semantic lookups embed the last message with
+    ``embed_model`` (the wrapped client's default when ``None``). Streaming and
+    embeddings are delegated unchanged.
+    """
+
+    def __init__(
+        self, client: LLMClient, cache: ChatCache | None = None, *, embed_model: str | None = None
+    ):
+        self.client = client
+        self.cache = cache if cache is not None else ChatCache()
+        self.embed_model = embed_model
+        self.hits = 0
+        self.misses = 0
+        self._log = get_logger(__name__)
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.client, name)
+
+    def _query_vec(self, messages: list[dict[str, str]]) -> np.ndarray | None:
+        content = messages[-1].get("content") if messages else None
+        if self.cache.semantic_threshold is None or not isinstance(content, str):
+            return None
+        arr = self.client.embed_array([content], model=self.embed_model)
+        return _unit(np.asarray(arr[0], dtype=np.float32))
+
+    def chat(
+        self,
+        messages: list[dict[str, str]],
+        *,
+        model: str | None = None,
+        temperature: float = 0.2,
+        max_tokens: int | None = None,
+        timeout_s: float = 60.0,
+        tools: list[dict] | None = None,
+    ) -> dict:
+        settings = getattr(self.client, "settings", None)
+        mdl = model or getattr(settings, "llm_chat_model", None)
+        call = dict(
+            model=model,
+            temperature=temperature,
+            max_tokens=max_tokens,
+            timeout_s=timeout_s,
+            tools=tools,
+        )
+        if not mdl:
+            return self.client.chat(messages, **call)
+        t0 = time.perf_counter()
+        key = chat_key(mdl, messages, temperature, tools)
+        hit, mode, similarity = self.cache.get(key), "exact", 1.0
+        scope = vec = None
+        if hit is None:
+            vec = self._query_vec(messages)
+            if vec is not None:
+                scope = chat_key(mdl, messages[:-1], temperature, tools)
+                found = self.cache.get_similar(scope, vec)
+                if found is not None:
+                    (hit, similarity), mode = found, "semantic"
+        if hit is not None:
+            self.hits += 1
+            self._log.info(
+                "chat_cache_hit",
+                extra={
+                    "mode": mode,
+                    "similarity": round(similarity, 4),
+                    "elapsed_ms": int((time.perf_counter() - t0) * 1000),
+                },
+            )
+            return {**hit, "cached": mode}
+        self.misses += 1
+        res = self.client.chat(messages, **call)
+        self.cache.put(key, res, scope=scope, vec=vec)
+        return res
+
+    def stats(self) -> dict[str, float]:
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+        }
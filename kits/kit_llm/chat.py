@@ -1,9 +1,10 @@
 from __future__ import annotations
 
-from typing import Any
+from typing import Any, AsyncIterator, Iterator
 
 from kit_common.config import Settings, load_settings
-from .client import get_default_client
+from .cache import CachedChatClient, ChatCache
+from .client import get_default_async_client, get_default_client
 
 
 def chat(
@@ -15,9 +16,13 @@ def chat(
     max_tokens: int | None = None,
     timeout_s: float = 60.0,
     tools: list[dict] | None = None,
+    cache: ChatCache | None = None,
 ) -> dict:
+    """Single chat completion; with ``cache`` repeated requests are served from it."""
     st: Settings = load_settings()
     client = get_default_client(st)
+    if cache is not None:
+        client = CachedChatClient(client, cache)
     msgs = list(messages)
     if system is not None:
         msgs = [{"role": "system", "content": system}] + msgs
@@ -25,3 +30,77 @@ def chat(
         msgs, model=model, temperature=temperature, max_tokens=max_tokens, timeout_s=timeout_s, tools=tools
     )
 
+
+def chat_stream(
+    messages: list[dict[str, str]],
+    *,
+    system: str | None = None,
+    model: str | None = None,
+    temperature: float = 0.2,
+    max_tokens: int | None = None,
+    timeout_s: float = 60.0,
+    tools: list[dict] | None = None,
+) -> Iterator[dict]:
+    st: Settings = load_settings()
+    client = get_default_client(st)
+    msgs = list(messages)
+    if system is not None:
+        msgs = [{"role": "system", "content": system}] + msgs
+    return client.chat_stream(
+        msgs,
+        model=model,
+        temperature=temperature,
+        max_tokens=max_tokens,
+        timeout_s=timeout_s,
+        tools=tools,
+    )
+
+
+async def achat(
+    messages: list[dict[str, str]],
+    *,
+    system: str | None = None,
+    model: str | None = None,
+    temperature: float = 0.2,
+    max_tokens: int | None = None,
+    timeout_s: float = 60.0,
+    tools: list[dict] | None = None,
+) -> dict:
+    st: Settings = load_settings()
+    client = get_default_async_client(st)
+    msgs = list(messages)
+    if system is not None:
+        msgs = [{"role": "system", "content": system}] + msgs
+    return await client.chat(
+        msgs,
+        model=model,
+        temperature=temperature,
+        max_tokens=max_tokens,
+        timeout_s=timeout_s,
+        tools=tools,
+    )
+
+
+def achat_stream(
+    messages: list[dict[str, str]],
+    *,
+    system: str | None = None,
+    model: str | None = None,
+    temperature: float = 0.2,
+    max_tokens: int | None = None,
+    timeout_s: float = 60.0,
+    tools: list[dict] | None = None,
+) -> AsyncIterator[dict]:
+    st: Settings = load_settings()
+    client = get_default_async_client(st)
+    msgs = list(messages)
+    if system is not None:
+        msgs = [{"role": "system", "content": system}] + msgs
+    return client.chat_stream(
+        msgs,
+        model=model,
+        temperature=temperature,
+        max_tokens=max_tokens,
+        timeout_s=timeout_s,
+        tools=tools,
+    )
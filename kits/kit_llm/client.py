@@ -1,19 +1,150 @@
 from __future__ import annotations
 
+import asyncio
+import inspect
+import threading
 import time
-from typing import Any, Protocol
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, AsyncIterator, Iterator, Protocol
 
 import numpy as np
 from kit_common.config import Settings, load_settings
 from kit_common.errors import ConfigError
 from kit_common.logging import get_logger
+from kit_common.retry import RetryPolicy, get_retry_policy
+from kit_chunker.tokenizers import count_many, get_token_estimator
 from kit_llm.errors import LLMError
+from .batching import BatchPlan, is_batch_too_large, plan_batches
+from .ratelimit import RateLimiter, get_rate_limiter
 
 try:
     from openai import OpenAI
 except Exception:  # pragma: no cover - import at runtime in real usage
     OpenAI = None  # type: ignore
 
+try:
+    from openai import AsyncOpenAI
+except Exception:  # pragma: no cover - import at runtime in real usage
+    AsyncOpenAI = None  # type: ignore
+
+
+# extra fields for the embed_total events logged in the current context
+_embed_log_extra: ContextVar[dict[str, Any] | None] = ContextVar("embed_log_extra", default=None)
+
+
+@contextmanager
+def _embed_log_fields(fields: dict[str, Any]) -> Iterator[None]:
+    # lets a wrapper (e.g. the embedding cache) report on the same embed_total event
+    token = _embed_log_extra.set(fields)
+    try:
+        yield
+    finally:
+        _embed_log_extra.reset(token)
+
+
+def _stream_events(chunk: Any) -> list[dict]:
+    # flatten one streamed completion chunk into content / tool-call fragments
+    events: list[dict] = []
+    for choice in getattr(chunk, "choices", None) or []:
+        delta = getattr(choice, "delta", None)
+        if delta is None:
+            continue
+        if getattr(delta, "content", None):
+            events.append({"type": "content", "content": delta.content})
+        for tc in getattr(delta, "tool_calls", None) or []:
+            fn = getattr(tc, "function", None)
+            events.append(
+                {
+                    "type": "tool_call",
+                    "index": getattr(tc, "index", 0),
+                    "id": getattr(tc, "id", None),
+                    "name": getattr(fn, "name", None),
+                    "arguments": getattr(fn, "arguments", None) or "",
+                }
+            )
+    return events
+
+
+def _close_stream(stream: Any) -> None:
+    # give the pooled connection back even when the consumer stopped early
+    close = getattr(stream, "close", None)
+    if close is not None:
+        close()
+
+
+async def _aclose_stream(stream: Any) -> None:
+    close = getattr(stream, "close", None) or getattr(stream, "aclose", None)
+    if close is not None:
+        res = close()
+        if inspect.isawaitable(res):
+            await res
+
+
+class _StreamStats:
+    """Timing for a streamed chat call, logged as the ``chat_call`` event."""
+
+    def __init__(self, messages: int):
+        self.messages = messages
+        self.t0 = time.perf_counter()
+        self.first: float | None = None
+        self.chunks = 0
+
+    def saw(self, events: list[dict]) -> None:
+        if events and self.first is None:
+            self.first = time.perf_counter()
+        self.chunks += sum(1 for e in events if e["type"] == "content")
+
+    def extra(self) -> dict:
+        end = time.perf_counter()
+        gen_s = end - self.first if self.first is not None else 0.0
+        return {
+            "messages": self.messages,
+            "stream": True,
+            "ttft_ms": int((self.first - self.t0) * 1000) if self.first is not None else None,
+            "elapsed_ms": int((end - self.t0) * 1000),
+            "chunks": self.chunks,
+            # each content delta is roughly one token for OpenAI-compatible streams
+            "tokens_per_s": round(self.chunks / gen_s, 2) if gen_s > 0 else None,
+        }
+
+
+def _normalize_array(arr: np.ndarray) -> np.ndarray:
+    # L2-normalize rows in place
+    norms = np.linalg.norm(arr, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    arr /= norms
+    return arr
+
+
+def _normalize_rows(batch_vecs: list[list[float]]) -> list[list[float]]:
+    return _normalize_array(np.array(batch_vecs, dtype=np.float32)).tolist()
+
+
+def _default_limiter(settings: Settings) -> RateLimiter | None:
+    if not settings.llm_rpm and not settings.llm_tpm:
+        return None
+    return get_rate_limiter(
+        rpm=settings.llm_rpm, tpm=settings.llm_tpm, path=settings.llm_rate_limit_db
+    )
+
+
+def _token_counts(limiter: RateLimiter | None, texts: list[str]) -> list[int] | None:
+    # only pay for counting when a tokens-per-minute bucket will use the numbers
+    if limiter is None or not limiter.tpm:
+        return None
+    return count_many(get_token_estimator(), texts)
+
+
+def _chat_tokens(
+    limiter: RateLimiter | None, messages: list[dict[str, str]], max_tokens: int | None
+) -> int:
+    texts = [m["content"] for m in messages if isinstance(m.get("content"), str)]
+    counts = _token_counts(limiter, texts)
+    return 0 if counts is None else sum(counts) + (max_tokens or 0)
+
 
 class LLMClient(Protocol):
     def embed_texts(
@@ -24,8 +155,22 @@ class LLMClient(Protocol):
         batch_size: int = 64,
         normalize: bool = True,
         timeout_s: float = 60.0,
+        concurrency: int = 1,
+        max_batch_tokens: int | None = None,
     ) -> list[list[float]]: ...
 
+    def embed_array(
+        self,
+        texts: list[str],
+        *,
+        model: str | None = None,
+        batch_size: int = 64,
+        normalize: bool = True,
+        timeout_s: float = 60.0,
+        concurrency: int = 1,
+        max_batch_tokens: int | None = None,
+    ) -> np.ndarray: ...
+
     def chat(
         self,
         messages: list[dict[str, str]],
@@ -37,9 +182,62 @@ class LLMClient(Protocol):
         tools: list[dict] | None = None,
     ) -> dict: ...
 
+    def chat_stream(
+        self,
+        messages: list[dict[str, str]],
+        *,
+        model: str | None = None,
+        temperature: float = 0.2,
+        max_tokens: int | None = None,
+        timeout_s: float = 60.0,
+        tools: list[dict] | None = None,
+    ) -> Iterator[dict]: ...
+
+
+class AsyncLLMClient(Protocol):
+    async def embed_texts(
+        self,
+        texts: list[str],
+        *,
+        model: str | None = None,
+        batch_size: int = 64,
+        normalize: bool = True,
+        timeout_s: float = 60.0,
+        concurrency: int = 1,
+        max_batch_tokens: int | None = None,
+    ) -> list[list[float]]: ...
+
+    async def chat(
+        self,
+        messages: list[dict[str, str]],
+        *,
+        model: str | None = None,
+        temperature: float = 0.2,
+        max_tokens: int | None = None,
+        timeout_s: float = 60.0,
+        tools: list[dict] | None = None,
+    ) -> dict: ...
+
+    def chat_stream(
+        self,
+        messages: list[dict[str, str]],
+        *,
+        model: str | None = None,
+        temperature: float = 0.2,
+        max_tokens: int | None = None,
+        timeout_s: float = 60.0,
+        tools: list[dict] | None = None,
+    ) -> AsyncIterator[dict]: ...
+
 
 class _OpenAILLMClient:
-    def __init__(self, settings: Settings):
+    def __init__(
+        self,
+        settings: Settings,
+        *,
+        retry_policy: RetryPolicy | None = None,
+        rate_limiter: RateLimiter | None = None,
+    ):
         if OpenAI is None:
             raise LLMError("openai client is not available")
         self.settings = settings
@@ -54,23 +252,108 @@ class _OpenAILLMClient:
                 self._client = OpenAI()  # type: ignore[call-arg]
         except TypeError:
             self._client = OpenAI()  # type: ignore[call-arg]
+        self._retry = retry_policy or get_retry_policy("llm")
+        self._limiter = rate_limiter or _default_limiter(settings)
         self._log = get_logger(__name__)
 
     def _with_retries(self, fn, *, op: str):
-        delays = [1.0, 2.0]
-        last_err: Exception | None = None
-        for attempt in range(1 + len(delays)):
-            try:
-                return fn()
-            except Exception as e:  # noqa: BLE001
-                status = getattr(e, "status_code", None) or getattr(e, "status", None)
-                if status in (429, 500, 502, 503, 504) and attempt < len(delays) + 1:
-                    time.sleep(delays[attempt - 1])
-                    last_err = e
-                    continue
-                raise LLMError(f"{op} failed: {e}") from e
-        if last_err is not None:
-            raise LLMError(f"{op} failed: {last_err}") from last_err
+        try:
+            return self._retry.call(fn, op=op)
+        except Exception as e:  # noqa: BLE001
+            raise LLMError(f"{op} failed: {e}") from e
+
+    def _acquire(self, tokens: int) -> None:
+        if self._limiter is not None:
+            self._limiter.acquire(tokens)
+
+    def _embed_batch(
+        self,
+        batch: list[str],
+        mdl: str,
+        normalize: bool,
+        timeout_s: float,
+        as_array: bool = False,
+        tokens: int = 0,
+    ) -> Any:
+        t0 = time.perf_counter()
+
+        def _call():
+            return self._client.embeddings.create(model=mdl, input=batch, timeout=timeout_s)
+
+        # quota is taken once per request; retries of the same request do not spend it again
+        self._acquire(tokens)
+        try:
+            res = self._with_retries(_call, op="embeddings.create")
+        except LLMError as e:
+            if len(batch) > 1 and is_batch_too_large(e.__cause__):
+                # provider rejected the request size: retry each half on its own
+                mid = len(batch) // 2
+                self._log.info("embed_split", extra={"batch_size": len(batch)})
+                left, right = (
+                    self._embed_batch(
+                        half, mdl, normalize, timeout_s, as_array, tokens * len(half) // len(batch)
+                    )
+                    for half in (batch[:mid], batch[mid:])
+                )
+                return np.concatenate([left, right]) if as_array else left + right
+            raise
+        batch_vecs: Any = [d.embedding for d in res.data]
+        if as_array:
+            batch_vecs = np.asarray(batch_vecs, dtype=np.float32)
+            if normalize:
+                _normalize_array(batch_vecs)
+        elif normalize:
+            batch_vecs = _normalize_rows(batch_vecs)
+        self._log.info(
+            "embed_batch",
+            extra={"batch_size": len(batch), "elapsed_ms": int((time.perf_counter() - t0) * 1000)},
+        )
+        return batch_vecs
+
+    def _run_batches(
+        self,
+        texts: list[str],
+        *,
+        model: str | None,
+        batch_size: int,
+        normalize: bool,
+        timeout_s: float,
+        concurrency: int,
+        max_batch_tokens: int | None,
+        as_array: bool,
+    ) -> Iterator[tuple[BatchPlan, Any]]:
+        mdl = model or self.settings.llm_embed_model
+        if not mdl:
+            raise ConfigError("Embedding model is not configured")
+
+        plans = plan_batches(
+            texts,
+            max_items=batch_size,
+            max_tokens=max_batch_tokens,
+            token_counts=_token_counts(self._limiter, texts),
+        )
+        start_time = time.perf_counter()
+
+        def _run(p: BatchPlan) -> tuple[BatchPlan, Any]:
+            return p, self._embed_batch(
+                texts[p.start : p.end], mdl, normalize, timeout_s, as_array, p.tokens
+            )
+
+        if concurrency > 1 and len(plans) > 1:
+            with ThreadPoolExecutor(max_workers=min(concurrency, len(plans))) as ex:
+                yield from ex.map(_run, plans)
+        else:
+            for p in plans:
+                yield _run(p)
+        self._log.info(
+            "embed_total",
+            extra={
+                "texts": len(texts),
+                "concurrency": concurrency,
+                "elapsed_ms": int((time.perf_counter() - start_time) * 1000),
+                **(_embed_log_extra.get() or {}),
+            },
+        )
 
     def embed_texts(
         self,
@@ -80,6 +363,253 @@ class _OpenAILLMClient:
         batch_size: int = 64,
         normalize: bool = True,
         timeout_s: float = 60.0,
+        concurrency: int = 1,
+        max_batch_tokens: int | None = None,
+    ) -> list[list[float]]:
+        """Embed ``texts`` in batches of ``batch_size``.
+
+        ``max_batch_tokens`` additionally caps the estimated tokens per request, and
+        a batch the provider rejects as too large is split in half and retried.
+        ``concurrency`` > 1 keeps that many batches in flight on a thread pool;
+        results are returned in input order either way.
+        """
+        if not texts:
+            return []
+        vectors: list[list[float]] = []
+        for _, batch_vecs in self._run_batches(
+            texts,
+            model=model,
+            batch_size=batch_size,
+            normalize=normalize,
+            timeout_s=timeout_s,
+            concurrency=concurrency,
+            max_batch_tokens=max_batch_tokens,
+            as_array=False,
+        ):
+            vectors.extend(batch_vecs)
+        return vectors
+
+    def embed_array(
+        self,
+        texts: list[str],
+        *,
+        model: str | None = None,
+        batch_size: int = 64,
+        normalize: bool = True,
+        timeout_s: float = 60.0,
+        concurrency: int = 1,
+        max_batch_tokens: int | None = None,
+    ) -> np.ndarray:
+        """Like ``embed_texts`` but returns one contiguous ``(len(texts), dim)`` float32 array.
+
+        The array is allocated once the first batch reveals the dimension and
+        filled batch by batch; vectors never round-trip through Python floats.
+        """
+        if not texts:
+            return np.empty((0, 0), dtype=np.float32)
+        out: np.ndarray | None = None
+        for p, arr in self._run_batches(
+            texts,
+            model=model,
+            batch_size=batch_size,
+            normalize=normalize,
+            timeout_s=timeout_s,
+            concurrency=concurrency,
+            max_batch_tokens=max_batch_tokens,
+            as_array=True,
+        ):
+            if out is None:
+                out = np.empty((len(texts), arr.shape[1]), dtype=np.float32)
+            out[p.start : p.end] = arr
+        return out  # type: ignore[return-value]
+
+    def chat(
+        self,
+        messages: list[dict[str, str]],
+        *,
+        model: str | None = None,
+        temperature: float = 0.2,
+        max_tokens: int | None = None,
+        timeout_s: float = 60.0,
+        tools: list[dict] | None = None,
+    ) -> dict:
+        mdl = model or self.settings.llm_chat_model
+        if not mdl:
+            raise ConfigError("Chat model is not configured")
+        t0 = time.perf_counter()
+
+        cost = _chat_tokens(self._limiter, messages, max_tokens)
+
+        def _call():
+            return self._client.chat.completions.create(  # type: ignore[attr-defined]
+                model=mdl,
+                messages=messages,
+                temperature=temperature,
+                max_tokens=max_tokens,
+                tools=tools,
+                timeout=timeout_s,
+            )
+
+        self._acquire(cost)
+        res = self._with_retries(_call, op="chat.completions.create")
+        self._log.info(
+            "chat_call",
+            extra={"messages": len(messages), "elapsed_ms": int((time.perf_counter() - t0) * 1000)},
+        )
+        choice = res.choices[0]
+        content = choice.message.content or ""
+        return {"content": content, "raw": res}
+
+    def chat_stream(
+        self,
+        messages: list[dict[str, str]],
+        *,
+        model: str | None = None,
+        temperature: float = 0.2,
+        max_tokens: int | None = None,
+        timeout_s: float = 60.0,
+        tools: list[dict] | None = None,
+    ) -> Iterator[dict]:
+        """Stream a chat completion.
+
+        Yields ``{"type": "content", "content": ...}`` deltas and
+        ``{"type": "tool_call", "index", "id", "name", "arguments"}`` fragments as
+        they arrive; time to first token and throughput go to ``chat_call``.
+        Settings are checked on the call, before the iterator is returned;
+        errors while streaming are raised as ``LLMError``.
+        """
+        mdl = model or self.settings.llm_chat_model
+        if not mdl:
+            raise ConfigError("Chat model is not configured")
+        return self._stream(messages, mdl, temperature, max_tokens, timeout_s, tools)
+
+    def _stream(
+        self,
+        messages: list[dict[str, str]],
+        mdl: str,
+        temperature: float,
+        max_tokens: int | None,
+        timeout_s: float,
+        tools: list[dict] | None,
+    ) -> Iterator[dict]:
+        stats = _StreamStats(len(messages))
+
+        cost = _chat_tokens(self._limiter, messages, max_tokens)
+
+        def _call():
+            return self._client.chat.completions.create(  # type: ignore[attr-defined]
+                model=mdl,
+                messages=messages,
+                temperature=temperature,
+                max_tokens=max_tokens,
+                tools=tools,
+                timeout=timeout_s,
+                stream=True,
+            )
+
+        self._acquire(cost)
+        stream = self._with_retries(_call, op="chat.completions.create")
+        try:
+            it = iter(stream)
+            while True:
+                try:
+                    chunk = next(it)
+                except StopIteration:
+                    break
+                except Exception as e:  # noqa: BLE001
+                    raise LLMError(f"chat.completions.create stream failed: {e}") from e
+                events = _stream_events(chunk)
+                stats.saw(events)
+                yield from events
+        finally:
+            _close_stream(stream)
+            self._log.info("chat_call", extra=stats.extra())
+
+
+class _AsyncOpenAILLMClient:
+    """asyncio counterpart of ``_OpenAILLMClient``.
+
+    One instance owns one ``AsyncOpenAI`` connection pool; share it across
+    coroutines instead of creating a client per request. Backoff uses
+    ``asyncio.sleep`` so retries never block the event loop.
+    """
+
+    def __init__(
+        self,
+        settings: Settings,
+        *,
+        http_client: Any = None,
+        retry_policy: RetryPolicy | None = None,
+        rate_limiter: RateLimiter | None = None,
+    ):
+        if AsyncOpenAI is None:
+            raise LLMError("openai async client is not available")
+        self.settings = settings
+        kwargs: dict[str, Any] = {}
+        if settings.openai_api_key is not None:
+            kwargs["api_key"] = settings.openai_api_key
+        if settings.openai_base_url is not None:
+            kwargs["base_url"] = settings.openai_base_url
+        if http_client is not None:
+            kwargs["http_client"] = http_client
+        try:
+            self._client = AsyncOpenAI(**kwargs)  # type: ignore[arg-type]
+        except TypeError:
+            self._client = AsyncOpenAI()  # type: ignore[call-arg]
+        self._retry = retry_policy or get_retry_policy("llm")
+        self._limiter = rate_limiter or _default_limiter(settings)
+        self._log = get_logger(__name__)
+
+    async def _with_retries(self, fn, *, op: str):
+        try:
+            return await self._retry.acall(fn, op=op)
+        except Exception as e:  # noqa: BLE001
+            raise LLMError(f"{op} failed: {e}") from e
+
+    async def _acquire(self, tokens: int) -> None:
+        if self._limiter is not None:
+            await self._limiter.aacquire(tokens)
+
+    async def _embed_batch(
+        self, batch: list[str], mdl: str, normalize: bool, timeout_s: float, tokens: int = 0
+    ) -> list[list[float]]:
+        t0 = time.perf_counter()
+
+        async def _call():
+            return await self._client.embeddings.create(model=mdl, input=batch, timeout=timeout_s)
+
+        await self._acquire(tokens)
+        try:
+            res = await self._with_retries(_call, op="embeddings.create")
+        except LLMError as e:
+            if len(batch) > 1 and is_batch_too_large(e.__cause__):
+                mid = len(batch) // 2
+                self._log.info("embed_split", extra={"batch_size": len(batch)})
+                half = tokens * mid // len(batch)
+                left = await self._embed_batch(batch[:mid], mdl, normalize, timeout_s, half)
+                return left + await self._embed_batch(
+                    batch[mid:], mdl, normalize, timeout_s, tokens - half
+                )
+            raise
+        batch_vecs = [d.embedding for d in res.data]
+        if normalize:
+            batch_vecs = _normalize_rows(batch_vecs)
+        self._log.info(
+            "embed_batch",
+            extra={"batch_size": len(batch), "elapsed_ms": int((time.perf_counter() - t0) * 1000)},
+        )
+        return batch_vecs
+
+    async def embed_texts(
+        self,
+        texts: list[str],
+        *,
+        model: str | None = None,
+        batch_size: int = 64,
+        normalize: bool = True,
+        timeout_s: float = 60.0,
+        concurrency: int = 1,
+        max_batch_tokens: int | None = None,
     ) -> list[list[float]]:
         if not texts:
             return []
@@ -87,35 +617,35 @@ class _OpenAILLMClient:
         if not mdl:
             raise ConfigError("Embedding model is not configured")
 
-        vectors: list[list[float]] = []
+        plans = plan_batches(
+            texts,
+            max_items=batch_size,
+            max_tokens=max_batch_tokens,
+            token_counts=_token_counts(self._limiter, texts),
+        )
+        sem = asyncio.Semaphore(max(1, concurrency))
         start_time = time.perf_counter()
-        for i in range(0, len(texts), batch_size):
-            batch = texts[i : i + batch_size]
-            t0 = time.perf_counter()
 
-            def _call():
-                return self._client.embeddings.create(model=mdl, input=batch, timeout=timeout_s)
+        async def _run(p: BatchPlan) -> list[list[float]]:
+            async with sem:
+                return await self._embed_batch(
+                    texts[p.start : p.end], mdl, normalize, timeout_s, p.tokens
+                )
 
-            res = self._with_retries(_call, op="embeddings.create")
-            batch_vecs = [d.embedding for d in res.data]
-            if normalize:
-                arr = np.array(batch_vecs, dtype=np.float32)
-                norms = np.linalg.norm(arr, axis=1, keepdims=True)
-                norms[norms == 0] = 1.0
-                arr = arr / norms
-                batch_vecs = arr.tolist()
-            vectors.extend(batch_vecs)
-            self._log.info(
-                "embed_batch",
-                extra={"batch_size": len(batch), "elapsed_ms": int((time.perf_counter() - t0) * 1000)},
-            )
+        results = await asyncio.gather(*(_run(p) for p in plans))
+        vectors = [v for batch_vecs in results for v in batch_vecs]
         self._log.info(
             "embed_total",
-            extra={"texts": len(texts), "elapsed_ms": int((time.perf_counter() - start_time) * 1000)},
+            extra={
+                "texts": len(texts),
+                "concurrency": concurrency,
+                "elapsed_ms": int((time.perf_counter() - start_time) * 1000),
+                **(_embed_log_extra.get() or {}),
+            },
         )
         return vectors
 
-    def chat(
+    async def chat(
         self,
         messages: list[dict[str, str]],
         *,
@@ -130,8 +660,10 @@ class _OpenAILLMClient:
             raise ConfigError("Chat model is not configured")
         t0 = time.perf_counter()
 
-        def _call():
-            return self._client.chat.completions.create(  # type: ignore[attr-defined]
+        cost = _chat_tokens(self._limiter, messages, max_tokens)
+
+        async def _call():
+            return await self._client.chat.completions.create(  # type: ignore[attr-defined]
                 model=mdl,
                 messages=messages,
                 temperature=temperature,
@@ -140,7 +672,8 @@ class _OpenAILLMClient:
                 timeout=timeout_s,
             )
 
-        res = self._with_retries(_call, op="chat.completions.create")
+        await self._acquire(cost)
+        res = await self._with_retries(_call, op="chat.completions.create")
         self._log.info(
             "chat_call",
             extra={"messages": len(messages), "elapsed_ms": int((time.perf_counter() - t0) * 1000)},
@@ -149,7 +682,117 @@ class _OpenAILLMClient:
         content = choice.message.content or ""
         return {"content": content, "raw": res}
 
+    def chat_stream(
+        self,
+        messages: list[dict[str, str]],
+        *,
+        model: str | None = None,
+        temperature: float = 0.2,
+        max_tokens: int | None = None,
+        timeout_s: float = 60.0,
+        tools: list[dict] | None = None,
+    ) -> AsyncIterator[dict]:
+        mdl = model or self.settings.llm_chat_model
+        if not mdl:
+            raise ConfigError("Chat model is not configured")
+        return self._stream(messages, mdl, temperature, max_tokens, timeout_s, tools)
+
+    async def _stream(
+        self,
+        messages: list[dict[str, str]],
+        mdl: str,
+        temperature: float,
+        max_tokens: int | None,
+        timeout_s: float,
+        tools: list[dict] | None,
+    ) -> AsyncIterator[dict]:
+        stats = _StreamStats(len(messages))
+
+        cost = _chat_tokens(self._limiter, messages, max_tokens)
+
+        async def _call():
+            return await self._client.chat.completions.create(  # type: ignore[attr-defined]
+                model=mdl,
+                messages=messages,
+                temperature=temperature,
+                max_tokens=max_tokens,
+                tools=tools,
+                timeout=timeout_s,
+                stream=True,
+            )
+
+        await self._acquire(cost)
+        stream = await self._with_retries(_call, op="chat.completions.create")
+        try:
+            it = stream.__aiter__()
+            while True:
+                try:
+                    chunk = await it.__anext__()
+                except StopAsyncIteration:
+                    break
+                except Exception as e:  # noqa: BLE001
+                    raise LLMError(f"chat.completions.create stream failed: {e}") from e
+                events = _stream_events(chunk)
+                stats.saw(events)
+                for event in events:
+                    yield event
+        finally:
+            await _aclose_stream(stream)
+            self._log.info("chat_call", extra=stats.extra())
+
+
+# Default clients are reused per settings so repeated helper calls share one
+# HTTP connection pool. The OpenAI class is part of the key so swapping it
+# (e.g. in tests) never serves a client built by the previous factory.
+_clients: dict[tuple, LLMClient] = {}
+# Async pools are bound to the event loop that created them.
+_async_clients: (
+    "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, dict[tuple, AsyncLLMClient]]"
+) = weakref.WeakKeyDictionary()
+_clients_lock = threading.Lock()
 
-def get_default_client(settings: Settings | None = None) -> LLMClient:
+
+def _settings_key(st: Settings) -> tuple:
+    return tuple(sorted(st.model_dump().items()))
+
+
+def get_default_client(settings: Settings | None = None, *, cached: bool = True) -> LLMClient:
+    st = settings or load_settings()
+    if not cached:
+        return _OpenAILLMClient(st)
+    key = (OpenAI, _settings_key(st))
+    client = _clients.get(key)
+    if client is None:
+        with _clients_lock:
+            client = _clients.get(key)
+            if client is None:
+                client = _OpenAILLMClient(st)
+                _clients[key] = client
+    return client
+
+
+def get_default_async_client(
+    settings: Settings | None = None, *, cached: bool = True
+) -> AsyncLLMClient:
     st = settings or load_settings()
-    return _OpenAILLMClient(st)
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        loop = None
+    if not cached or loop is None:
+        return _AsyncOpenAILLMClient(st)
+    key = (AsyncOpenAI, _settings_key(st))
+    with _clients_lock:
+        per_loop = _async_clients.setdefault(loop, {})
+        client = per_loop.get(key)
+        if client is None:
+            client = _AsyncOpenAILLMClient(st)
+            per_loop[key] = client
+    return client
+
+
+def clear_client_cache() -> None:
+    """Forget cached default clients (e.g. after rotating API keys)."""
+    with _clients_lock:
+        _clients.clear()
+        _async_clients.clear()
@@ -2,8 +2,9 @@ from __future__ import annotations
 
 from typing import List
 
+import numpy as np
 from kit_common.config import Settings, load_settings
-from .client import get_default_client
+from .client import get_default_async_client, get_default_client
 
 
 def embed_texts(
@@ -13,10 +14,63 @@ def embed_texts(
     batch_size: int = 64,
     normalize: bool = True,
     timeout_s: float = 60.0,
+    concurrency: int = 1,
+    max_batch_tokens: int | None = None,
 ) -> List[List[float]]:
     st: Settings = load_settings()
     client = get_default_client(st)
     return client.embed_texts(
-        texts, model=model, batch_size=batch_size, normalize=normalize, timeout_s=timeout_s
+        texts,
+        model=model,
+        batch_size=batch_size,
+        normalize=normalize,
+        timeout_s=timeout_s,
+        concurrency=concurrency,
+        max_batch_tokens=max_batch_tokens,
     )
 
+
+def embed_array(
+    texts: list[str],
+    *,
+    model: str | None = None,
+    batch_size: int = 64,
+    normalize: bool = True,
+    timeout_s: float = 60.0,
+    concurrency: int = 1,
+    max_batch_tokens: int | None = None,
+) -> np.ndarray:
+    st: Settings = load_settings()
+    client = get_default_client(st)
+    return client.embed_array(
+        texts,
+        model=model,
+        batch_size=batch_size,
+        normalize=normalize,
+        timeout_s=timeout_s,
+        concurrency=concurrency,
+        max_batch_tokens=max_batch_tokens,
+    )
+
+
+async def aembed_texts(
+    texts: list[str],
+    *,
+    model: str | None = None,
+    batch_size: int = 64,
+    normalize: bool = True,
+    timeout_s: float = 60.0,
+    concurrency: int = 1,
+    max_batch_tokens: int | None = None,
+) -> List[List[float]]:
+    st: Settings = load_settings()
+    client = get_default_async_client(st)
+    return await client.embed_texts(
+        texts,
+        model=model,
+        batch_size=batch_size,
+        normalize=normalize,
+        timeout_s=timeout_s,
+        concurrency=concurrency,
+        max_batch_tokens=max_batch_tokens,
+    )
@@ -0,0 +1,155 @@
+from __future__ import annotations
+
+import asyncio
+import sqlite3
+import threading
+import time
+from typing import Callable
+
+from kit_common.logging import get_logger
+
+
+class RateLimiter:
+    """Client-side token buckets for requests per minute and tokens per minute.
+
+    Both buckets start full and refill continuously at ``rpm``/``tpm`` per 60 s;
+    ``None`` disables a bucket. ``acquire(tokens)`` reserves one request and
+    ``tokens`` up front and sleeps until the reservation is covered, so callers
+    are served in arrival order and a large request cannot be starved.
+
+    Thread-safe. With ``path`` the bucket state lives in a SQLite file, and every
+    process on the host using the same ``path`` and ``key`` shares one quota.
+    """
+
+    def __init__(
+        self,
+        *,
+        rpm: float | None = None,
+        tpm: float | None = None,
+        path: str | None = None,
+        key: str = "default",
+        clock: Callable[[], float] = time.time,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        self.rpm = rpm
+        self.tpm = tpm
+        self.path = path
+        self.key = key
+        self._clock = clock
+        self._sleep = sleep
+        self._lock = threading.Lock()
+        self._log = get_logger(__name__)
+        self.waits = 0
+        self.waited_s = 0.0
+        self._conn: sqlite3.Connection | None = None
+        if path is not None:
+            # autocommit mode so BEGIN IMMEDIATE below controls the transaction
+            self._conn = sqlite3.connect(
+                path, timeout=30.0, isolation_level=None, check_same_thread=False
+            )
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS rate_buckets ("
+                "key TEXT PRIMARY KEY, requests REAL NOT NULL, tokens REAL NOT NULL, "
+                "updated REAL NOT NULL)"
+            )
+        self._state = (float(rpm or 0), float(tpm or 0), clock())
+
+    def _take(
+        self, state: tuple[float, float, float], tokens: int
+    ) -> tuple[tuple[float, float, float], float]:
+        requests, budget, updated = state
+        now = self._clock()
+        elapsed = max(0.0, now - updated)
+        wait = 0.0
+        if self.rpm:
+            requests = min(float(self.rpm), requests + elapsed * self.rpm / 60.0) - 1.0
+            wait = max(wait, -requests * 60.0 / self.rpm)
+        if self.tpm:
+            budget = min(float(self.tpm), budget + elapsed * self.tpm / 60.0) - max(0, tokens)
+            wait = max(wait, -budget * 60.0 / self.tpm)
+        return (requests, budget, now), wait
+
+    def _reserve(self, tokens: int) -> float:
+        with self._lock:
+            if self._conn is None:
+                self._state, wait = self._take(self._state, tokens)
+                return wait
+            conn = self._conn
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = conn.execute(
+                    "SELECT requests, tokens, updated FROM rate_buckets WHERE key = ?", (self.key,)
+                ).fetchone()
+                state, wait = self._take(tuple(row) if row else self._state, tokens)  # type: ignore[arg-type]
+                conn.execute(
+                    "INSERT OR REPLACE INTO rate_buckets (key, requests, tokens, updated) "
+                    "VALUES (?, ?, ?, ?)",
+                    (self.key, *state),
+                )
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            return wait
+
+    def _waited(self, wait: float, tokens: int) -> None:
+        with self._lock:
+            self.waits += 1
+            self.waited_s += wait
+        self._log.info(
+            "rate_limit_wait",
+            extra={"key": self.key, "tokens": tokens, "wait_ms": int(wait * 1000)},
+        )
+
+    def acquire(self, tokens: int = 0) -> float:
+        """Block until one request carrying ``tokens`` fits; returns the seconds waited."""
+        wait = self._reserve(tokens)
+        if wait > 0:
+            self._waited(wait, tokens)
+            self._sleep(wait)
+        return wait
+
+    async def aacquire(self, tokens: int = 0) -> float:
+        """``acquire`` for coroutines: waits with ``asyncio.sleep``.
+
+        With a shared SQLite file the reservation runs in a worker thread, so a
+        busy database never blocks the event loop.
+        """
+        if self._conn is not None:
+            wait = await asyncio.to_thread(self._reserve, tokens)
+        else:
+            wait = self._reserve(tokens)
+        if wait > 0:
+            self._waited(wait, tokens)
+            await asyncio.sleep(wait)
+        return wait
+
+    def stats(self) -> dict[str, float]:
+        with self._lock:
+            return {"waits": self.waits, "waited_s": round(self.waited_s, 3)}
+
+    def close(self) -> None:
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+
+# limiters are shared per quota so every client in the process draws from one bucket
+_limiters: dict[tuple, RateLimiter] = {}
+_limiters_lock = threading.Lock()
+
+
+def get_rate_limiter(
+    *,
+    rpm: float | None = None,
+    tpm: float | None = None,
+    path: str | None = None,
+    key: str = "default",
+) -> RateLimiter:
+    lkey = (rpm, tpm, path, key)
+    with _limiters_lock:
+        limiter = _limiters.get(lkey)
+        if limiter is None:
+            limiter = RateLimiter(rpm=rpm, tpm=tpm, path=path, key=key)
+            _limiters[lkey] = limiter
+        return limiter
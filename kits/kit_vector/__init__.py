@@ -6,13 +6,31 @@ from kit_common.config import Settings, load_settings
 from .models import CollectionParams
 from .base import VectorBackend
 from .qdrant_backend import QdrantBackend
+from .numpy_backend import NumpyBackend
+from .sparse import BM25Index, hybrid_search, rrf_fuse
+from .filters import compile_filter
 
 
 def get_default_backend(settings: Optional[Settings] = None) -> VectorBackend:
     st = settings or load_settings()
+    if st.vector_backend == "numpy":
+        return NumpyBackend(path=st.vector_path)
+    if st.vector_backend != "qdrant":
+        raise ValueError(f"Unknown vector backend: {st.vector_backend}")
     if not st.qdrant_url:
         raise ValueError("Qdrant URL is not configured")
-    return QdrantBackend(url=st.qdrant_url, api_key=st.qdrant_api_key)
-
-__all__ = ["CollectionParams", "VectorBackend", "QdrantBackend", "get_default_backend"]
+    return QdrantBackend(
+        url=st.qdrant_url, api_key=st.qdrant_api_key, prefer_grpc=st.qdrant_prefer_grpc
+    )
 
+__all__ = [
+    "CollectionParams",
+    "VectorBackend",
+    "QdrantBackend",
+    "NumpyBackend",
+    "BM25Index",
+    "hybrid_search",
+    "rrf_fuse",
+    "compile_filter",
+    "get_default_backend",
+]
@@ -2,6 +2,7 @@ from __future__ import annotations
 
 from typing import Protocol
 
+import numpy as np
 from kit_common.models import SearchResult
 from .models import CollectionParams
 
@@ -10,10 +11,26 @@ class VectorBackend(Protocol):
     def ensure_collection(self, params: CollectionParams) -> None: ...
 
     def upsert(
-        self, name: str, vectors: list[list[float]], payloads: list[dict], ids: list[str] | None = None
+        self,
+        name: str,
+        vectors: list[list[float]] | np.ndarray,
+        payloads: list[dict],
+        ids: list[str] | None = None,
     ) -> int: ...
 
-    def search(self, name: str, query: list[float], *, k: int = 5, filter: dict | None = None) -> list[SearchResult]: ...
+    def search(
+        self, name: str, query: list[float] | np.ndarray, *, k: int = 5, filter: dict | None = None
+    ) -> list[SearchResult]: ...
 
-    def recreate(self, params: CollectionParams) -> None: ...
+    def search_batch(
+        self,
+        name: str,
+        queries: list[list[float]] | np.ndarray,
+        *,
+        k: int = 5,
+        filter: dict | list[dict | None] | None = None,
+    ) -> list[list[SearchResult]]: ...
+
+    def delete(self, name: str, ids: list[str]) -> int: ...
 
+    def recreate(self, params: CollectionParams) -> None: ...
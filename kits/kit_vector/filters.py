@@ -0,0 +1,152 @@
+from __future__ import annotations
+
+from typing import Any
+
+from kit_common.errors import ValidationError
+
+# keys that mark a dict as an already native Qdrant filter
+_NATIVE_KEYS = {"must", "should", "must_not", "min_should"}
+_RANGE_OPS = {"gt", "gte", "lt", "lte"}
+_MISSING = object()
+
+
+def _field_conditions(key: str, spec: Any) -> tuple[list[dict], list[dict]]:
+    """(must, must_not) conditions for one ``field: spec`` entry of the DSL."""
+    if spec is None:
+        # Qdrant's is_empty matches a missing field, null and []; is_null only an explicit null
+        return [{"is_empty": {"key": key}}], []
+    if isinstance(spec, (list, tuple, set)):
+        return [{"key": key, "match": {"any": list(spec)}}], []
+    if not isinstance(spec, dict):
+        return [{"key": key, "match": {"value": spec}}], []
+    unknown = set(spec) - _RANGE_OPS - {"eq", "ne", "in", "nin"}
+    if unknown:
+        raise ValidationError(f"unknown filter operator(s) for {key!r}: {sorted(unknown)}")
+    must: list[dict] = []
+    must_not: list[dict] = []
+    rng = {op: spec[op] for op in _RANGE_OPS if op in spec}
+    if rng:
+        must.append({"key": key, "range": rng})
+    if "eq" in spec:
+        must.append({"key": key, "match": {"value": spec["eq"]}})
+    if "in" in spec:
+        must.append({"key": key, "match": {"any": list(spec["in"])}})
+    if "ne" in spec:
+        must_not.append({"key": key, "match": {"value": spec["ne"]}})
+    if "nin" in spec:
+        must.append({"key": key, "match": {"except": list(spec["nin"])}})
+    return must, must_not
+
+
+def compile_filter(flt: dict | None) -> dict | None:
+    """Compile the plain-dict filter DSL into a Qdrant-style filter dict.
+
+    ``{"tenant": "x", "page": {"gte": 3}, "source": ["a", "b"]}`` means
+    tenant == "x" AND page >= 3 AND source in (a, b). Operators: ``eq``, ``ne``,
+    ``in``, ``nin``, ``gt``, ``gte``, ``lt``, ``lte``; ``None`` matches a missing,
+    null or empty-list field. Dicts that already use ``must``/``should``/``must_not``
+    are returned unchanged; mixing those keys with DSL fields raises ``ValidationError``.
+    """
+    if not flt:
+        return None
+    native = _NATIVE_KEYS & set(flt)
+    if native:
+        mixed = set(flt) - _NATIVE_KEYS
+        if mixed:
+            raise ValidationError(
+                f"filter mixes {sorted(native)} with plain fields {sorted(mixed)}; "
+                "put the fields inside 'must' or use the plain form only"
+            )
+        return flt
+    must: list[dict] = []
+    must_not: list[dict] = []
+    for key, spec in flt.items():
+        m, mn = _field_conditions(key, spec)
+        must.extend(m)
+        must_not.extend(mn)
+    out: dict[str, list[dict]] = {"must": must}
+    if must_not:
+        out["must_not"] = must_not
+    return out
+
+
+def _per_query(flt: dict | list[dict | None] | None, n: int) -> list[dict | None]:
+    """One filter per query for ``search_batch``: a shared filter or a list of ``n``."""
+    if not isinstance(flt, list):
+        return [flt] * n
+    if len(flt) != n:
+        raise ValidationError(f"search_batch got {len(flt)} filters for {n} queries")
+    return flt
+
+
+def _lookup(payload: dict, key: str, missing: Any = None) -> Any:
+    if key in payload:
+        return payload[key]
+    value: Any = payload
+    for part in key.split("."):
+        if not isinstance(value, dict) or part not in value:
+            return missing
+        value = value[part]
+    return value
+
+
+def _elements(value: Any) -> list:
+    # like Qdrant, a condition on an array field holds if any element satisfies it;
+    # a missing, null or empty field has no elements and matches nothing
+    if value is None:
+        return []
+    if isinstance(value, list):
+        return [v for v in value if v is not None]
+    return [value]
+
+
+def _in_range(value: Any, rng: dict) -> bool:
+    if not isinstance(value, (int, float)) or isinstance(value, bool):
+        return False
+    return (
+        (rng.get("gt") is None or value > rng["gt"])
+        and (rng.get("gte") is None or value >= rng["gte"])
+        and (rng.get("lt") is None or value < rng["lt"])
+        and (rng.get("lte") is None or value <= rng["lte"])
+    )
+
+
+def _match_condition(payload: dict, cond: dict) -> bool:
+    if _NATIVE_KEYS & set(cond):
+        return matches(payload, cond)
+    if "is_empty" in cond:
+        return _lookup(payload, cond["is_empty"]["key"]) in (None, [])
+    if "is_null" in cond:
+        return _lookup(payload, cond["is_null"]["key"], _MISSING) is None
+    values = _elements(_lookup(payload, cond.get("key", "")))
+    if "match" in cond:
+        match = cond["match"]
+        if "value" in match:
+            return any(v == match["value"] for v in values)
+        if "any" in match:
+            return any(v in match["any"] for v in values)
+        if "except" in match:
+            return any(v not in match["except"] for v in values)
+        return False
+    if "range" in cond:
+        return any(_in_range(v, cond["range"]) for v in values)
+    return False
+
+
+def matches(payload: dict, flt: dict | None) -> bool:
+    """Evaluate a filter (DSL or Qdrant-style dict) against one payload in Python.
+
+    Follows Qdrant's semantics: a condition on an array field holds if any element
+    satisfies it, and only ``is_empty``/``is_null`` match a missing field.
+    """
+    compiled = compile_filter(flt)
+    if compiled is None:
+        return True
+    must = compiled.get("must") or []
+    should = compiled.get("should") or []
+    must_not = compiled.get("must_not") or []
+    if not all(_match_condition(payload, c) for c in must):
+        return False
+    if should and not any(_match_condition(payload, c) for c in should):
+        return False
+    return not any(_match_condition(payload, c) for c in must_not)
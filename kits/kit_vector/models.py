@@ -2,14 +2,26 @@ from __future__ import annotations
 
 from typing import Literal
 
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from kit_common.models import SearchResult as _SearchResult
 
 
+PayloadIndexType = Literal["keyword", "integer", "float", "bool", "text", "datetime", "uuid"]
+
+
 class CollectionParams(BaseModel):
     name: str
     vector_size: int
     distance: Literal["cosine", "dot"]
+    # "scalar" keeps int8 codes, "binary" one bit per dimension; searches rank
+    # oversampling * k candidates on the codes and rescore them with the floats
+    quantization: Literal["scalar", "binary"] | None = None
+    oversampling: float = 2.0
+    rescore: bool = True
+    # Qdrant only: keep the original float vectors on disk
+    on_disk: bool = False
+    # payload fields to index for filtering, e.g. {"tenant": "keyword", "page": "integer"}
+    payload_indexes: dict[str, PayloadIndexType] = Field(default_factory=dict)
 
 
 # re-export for type reference convenience if needed by users
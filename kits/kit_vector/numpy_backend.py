@@ -0,0 +1,524 @@
+from __future__ import annotations
+
+import json
+import math
+import os
+import threading
+import uuid
+from typing import Any
+
+import numpy as np
+from kit_common.errors import ValidationError
+from kit_common.logging import get_logger
+from kit_common.models import SearchResult
+from .filters import _elements, _lookup, _per_query, compile_filter, matches
+from .models import CollectionParams
+
+
+# payload index types whose values can be looked up by equality
+_HASHED_INDEXES = {"keyword", "integer", "bool", "uuid"}
+
+# rows decoded to float32 at a time when scoring int8 codes
+_BLOCK_ROWS = 65536
+
+if hasattr(np, "bitwise_count"):
+    _popcount = np.bitwise_count
+else:  # numpy < 2.0
+    _POPCOUNT = np.unpackbits(np.arange(256, dtype=np.uint8)[:, None], axis=1).sum(axis=1)
+
+    def _popcount(x: np.ndarray) -> np.ndarray:
+        return _POPCOUNT[x]
+
+
+def _quantize(kind: str, arr: np.ndarray) -> tuple[np.ndarray, np.ndarray | None]:
+    """int8 codes with one scale per row ("scalar"), or packed sign bits ("binary")."""
+    if kind == "scalar":
+        scale = np.abs(arr).max(axis=1) / 127.0
+        scale[scale == 0] = 1.0
+        codes = np.rint(arr / scale[:, None]).astype(np.int8)
+        return codes, scale.astype(np.float32)
+    return np.packbits(arr > 0, axis=1), None
+
+
+class _Rows:
+    """Row-indexed array made of a fixed head (e.g. a copy-on-write memory map) and a RAM tail.
+
+    Rows past the head are appended to the tail, so growing a mapped collection
+    never copies the head into memory; overwriting a head row only copies the
+    pages it touches.
+    """
+
+    def __init__(self, head: np.ndarray):
+        self.head = head
+        self.n_head = len(head)
+        self.tail = np.empty((0,) + head.shape[1:], dtype=head.dtype)
+
+    @property
+    def capacity(self) -> int:
+        return self.n_head + len(self.tail)
+
+    def reserve(self, need: int, used: int) -> None:
+        if need <= self.capacity:
+            return
+        rows = max(need - self.n_head, 2 * len(self.tail), 1024)
+        grown = np.empty((rows,) + self.tail.shape[1:], dtype=self.tail.dtype)
+        keep = max(0, used - self.n_head)
+        grown[:keep] = self.tail[:keep]
+        self.tail = grown
+
+    def __getitem__(self, idx: Any) -> np.ndarray:
+        if np.isscalar(idx):
+            i = int(idx)
+            return self.head[i] if i < self.n_head else self.tail[i - self.n_head]
+        idx = np.asarray(idx, dtype=np.int64)
+        out = np.empty((len(idx),) + self.head.shape[1:], dtype=self.head.dtype)
+        in_head = idx < self.n_head
+        out[in_head] = self.head[idx[in_head]]
+        out[~in_head] = self.tail[idx[~in_head] - self.n_head]
+        return out
+
+    def __setitem__(self, idx: Any, value: Any) -> None:
+        if np.isscalar(idx):
+            i = int(idx)
+            if i < self.n_head:
+                self.head[i] = value
+            else:
+                self.tail[i - self.n_head] = value
+            return
+        idx = np.asarray(idx, dtype=np.int64)
+        value = np.asarray(value)
+        in_head = idx < self.n_head
+        self.head[idx[in_head]] = value[in_head]
+        self.tail[idx[~in_head] - self.n_head] = value[~in_head]
+
+    def blocks(self, n: int, size: int = _BLOCK_ROWS):
+        """``(lo, hi, view)`` over the first ``n`` rows; blocks never straddle head and tail."""
+        for base, arr, end in ((0, self.head, min(n, self.n_head)), (self.n_head, self.tail, n)):
+            for lo in range(base, end, size):
+                hi = min(end, lo + size)
+                yield lo, hi, arr[lo - base : hi - base]
+
+
+def _save_rows(path: str, rows: _Rows, n: int) -> None:
+    """Write the first ``n`` rows block by block without gathering them in memory."""
+    if n == 0:
+        with open(path, "wb") as f:
+            np.save(f, rows.head[:0])
+        return
+    shape = (n,) + rows.head.shape[1:]
+    out = np.lib.format.open_memmap(path, mode="w+", dtype=rows.head.dtype, shape=shape)
+    for lo, hi, block in rows.blocks(n):
+        out[lo:hi] = block
+    out.flush()
+    del out
+
+
+def _load_rows(path: str, mode: str | None, n: int) -> np.ndarray | None:
+    if not os.path.exists(path):
+        return None
+    arr = np.load(path, mmap_mode=mode)
+    return arr if arr.shape[0] == n else None
+
+
+class _Collection:
+    def __init__(self, params: CollectionParams):
+        self.params = params
+        self.matrix = _Rows(np.empty((0, params.vector_size), dtype=np.float32))
+        self.size = 0
+        self.ids: list[str] = []
+        self.rows: dict[str, int] = {}
+        self.payloads: list[dict] = []
+        self.codes: _Rows | None = None
+        self.scales: _Rows | None = None
+        if params.quantization is not None:
+            codes, scales = _quantize(params.quantization, self.matrix.head)
+            self.codes = _Rows(codes)
+            self.scales = _Rows(scales) if scales is not None else None
+        # field -> value -> rows, for the exact-match fields in params.payload_indexes
+        # and any other field a filter has matched on exactly (see indexed_rows)
+        self.index: dict[str, dict[Any, set[int]]] = {
+            f: {} for f, kind in params.payload_indexes.items() if kind in _HASHED_INDEXES
+        }
+
+    def _index_row(self, row: int, *, add: bool) -> None:
+        payload = self.payloads[row]
+        for field, values in self.index.items():
+            # array fields are indexed under each element, as matches() checks them
+            for value in _elements(_lookup(payload, field)):
+                if isinstance(value, (dict, list)):
+                    continue
+                if add:
+                    values.setdefault(value, set()).add(row)
+                elif value in values:
+                    values[value].discard(row)
+
+    def index_field(self, field: str) -> None:
+        """Build the exact-match index of ``field`` from the stored payloads (one O(n) pass)."""
+        values: dict[Any, set[int]] = {}
+        for row in range(self.size):
+            for value in _elements(_lookup(self.payloads[row], field)):
+                if not isinstance(value, (dict, list)):
+                    values.setdefault(value, set()).add(row)
+        self.index[field] = values
+
+    def set_payload(self, row: int, payload: dict) -> None:
+        if row < len(self.payloads):
+            self._index_row(row, add=False)
+            self.payloads[row] = payload
+        else:
+            self.payloads.append(payload)
+        self._index_row(row, add=True)
+
+    def remove(self, pid: str) -> bool:
+        """Drop point ``pid`` by moving the last row into its slot."""
+        row = self.rows.pop(pid, None)
+        if row is None:
+            return False
+        last = self.size - 1
+        self._index_row(row, add=False)
+        if row != last:
+            self._index_row(last, add=False)
+            self.matrix[row] = self.matrix[last]
+            if self.codes is not None:
+                self.codes[row] = self.codes[last]
+            if self.scales is not None:
+                self.scales[row] = self.scales[last]
+            moved = self.ids[last]
+            self.ids[row] = moved
+            self.rows[moved] = row
+            self.payloads[row] = self.payloads[last]
+            self._index_row(row, add=True)
+        self.ids.pop()
+        self.payloads.pop()
+        self.size -= 1
+        return True
+
+    def indexed_rows(self, compiled: dict) -> set[int] | None:
+        """Rows that can satisfy ``compiled``'s ``must`` exact matches, or None if none apply.
+
+        A field matched on for the first time is indexed here, so later filters on
+        it skip the full payload scan.
+        """
+        found: set[int] | None = None
+        for cond in compiled.get("must") or []:
+            match = cond.get("match") or {}
+            if "key" not in cond or not ("value" in match or "any" in match):
+                continue
+            if cond["key"] not in self.index:
+                self.index_field(cond["key"])
+            values = self.index[cond["key"]]
+            wanted = [match["value"]] if "value" in match else match["any"]
+            rows = set().union(*(values.get(v, ()) for v in wanted))
+            found = rows if found is None else found & rows
+        return found
+
+    def reserve(self, extra: int) -> None:
+        for rows in (self.matrix, self.codes, self.scales):
+            if rows is not None:
+                rows.reserve(self.size + extra, self.size)
+
+    def encode(self, rows: np.ndarray, arr: np.ndarray) -> None:
+        if self.params.quantization is None:
+            return
+        codes, scales = _quantize(self.params.quantization, arr)
+        self.codes[rows] = codes  # type: ignore[index]
+        if self.scales is not None:
+            self.scales[rows] = scales
+
+    def encode_all(self) -> None:
+        """Rebuild the codes from the float matrix block by block (e.g. after loading)."""
+        if self.params.quantization is None:
+            return
+        parts = [
+            _quantize(self.params.quantization, block)
+            for _, _, block in self.matrix.blocks(self.size)
+        ]
+        empty = _quantize(self.params.quantization, self.matrix.head[:0])
+        self.codes = _Rows(np.concatenate([empty[0]] + [c for c, _ in parts]))
+        if empty[1] is not None:
+            self.scales = _Rows(np.concatenate([empty[1]] + [s for _, s in parts]))  # type: ignore[misc]
+
+    def float_scores(self, q: np.ndarray) -> np.ndarray:
+        """Exact scores of ``q`` (n_queries x dim) against every live row."""
+        out = np.empty((len(q), self.size), dtype=np.float32)
+        for lo, hi, block in self.matrix.blocks(self.size):
+            out[:, lo:hi] = q @ block.T
+        return out
+
+    def approx_scores(self, q: np.ndarray) -> np.ndarray:
+        """Scores of ``q`` (n_queries x dim) against the codes of every live row."""
+        n = self.size
+        assert self.codes is not None
+        out = np.empty((len(q), n), dtype=np.float32)
+        if self.params.quantization == "scalar":
+            assert self.scales is not None
+            scales = dict((lo, s) for lo, _, s in self.scales.blocks(n))
+            for lo, hi, block in self.codes.blocks(n):
+                out[:, lo:hi] = (q @ block.astype(np.float32).T) * scales[lo]
+            return out
+        # binary: agreeing signs minus disagreeing ones
+        qbits = np.packbits(q > 0, axis=1)
+        dim = self.params.vector_size
+        for lo, hi, block in self.codes.blocks(n):
+            for i, bits in enumerate(qbits):
+                hamming = _popcount(block ^ bits).sum(axis=1, dtype=np.int32)
+                out[i, lo:hi] = dim - 2 * hamming
+        return out
+
+
+class NumpyBackend:
+    """In-process ``VectorBackend`` keeping each collection in one float32 matrix.
+
+    Cosine collections store unit vectors so every search is a single
+    matrix-vector product followed by ``argpartition``. ``filter`` accepts the
+    same dicts as :class:`QdrantBackend` (see :func:`compile_filter`) and is
+    evaluated in Python against the stored payloads. Fields matched on exactly
+    (``{"tenant": "x"}``, ``in``) are indexed on first use, so only the rows
+    holding the wanted values are tested; filters without such a match (only
+    ranges, ``ne``, ``nin`` ...) test every payload, an O(n) Python loop per
+    query that is logged once per collection and field set as ``filter_scan``.
+
+    With ``path`` the collections are loaded from that directory and
+    :meth:`save` writes them back; ``mmap=True`` maps the saved arrays
+    copy-on-write instead of loading them. Updates and deletes then copy only
+    the pages they touch and new points go to an in-memory tail, so the mapped
+    files are never read in full; changes reach disk on :meth:`save`.
+
+    Quantized collections (``CollectionParams.quantization``) also keep int8 or
+    1-bit codes, saved next to the vectors, and scan those; only the
+    oversampled shortlist is read from the float matrix for rescoring, so with
+    ``mmap=True`` the floats can stay on disk.
+    """
+
+    def __init__(self, path: str | None = None, *, mmap: bool = False):
+        self.path = path
+        self.mmap = mmap
+        self._collections: dict[str, _Collection] = {}
+        self._lock = threading.RLock()
+        self._log = get_logger(__name__)
+        # (collection, fields) of filters already logged as full payload scans
+        self._scanned: set[tuple[str, tuple[str, ...]]] = set()
+        if path is not None and os.path.isdir(path):
+            self._load_all()
+
+    @classmethod
+    def load(cls, path: str, *, mmap: bool = False) -> NumpyBackend:
+        return cls(path, mmap=mmap)
+
+    def _get(self, name: str) -> _Collection:
+        col = self._collections.get(name)
+        if col is None:
+            raise ValidationError(f"collection {name!r} does not exist")
+        return col
+
+    def _prepare(self, col: _Collection, vectors: Any) -> np.ndarray:
+        arr = np.array(vectors, dtype=np.float32, ndmin=2)
+        if arr.shape[1] != col.params.vector_size:
+            raise ValidationError(
+                f"expected vectors of size {col.params.vector_size}, got {arr.shape[1]}"
+            )
+        if col.params.distance == "cosine":
+            norms = np.linalg.norm(arr, axis=1, keepdims=True)
+            np.divide(arr, norms, out=arr, where=norms > 0)
+        return arr
+
+    def ensure_collection(self, params: CollectionParams) -> None:
+        with self._lock:
+            if params.name not in self._collections:
+                self._collections[params.name] = _Collection(params)
+
+    def recreate(self, params: CollectionParams) -> None:
+        with self._lock:
+            self._collections[params.name] = _Collection(params)
+
+    def upsert(
+        self,
+        name: str,
+        vectors: list[list[float]] | np.ndarray,
+        payloads: list[dict],
+        ids: list[str] | None = None,
+    ) -> int:
+        n = len(vectors)
+        if n == 0:
+            return 0
+        with self._lock:
+            col = self._get(name)
+            arr = self._prepare(col, vectors)
+            ids = [str(i) for i in ids] if ids else [str(uuid.uuid4()) for _ in range(n)]
+            col.reserve(n)
+            rows = np.empty(n, dtype=np.int64)
+            for i, pid in enumerate(ids):
+                payload = payloads[i] if i < len(payloads) else {}
+                row = col.rows.get(pid)
+                if row is None:
+                    row = col.size
+                    col.rows[pid] = row
+                    col.ids.append(pid)
+                    col.size += 1
+                col.set_payload(row, payload)
+                col.matrix[row] = arr[i]
+                rows[i] = row
+            col.encode(rows, arr)
+        self._log.info("upsert", extra={"count": n})
+        return n
+
+    def _mask(self, col: _Collection, filter: dict | None) -> np.ndarray | None:
+        compiled = compile_filter(filter)
+        if compiled is None:
+            return None
+        rows = col.indexed_rows(compiled)
+        if rows is None:
+            self._log_scan(col, compiled)
+            payloads = col.payloads
+            return np.fromiter((matches(p, compiled) for p in payloads), dtype=bool, count=col.size)
+        # indexed fields narrow the scan to the rows that can match
+        mask = np.zeros(col.size, dtype=bool)
+        hit = [r for r in rows if matches(col.payloads[r], compiled)]
+        mask[hit] = True
+        return mask
+
+    def _log_scan(self, col: _Collection, compiled: dict) -> None:
+        # filters without an exact match (ranges, ne, nin, should ...) test every payload
+        conds = [c for part in compiled.values() if isinstance(part, list) for c in part]
+        fields = tuple(sorted({c["key"] for c in conds if isinstance(c, dict) and "key" in c}))
+        if (col.params.name, fields) in self._scanned:
+            return
+        self._scanned.add((col.params.name, fields))
+        self._log.info(
+            "filter_scan",
+            extra={"collection": col.params.name, "fields": list(fields), "rows": col.size},
+        )
+
+    @staticmethod
+    def _best(scores: np.ndarray, k: int, mask: np.ndarray | None) -> np.ndarray:
+        """Indices of the ``k`` highest ``scores`` allowed by ``mask``, best first."""
+        if mask is not None:
+            scores = np.where(mask, scores, -np.inf)
+            k = min(k, int(mask.sum()))
+        k = min(k, len(scores))
+        if k <= 0:
+            return np.empty(0, dtype=np.int64)
+        idx = np.argpartition(-scores, k - 1)[:k] if k < len(scores) else np.arange(len(scores))
+        return idx[np.argsort(-scores[idx], kind="stable")]
+
+    def _top_k(
+        self,
+        col: _Collection,
+        q: np.ndarray,
+        scores: np.ndarray,
+        k: int,
+        mask: np.ndarray | None,
+    ) -> list[SearchResult]:
+        if col.codes is None or not col.params.rescore:
+            idx = self._best(scores, k, mask)
+        else:
+            # scores came from the codes: rescore the oversampled shortlist with floats
+            cand = self._best(scores, math.ceil(k * max(1.0, col.params.oversampling)), mask)
+            scores = np.full(len(scores), -np.inf, dtype=np.float32)
+            scores[cand] = col.matrix[cand] @ q
+            idx = cand[self._best(scores[cand], k, None)]
+        return [
+            SearchResult(id=col.ids[i], score=float(scores[i]), payload=col.payloads[i])
+            for i in idx
+        ]
+
+    def search(
+        self, name: str, query: list[float] | np.ndarray, *, k: int = 5, filter: dict | None = None
+    ) -> list[SearchResult]:
+        queries = np.asarray(query, dtype=np.float32)[None, :]
+        return self.search_batch(name, queries, k=k, filter=filter)[0]
+
+    def search_batch(
+        self,
+        name: str,
+        queries: list[list[float]] | np.ndarray,
+        *,
+        k: int = 5,
+        filter: dict | list[dict | None] | None = None,
+    ) -> list[list[SearchResult]]:
+        if len(queries) == 0:
+            return []
+        filters = _per_query(filter, len(queries))
+        with self._lock:
+            col = self._get(name)
+            q = self._prepare(col, queries)
+            if col.codes is not None:
+                scores = col.approx_scores(q)
+            else:
+                scores = col.float_scores(q)
+            if isinstance(filter, list):
+                masks = [self._mask(col, f) for f in filters]
+            else:
+                masks = [self._mask(col, filter)] * len(q)
+            return [self._top_k(col, q[i], scores[i], k, masks[i]) for i in range(len(q))]
+
+    def delete(self, name: str, ids: list[str]) -> int:
+        with self._lock:
+            col = self._get(name)
+            removed = sum(col.remove(str(pid)) for pid in ids)
+        self._log.info("delete", extra={"count": removed})
+        return removed
+
+    def count(self, name: str) -> int:
+        with self._lock:
+            return self._get(name).size
+
+    def save(self, path: str | None = None) -> None:
+        """Write each collection as ``<name>.npy`` (vectors) and ``<name>.json`` (the rest).
+
+        Quantized collections also write ``<name>.codes.npy`` (and
+        ``<name>.scales.npy`` for scalar codes) so loading does not re-quantize.
+        """
+        target = path or self.path
+        if target is None:
+            raise ValidationError("no path to save the collections to")
+        os.makedirs(target, exist_ok=True)
+        with self._lock:
+            for name, col in self._collections.items():
+                base = os.path.join(target, name)
+                # write then rename so a crash never leaves a half-written collection
+                arrays = {".npy": col.matrix, ".codes.npy": col.codes, ".scales.npy": col.scales}
+                written = []
+                for suffix, rows in arrays.items():
+                    if rows is not None:
+                        _save_rows(base + suffix + ".tmp", rows, col.size)
+                        written.append(suffix)
+                meta = {"params": col.params.model_dump(), "ids": col.ids, "payloads": col.payloads}
+                with open(base + ".json.tmp", "w", encoding="utf-8") as f:
+                    json.dump(meta, f, ensure_ascii=False)
+                for suffix in written:
+                    os.replace(base + suffix + ".tmp", base + suffix)
+                for suffix in set(arrays) - set(written):
+                    if os.path.exists(base + suffix):
+                        os.remove(base + suffix)
+                os.replace(base + ".json.tmp", base + ".json")
+
+    def _load_all(self) -> None:
+        assert self.path is not None
+        for fname in sorted(os.listdir(self.path)):
+            if not fname.endswith(".json"):
+                continue
+            base = os.path.join(self.path, fname[: -len(".json")])
+            with open(base + ".json", encoding="utf-8") as f:
+                meta = json.load(f)
+            col = _Collection(CollectionParams(**meta["params"]))
+            # copy-on-write maps: edits stay in memory until save()
+            mode = "c" if self.mmap else None
+            matrix = np.load(base + ".npy", mmap_mode=mode)
+            col.size = int(matrix.shape[0])
+            if col.size:
+                col.matrix = _Rows(matrix)
+            col.ids = list(meta["ids"])
+            col.rows = {pid: i for i, pid in enumerate(col.ids)}
+            for row, payload in enumerate(meta["payloads"]):
+                col.set_payload(row, payload)
+            kind = col.params.quantization
+            codes = _load_rows(base + ".codes.npy", mode, col.size) if kind else None
+            scales = _load_rows(base + ".scales.npy", mode, col.size) if kind else None
+            if codes is not None and (scales is not None or kind == "binary"):
+                col.codes = _Rows(codes)
+                col.scales = _Rows(scales) if scales is not None else None
+            else:
+                # saved before the codes were persisted: rebuild them from the floats
+                col.encode_all()
+            self._collections[col.params.name] = col
@@ -0,0 +1,256 @@
+from __future__ import annotations
+
+import json
+import math
+import os
+import re
+import threading
+from array import array
+from collections import Counter
+from typing import Iterable
+
+import numpy as np
+from kit_common.models import Chunk, SearchResult
+from .base import VectorBackend
+from .filters import compile_filter, matches
+
+_TOKEN_RE = re.compile(r"\w+(?:[-./]\w+)*")
+
+
+def tokenize(text: str) -> list[str]:
+    """Lowercased word tokens; ``AB-1234``, ``12.3`` and ``a/b`` stay one token."""
+    return _TOKEN_RE.findall(text.lower())
+
+
+class BM25Index:
+    """In-process Okapi BM25 index over chunk texts.
+
+    Postings are kept in flat ``array`` buffers (term id, doc number, term
+    frequency) and turned into a CSR inverted index (``indptr``/docs/tfs NumPy
+    arrays) lazily on the next search after a change. Deletes are tombstones;
+    :meth:`compact` (run by :meth:`save` and whenever dead documents outnumber
+    live ones) drops them for good.
+    """
+
+    def __init__(self, *, k1: float = 1.5, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+        self._lock = threading.RLock()
+        self._vocab: dict[str, int] = {}
+        self._ids: list[str] = []
+        self._payloads: list[dict] = []
+        self._docs: dict[str, int] = {}
+        self._doc_len = array("i")
+        self._alive = bytearray()
+        self._terms = array("i")
+        self._doc_of = array("i")
+        self._tf = array("f")
+        self._dirty = True
+        self._indptr = np.zeros(1, dtype=np.int64)
+        self._post_docs = np.empty(0, dtype=np.int32)
+        self._post_tf = np.empty(0, dtype=np.float32)
+        self._lens = np.empty(0, dtype=np.float32)
+        self._avgdl = 0.0
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._docs)
+
+    def add(self, ids: list[str], texts: list[str], payloads: list[dict] | None = None) -> int:
+        """Index ``texts`` under ``ids``; an existing id is replaced.
+
+        An id repeated within one call keeps its last text, as with backend upserts.
+        """
+        last = {pid: n for n, pid in enumerate(ids[: len(texts)])}
+        with self._lock:
+            self.delete([i for i in last if i in self._docs])
+            for pid, n in last.items():
+                text = texts[n]
+                counts = Counter(tokenize(text))
+                docno = len(self._ids)
+                self._ids.append(pid)
+                self._payloads.append(payloads[n] if payloads and n < len(payloads) else {})
+                self._docs[pid] = docno
+                self._doc_len.append(sum(counts.values()))
+                self._alive.append(1)
+                for term, tf in counts.items():
+                    tid = self._vocab.setdefault(term, len(self._vocab))
+                    self._terms.append(tid)
+                    self._doc_of.append(docno)
+                    self._tf.append(tf)
+            self._dirty = True
+            return len(last)
+
+    def add_chunks(self, chunks: Iterable[Chunk], *, with_payload: bool = True) -> int:
+        """Index chunks by ``Chunk.id``, keeping ``model_dump()`` as the payload by default."""
+        items = list(chunks)
+        payloads = [c.model_dump() for c in items] if with_payload else None
+        return self.add([c.id for c in items], [c.text for c in items], payloads)
+
+    def delete(self, ids: list[str]) -> int:
+        removed = 0
+        with self._lock:
+            for pid in ids:
+                docno = self._docs.pop(pid, None)
+                if docno is not None:
+                    self._alive[docno] = 0
+                    removed += 1
+            if removed:
+                self._dirty = True
+        return removed
+
+    def compact(self) -> None:
+        """Renumber live documents and drop the postings of deleted ones."""
+        with self._lock:
+            alive = np.frombuffer(self._alive, dtype=np.uint8).astype(bool)
+            if alive.all():
+                return
+            new_no = np.full(len(alive), -1, dtype=np.int32)
+            new_no[alive] = np.arange(int(alive.sum()), dtype=np.int32)
+            doc_of = np.frombuffer(self._doc_of, dtype=np.int32)
+            keep = alive[doc_of]
+            self._terms = array("i", np.frombuffer(self._terms, dtype=np.int32)[keep].tobytes())
+            self._tf = array("f", np.frombuffer(self._tf, dtype=np.float32)[keep].tobytes())
+            self._doc_of = array("i", new_no[doc_of[keep]].tobytes())
+            lens = np.frombuffer(self._doc_len, dtype=np.int32)[alive]
+            self._doc_len = array("i", lens.tobytes())
+            self._ids = [pid for pid, ok in zip(self._ids, alive) if ok]
+            self._payloads = [p for p, ok in zip(self._payloads, alive) if ok]
+            self._docs = {pid: i for i, pid in enumerate(self._ids)}
+            self._alive = bytearray(b"\x01" * len(self._ids))
+            self._dirty = True
+
+    def _rebuild(self) -> None:
+        if 2 * len(self._docs) < len(self._ids):
+            self.compact()
+        alive = np.frombuffer(self._alive, dtype=np.uint8).astype(bool)
+        terms = np.frombuffer(self._terms, dtype=np.int32)
+        doc_of = np.frombuffer(self._doc_of, dtype=np.int32)
+        keep = alive[doc_of] if len(doc_of) else np.zeros(0, dtype=bool)
+        terms = terms[keep]
+        order = np.argsort(terms, kind="stable")
+        self._post_docs = doc_of[keep][order]
+        self._post_tf = np.frombuffer(self._tf, dtype=np.float32)[keep][order]
+        df = np.bincount(terms, minlength=len(self._vocab))
+        self._indptr = np.concatenate([[0], np.cumsum(df)]).astype(np.int64)
+        self._lens = np.frombuffer(self._doc_len, dtype=np.int32).astype(np.float32)
+        self._avgdl = float(self._lens[alive].mean()) if alive.any() else 0.0
+        self._dirty = False
+
+    def search(self, query: str, *, k: int = 10, filter: dict | None = None) -> list[SearchResult]:
+        with self._lock:
+            if self._dirty:
+                self._rebuild()
+            n_docs = len(self._docs)
+            tids = {self._vocab[t] for t in tokenize(query) if t in self._vocab}
+            if not n_docs or not tids:
+                return []
+            scores = np.zeros(len(self._ids), dtype=np.float32)
+            norm = self.k1 * (1.0 - self.b + self.b * self._lens / max(self._avgdl, 1e-9))
+            for tid in tids:
+                start, end = int(self._indptr[tid]), int(self._indptr[tid + 1])
+                if start == end:
+                    continue
+                docs, tf = self._post_docs[start:end], self._post_tf[start:end]
+                df = end - start
+                idf = math.log(1.0 + (n_docs - df + 0.5) / (df + 0.5))
+                scores[docs] += idf * tf * (self.k1 + 1.0) / (tf + norm[docs])
+            cand = np.flatnonzero(scores > 0)
+            compiled = compile_filter(filter)
+            if compiled is not None:
+                keep = [matches(self._payloads[i], compiled) for i in cand]
+                cand = cand[np.asarray(keep, dtype=bool)]
+            if len(cand) > k:
+                cand = cand[np.argpartition(-scores[cand], k - 1)[:k]]
+            cand = cand[np.argsort(-scores[cand], kind="stable")]
+            return [
+                SearchResult(id=self._ids[i], score=float(scores[i]), payload=self._payloads[i])
+                for i in cand
+            ]
+
+    def save(self, path: str) -> None:
+        """Write the index to one ``.npz`` file (arrays plus a JSON header)."""
+        with self._lock:
+            self.compact()
+            meta = {
+                "k1": self.k1,
+                "b": self.b,
+                "vocab": self._vocab,
+                "ids": self._ids,
+                "payloads": self._payloads,
+            }
+            header = json.dumps(meta, ensure_ascii=False).encode()
+            tmp = path + ".tmp"
+            with open(tmp, "wb") as f:
+                np.savez(
+                    f,
+                    meta=np.frombuffer(header, dtype=np.uint8),
+                    terms=np.frombuffer(self._terms, dtype=np.int32),
+                    doc_of=np.frombuffer(self._doc_of, dtype=np.int32),
+                    tf=np.frombuffer(self._tf, dtype=np.float32),
+                    doc_len=np.frombuffer(self._doc_len, dtype=np.int32),
+                )
+            os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path: str) -> BM25Index:
+        with np.load(path, allow_pickle=False) as data:
+            meta = json.loads(data["meta"].tobytes().decode())
+            index = cls(k1=meta["k1"], b=meta["b"])
+            index._vocab = meta["vocab"]
+            index._ids = meta["ids"]
+            index._payloads = meta["payloads"]
+            index._docs = {pid: i for i, pid in enumerate(index._ids)}
+            index._alive = bytearray(b"\x01" * len(index._ids))
+            index._terms = array("i", data["terms"].tobytes())
+            index._doc_of = array("i", data["doc_of"].tobytes())
+            index._tf = array("f", data["tf"].tobytes())
+            index._doc_len = array("i", data["doc_len"].tobytes())
+        return index
+
+
+def rrf_fuse(
+    rankings: list[list[SearchResult]],
+    *,
+    k: int = 5,
+    rrf_k: int = 60,
+    weights: list[float] | None = None,
+) -> list[SearchResult]:
+    """Reciprocal-rank fusion: ``score(d) = sum_i w_i / (rrf_k + rank_i(d))``.
+
+    Ranks start at 1; the first non-empty payload seen for an id is kept.
+    """
+    weights = weights or [1.0] * len(rankings)
+    scores: dict[str, float] = {}
+    payloads: dict[str, dict] = {}
+    for ranking, w in zip(rankings, weights):
+        for rank, hit in enumerate(ranking, start=1):
+            scores[hit.id] = scores.get(hit.id, 0.0) + w / (rrf_k + rank)
+            if not payloads.get(hit.id):
+                payloads[hit.id] = hit.payload
+    top = sorted(scores.items(), key=lambda kv: -kv[1])[:k]
+    return [SearchResult(id=pid, score=score, payload=payloads[pid]) for pid, score in top]
+
+
+def hybrid_search(
+    backend: VectorBackend,
+    name: str,
+    index: BM25Index,
+    query: str,
+    query_vector: list[float] | np.ndarray,
+    *,
+    k: int = 5,
+    candidates: int | None = None,
+    filter: dict | None = None,
+    rrf_k: int = 60,
+    weights: list[float] | None = None,
+) -> list[SearchResult]:
+    """Dense ``backend.search`` and sparse ``index.search`` fused with :func:`rrf_fuse`.
+
+    Each side returns ``candidates`` hits (default ``max(4 * k, 20)``); ``filter``
+    applies to both. ``weights`` are ``[dense, sparse]``.
+    """
+    n = candidates or max(4 * k, 20)
+    dense = backend.search(name, query_vector, k=n, filter=filter)
+    sparse = index.search(query, k=n, filter=filter)
+    return rrf_fuse([dense, sparse], k=k, rrf_k=rrf_k, weights=weights)
@@ -0,0 +1,53 @@
+from __future__ import annotations
+
+import types
+from typing import Any, Callable, Optional, Sequence
+
+import pytest
+
+import kit_llm.client as client_mod
+
+
+class FakeOpenAI:
+    """Installs in-process stand-ins for the OpenAI SDK clients built by ``kit_llm.client``.
+
+    ``embeddings`` and ``completions`` are factories (usually the fake class itself);
+    each SDK client the code under test constructs gets fresh instances, reachable as
+    ``client._client.embeddings`` and ``client._client.chat.completions``.
+    """
+
+    def __init__(self, monkeypatch: pytest.MonkeyPatch):
+        self._monkeypatch = monkeypatch
+
+    def install(
+        self,
+        embeddings: Optional[Callable[[], Any]] = None,
+        completions: Optional[Callable[[], Any]] = None,
+        *,
+        asynchronous: bool = False,
+    ) -> type:
+        class _OpenAI:
+            def __init__(self, *args, **kwargs):  # noqa: ANN002, ANN003
+                if embeddings is not None:
+                    self.embeddings = embeddings()
+                if completions is not None:
+                    self.chat = types.SimpleNamespace(completions=completions())
+
+        self._monkeypatch.setattr(client_mod, "AsyncOpenAI" if asynchronous else "OpenAI", _OpenAI)
+        return _OpenAI
+
+    @staticmethod
+    def embedding_response(vectors: Sequence[Sequence[float]]) -> types.SimpleNamespace:
+        return types.SimpleNamespace(
+            data=[types.SimpleNamespace(embedding=list(v)) for v in vectors]
+        )
+
+    @staticmethod
+    def chat_response(content: str) -> types.SimpleNamespace:
+        msg = types.SimpleNamespace(content=content)
+        return types.SimpleNamespace(choices=[types.SimpleNamespace(message=msg)])
+
+
+@pytest.fixture
+def fake_openai(monkeypatch: pytest.MonkeyPatch) -> FakeOpenAI:
+    return FakeOpenAI(monkeypatch)
@@ -0,0 +1,45 @@
+from __future__ import annotations
+
+from kit_common.models import Document
+from kit_chunker.batch import split_documents
+from kit_chunker.splitters import split_text, split_markdown
+from kit_chunker.tokenizers import get_token_estimator
+
+
+def _docs(n: int) -> list[Document]:
+    docs = [Document(id=f"d{i}", text=" ".join(f"w{i}_{j}" for j in range(200))) for i in range(n)]
+    docs.append(Document(id="md", text="# Title\n\nbody text\n\n## Sub\nmore", source="notes.md"))
+    return docs
+
+
+def test_split_documents_pool_matches_serial_and_keeps_order():
+    docs = _docs(9)
+    est = get_token_estimator(name="fallback")
+    out = list(
+        split_documents(
+            docs, workers=2, chunksize=3, estimator="fallback", max_tokens=40, overlap=5
+        )
+    )
+    assert [doc_id for doc_id, _ in out] == [d.id for d in docs]
+    by_id = dict(out)
+    assert [c.id for c in by_id["d3"]] == [
+        c.id
+        for c in split_text(
+            docs[3].text, max_tokens=40, overlap=5, token_estimator=est, doc_id="d3"
+        )
+    ]
+    md = split_markdown(
+        docs[-1].text, max_tokens=40, overlap=5, token_estimator=est, doc_id="md", source="notes.md"
+    )
+    assert [c.id for c in by_id["md"]] == [c.id for c in md]
+
+
+def test_split_documents_unordered_inline():
+    docs = _docs(4)
+    out = list(
+        split_documents(
+            iter(docs), workers=0, ordered=False, estimator="fallback", max_tokens=40, overlap=5
+        )
+    )
+    assert sorted(doc_id for doc_id, _ in out) == sorted(d.id for d in docs)
+    assert all(chunks and all(c.doc_id == doc_id for c in chunks) for doc_id, chunks in out)
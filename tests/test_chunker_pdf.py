@@ -5,8 +5,129 @@ from kit_chunker import pdf as pdf_mod
 
 def test_split_pdf_monkeypatch(monkeypatch):
     # simulate two pages of text
-    monkeypatch.setattr(pdf_mod, "extract_text_from_pdf", lambda p: [(1, "hello world"), (2, "bye world")])
+    monkeypatch.setattr(
+        pdf_mod,
+        "extract_text_from_pdf",
+        lambda p, pages=None: [(1, "hello world"), (2, "bye world")],
+    )
     chunks = pdf_mod.split_pdf("dummy.pdf", max_tokens=10, overlap=2, source="sample.pdf", doc_id="doc1")
     assert all(c.page in (1, 2) for c in chunks)
     assert any(c.page == 2 for c in chunks)
 
+
+def test_split_pdf_short_pages_match_split_text(monkeypatch):
+    from kit_chunker.splitters import split_text
+    from kit_chunker.tokenizers import get_token_estimator
+
+    est = get_token_estimator(name="fallback")
+    long_page = "lorem ipsum " * 40
+    monkeypatch.setattr(
+        pdf_mod,
+        "extract_text_from_pdf",
+        lambda p, pages=None: [(1, "short page"), (2, ""), (3, long_page)],
+    )
+    chunks = pdf_mod.split_pdf(
+        "dummy.pdf", max_tokens=20, overlap=2, token_estimator=est, doc_id="doc1"
+    )
+    assert [c.page for c in chunks if c.page != 3] == [1]
+    first = split_text("short page", max_tokens=20, overlap=2, token_estimator=est, doc_id="doc1")[
+        0
+    ]
+    assert (chunks[0].start, chunks[0].end, chunks[0].tokens) == (
+        first.start,
+        first.end,
+        first.tokens,
+    )
+    assert len([c for c in chunks if c.page == 3]) > 1
+
+
+def _write_pdf(path, texts):
+    # minimal PDF with one Helvetica text line per page
+    objs = [
+        "<< /Type /Catalog /Pages 2 0 R >>",
+        None,
+        "<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+    ]
+    kids = []
+    for t in texts:
+        stream = f"BT /F1 12 Tf 72 720 Td ({t}) Tj ET"
+        objs.append(f"<< /Length {len(stream)} >>\nstream\n{stream}\nendstream")
+        objs.append(
+            f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] /Contents {len(objs)} 0 R "
+            "/Resources << /Font << /F1 3 0 R >> >> >>"
+        )
+        kids.append(f"{len(objs)} 0 R")
+    objs[1] = f"<< /Type /Pages /Kids [{' '.join(kids)}] /Count {len(texts)} >>"
+    out = b"%PDF-1.4\n"
+    offsets = []
+    for i, body in enumerate(objs, start=1):
+        offsets.append(len(out))
+        out += f"{i} 0 obj\n{body}\nendobj\n".encode("latin-1")
+    xref = len(out)
+    out += f"xref\n0 {len(objs) + 1}\n0000000000 65535 f \n".encode("latin-1")
+    out += "".join(f"{o:010d} 00000 n \n" for o in offsets).encode("latin-1")
+    out += f"trailer\n<< /Size {len(objs) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n".encode(
+        "latin-1"
+    )
+    path.write_bytes(out)
+
+
+def test_iter_pdf_pages_pool_matches_serial(tmp_path):
+    path = tmp_path / "doc.pdf"
+    _write_pdf(path, [f"page number {i}" for i in range(1, 7)])
+    serial = list(pdf_mod.iter_pdf_pages(str(path)))
+    assert [t.strip() for _, t in serial] == [f"page number {i}" for i in range(1, 7)]
+    assert list(pdf_mod.iter_pdf_pages(str(path), workers=2, pages_per_task=2)) == serial
+    assert [n for n, _ in pdf_mod.iter_pdf_pages(str(path), pages=[2, 5])] == [2, 5]
+
+
+def test_split_pdf_document_mode_spans_pages(monkeypatch):
+    from kit_chunker.tokenizers import get_token_estimator
+
+    est = get_token_estimator(name="fallback")
+    doc_pages = [
+        (1, "short intro"),
+        (2, "a paragraph that " * 6),
+        (3, "continues here. " * 6),
+        (4, "end"),
+    ]
+    monkeypatch.setattr(pdf_mod, "extract_text_from_pdf", lambda p, pages=None: doc_pages)
+    per_page = pdf_mod.split_pdf("dummy.pdf", max_tokens=40, overlap=4, token_estimator=est)
+    doc = pdf_mod.split_pdf(
+        "dummy.pdf", max_tokens=40, overlap=4, token_estimator=est, mode="document"
+    )
+    assert len(doc) < len(per_page)
+    assert doc[0].metadata["page_start"] == 1 and doc[-1].metadata["page_end"] == 4
+    assert any(c.metadata["page_end"] > c.metadata["page_start"] for c in doc)
+    assert all(c.page == c.metadata["page_start"] for c in doc)
+
+
+def test_split_pdf_parallel_path_batch_counts_pages(monkeypatch):
+    from kit_chunker.tokenizers import get_token_estimator
+
+    inner = get_token_estimator(name="fallback")
+    batches: list[int] = []
+
+    class _Est:
+        def count(self, text):  # noqa: ANN001
+            return inner.count(text)
+
+        def count_many(self, texts):  # noqa: ANN001
+            batches.append(len(texts))
+            return inner.count_many(texts)
+
+        def token_offsets(self, text):  # noqa: ANN001
+            return inner.token_offsets(text)
+
+    doc_pages = [(i, "short page" if i % 2 else "lorem ipsum " * 40) for i in range(1, 6)]
+    monkeypatch.setattr(pdf_mod, "extract_text_from_pdf", lambda p, pages=None: doc_pages)
+    monkeypatch.setattr(pdf_mod, "iter_pdf_pages", lambda p, pages=None, workers=1: iter(doc_pages))
+    serial = pdf_mod.split_pdf("dummy.pdf", max_tokens=20, overlap=2, token_estimator=_Est())
+    assert batches[0] == 5
+    batches.clear()
+    parallel = pdf_mod.split_pdf(
+        "dummy.pdf", max_tokens=20, overlap=2, token_estimator=_Est(), workers=2
+    )
+    # pages are counted two at a time, as they arrive from the pool
+    assert batches[:3] == [2, 2, 1]
+    assert [(c.id, c.tokens) for c in parallel] == [(c.id, c.tokens) for c in serial]
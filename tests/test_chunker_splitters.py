@@ -26,3 +26,54 @@ def test_split_markdown_headers():
     assert chunks[0].start == 0
     assert any("Sub" in c.text for c in chunks)
 
+
+class _WordEstimator:
+    # one token per whitespace-prefixed word, like tiktoken's " word" tokens
+    def _offsets(self, text: str) -> list[int]:
+        import re
+
+        return [m.start() for m in re.finditer(r"\s*\S+", text)]
+
+    def count(self, text: str) -> int:
+        return len(self._offsets(text))
+
+    def token_offsets(self, text: str) -> list[int]:
+        return self._offsets(text)
+
+
+def test_split_text_offsets_strategy_matches_chunk_semantics():
+    text = " ".join(["word" + str(i) for i in range(1000)])
+    est = _WordEstimator()
+    chunks = split_text(text, max_tokens=50, overlap=10, strategy="offsets", token_estimator=est)
+    assert len(chunks) > 1
+    assert chunks[0].start == 0 and chunks[-1].end == len(text)
+    for prev, ch in zip(chunks, chunks[1:]):
+        # consecutive chunks overlap by at least the requested tokens
+        assert ch.start < prev.end
+        assert est.count(text[ch.start : prev.end]) >= 10
+    for ch in chunks:
+        assert ch.text == text[ch.start : ch.end]
+        assert ch.tokens == est.count(ch.text) <= 50
+
+
+def test_split_text_offsets_tokens_are_each_chunks_own_count():
+    class _MergingEstimator(_WordEstimator):
+        # a slice starting on whitespace encodes it as an extra token, as BPE can
+        def count(self, text: str) -> int:
+            return len(self._offsets(text)) + (1 if text[:1].isspace() else 0)
+
+    text = " ".join(["word" + str(i) for i in range(300)])
+    est = _MergingEstimator()
+    chunks = split_text(text, max_tokens=50, overlap=10, strategy="offsets", token_estimator=est)
+    assert any(ch.text[:1].isspace() for ch in chunks)
+    assert all(ch.tokens == est.count(ch.text) for ch in chunks)
+
+def test_split_text_offsets_falls_back_without_capability():
+    class _CountOnly:
+        def count(self, text: str) -> int:
+            return len(text) // 4 + 1
+
+    text = "alpha beta gamma " * 50
+    a = split_text(text, max_tokens=20, overlap=4, strategy="offsets", token_estimator=_CountOnly())
+    b = split_text(text, max_tokens=20, overlap=4, strategy="token", token_estimator=_CountOnly())
+    assert [(c.start, c.end) for c in a] == [(c.start, c.end) for c in b]
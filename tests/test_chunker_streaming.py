@@ -0,0 +1,123 @@
+from __future__ import annotations
+
+import re
+from pathlib import Path
+
+from kit_chunker import pdf as pdf_mod
+from kit_chunker.splitters import split_text, split_markdown
+from kit_chunker.streaming import _iter_lines, iter_split_text, iter_split_markdown
+from kit_chunker.tokenizers import get_token_estimator
+
+
+def _pieces(text: str, size: int):
+    for i in range(0, len(text), size):
+        yield text[i : i + size]
+
+
+def test_iter_split_text_matches_split_text_with_small_window():
+    text = " ".join("word" + str(i) for i in range(3000))
+    est = get_token_estimator(name="fallback")
+    expected = split_text(text, max_tokens=50, overlap=10, token_estimator=est, doc_id="d")
+    got = list(
+        iter_split_text(
+            _pieces(text, 997),
+            max_tokens=50,
+            overlap=10,
+            token_estimator=est,
+            doc_id="d",
+            window_chars=2000,
+        )
+    )
+    assert [(c.start, c.end, c.id) for c in got] == [(c.start, c.end, c.id) for c in expected]
+    assert all(text[c.start : c.end] == c.text for c in got)
+
+
+class _WordEstimator:
+    # one token per whitespace-prefixed word, like tiktoken's " word" tokens
+    def _offsets(self, text: str) -> list[int]:
+        return [m.start() for m in re.finditer(r"\s*\S+", text)]
+
+    def count(self, text: str) -> int:
+        return len(self._offsets(text))
+
+    def token_offsets(self, text: str) -> list[int]:
+        return self._offsets(text)
+
+
+def test_iter_split_text_offsets_strategy_matches_split_text():
+    text = " ".join(f"w{i}" + ("." if i % 7 == 0 else "") for i in range(5000))
+    for est in (_WordEstimator(), get_token_estimator(name="fallback")):
+        expected = split_text(
+            text, max_tokens=50, overlap=10, strategy="offsets", token_estimator=est
+        )
+        got = list(
+            iter_split_text(
+                _pieces(text, 997),
+                max_tokens=50,
+                overlap=10,
+                strategy="offsets",
+                token_estimator=est,
+                window_chars=2000,
+            )
+        )
+        assert [(c.start, c.end, c.text, c.tokens) for c in got] == [
+            (c.start, c.end, c.text, c.tokens) for c in expected
+        ]
+
+def test_iter_split_text_reads_file(tmp_path: Path):
+    text = "alpha beta gamma delta " * 400
+    path = tmp_path / "big.txt"
+    path.write_text(text, encoding="utf-8")
+    est = get_token_estimator(name="fallback")
+    chunks = list(
+        iter_split_text(str(path), max_tokens=40, overlap=5, token_estimator=est, window_chars=1500)
+    )
+    assert chunks[0].start == 0 and chunks[-1].end == len(text)
+    assert all(text[c.start : c.end] == c.text for c in chunks)
+
+
+def test_iter_split_markdown_matches_split_markdown():
+    md = "# Title\n\nPara1 line.\n\n## Sub\n" + "text under sub. " * 200 + "\n### Tail\nend\n"
+    est = get_token_estimator(name="fallback")
+    expected = split_markdown(md, max_tokens=30, overlap=5, token_estimator=est)
+    got = list(
+        iter_split_markdown(
+            _pieces(md, 64), max_tokens=30, overlap=5, token_estimator=est, window_chars=500
+        )
+    )
+    assert [(c.start, c.end, c.text) for c in got] == [(c.start, c.end, c.text) for c in expected]
+
+
+def test_iter_lines_bounds_long_lines():
+    text = "a\n" + "x" * 1000 + "\nb"
+    segs = list(_iter_lines(_pieces(text, 7), max_line=100))
+    assert all(len(seg) <= 106 for seg, _ in segs)
+    assert "".join(seg + ("\n" if ends else "") for seg, ends in segs) == text + "\n"
+    assert sum(ends for _, ends in segs) == 3 and len(segs) > 3
+
+
+def test_iter_split_markdown_handles_lines_longer_than_window():
+    md = "# Title\n" + "word " * 400 + "\n## Next\nshort body\n"
+    est = get_token_estimator(name="fallback")
+    expected = split_markdown(md, max_tokens=30, overlap=5, token_estimator=est)
+    got = list(
+        iter_split_markdown(
+            _pieces(md, 13), max_tokens=30, overlap=5, token_estimator=est, window_chars=300
+        )
+    )
+    assert [(c.start, c.end, c.text) for c in got] == [(c.start, c.end, c.text) for c in expected]
+
+def test_iter_split_pdf_is_lazy(monkeypatch):
+    pulled: list[int] = []
+
+    def _pages(path, **kwargs):
+        for i, txt in enumerate(["hello world", "bye world"], start=1):
+            pulled.append(i)
+            yield i, txt
+
+    monkeypatch.setattr(pdf_mod, "iter_pdf_pages", _pages)
+    est = get_token_estimator(name="fallback")
+    it = pdf_mod.iter_split_pdf("dummy.pdf", max_tokens=10, overlap=2, token_estimator=est)
+    first = next(it)
+    assert first.page == 1 and pulled == [1]
+    assert any(c.page == 2 for c in it)
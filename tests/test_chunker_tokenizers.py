@@ -0,0 +1,50 @@
+from __future__ import annotations
+
+from kit_chunker.tokenizers import (
+    CachedTokenEstimator,
+    count_many,
+    get_token_estimator,
+    supports_offsets,
+)
+
+def test_get_token_estimator_is_shared():
+    a = get_token_estimator(name="fallback")
+    b = get_token_estimator(name="fallback")
+    assert a is b
+    assert get_token_estimator(name="fallback", cache_size=0) is not a
+
+
+def test_cached_estimator_counts_hits_and_evicts():
+    class _Counting:
+        calls = 0
+
+        def count(self, text: str) -> int:
+            self.calls += 1
+            return len(text.split())
+
+    inner = _Counting()
+    est = CachedTokenEstimator(inner, maxsize=2)
+    assert est.count("a b") == 2
+    assert est.count("a b") == 2
+    assert inner.calls == 1
+    est.count("c")
+    est.count("d e f")  # evicts "a b"
+    est.count("a b")
+    assert est.stats() == {"hits": 1, "misses": 4, "size": 2}
+    # capability of the wrapped estimator is preserved
+    assert not supports_offsets(est)
+    assert supports_offsets(
+        CachedTokenEstimator(get_token_estimator(name="fallback", cache_size=0))
+    )
+
+
+def test_count_many_batches_and_falls_back():
+    class _CountOnly:
+        def count(self, text: str) -> int:
+            return len(text.split())
+
+    texts = ["a b", "", "c d e"]
+    assert count_many(_CountOnly(), texts) == [2, 0, 3]
+    est = get_token_estimator(name="fallback")
+    assert count_many(est, texts) == [est.count(t) for t in texts]
+    assert est.count_many(texts) == count_many(est, texts)
@@ -36,3 +36,15 @@ def test_settings_empty_ok(monkeypatch):
     assert st.openai_api_key is None
     assert st.log_level == "INFO"
 
+
+def test_default_dotenv_read_once(monkeypatch):
+    import kit_common.config as config_mod
+
+    calls: list[tuple] = []
+    monkeypatch.setattr(config_mod, "_load_dotenv", lambda *a: calls.append(a))
+    monkeypatch.setattr(config_mod, "_default_env_loaded", False)
+    load_settings()
+    load_settings()
+    assert len(calls) == 1
+    load_settings(reload=True)
+    assert len(calls) == 2
@@ -0,0 +1,139 @@
+from __future__ import annotations
+
+import pytest
+
+from kit_common import CircuitBreaker, CircuitOpenError, RetryPolicy
+
+
+class _HTTPError(Exception):
+    def __init__(self, status: int, headers: dict | None = None):
+        super().__init__(f"status {status}")
+        self.status_code = status
+        self.headers = headers or {}
+
+
+def _flaky(errors):
+    errors = list(errors)
+
+    def fn():
+        if errors:
+            raise errors.pop(0)
+        return "ok"
+
+    return fn
+
+
+def test_full_jitter_starts_at_base_delay():
+    slept: list[float] = []
+    policy = RetryPolicy(max_attempts=3, base_delay_s=1.0, sleep=slept.append, rng=lambda: 1.0)
+    assert policy.call(_flaky([_HTTPError(503), _HTTPError(503)])) == "ok"
+    # first retry waits up to base_delay_s, not 2 * base_delay_s
+    assert slept == [1.0, 2.0]
+    policy = RetryPolicy(base_delay_s=1.0, rng=lambda: 0.25)
+    assert policy.delay_for(0, _HTTPError(503)) == 0.25
+    assert policy.delay_for(10, _HTTPError(503)) == 0.25 * policy.max_delay_s
+
+
+def test_retry_after_header_is_honoured():
+    slept: list[float] = []
+    policy = RetryPolicy(sleep=slept.append, rng=lambda: 0.0)
+    errors = [_HTTPError(429, {"retry-after": "3"}), _HTTPError(429, {"retry-after-ms": "250"})]
+    assert policy.call(_flaky(errors)) == "ok"
+    assert slept == [3.0, 0.25]
+
+
+def test_non_retryable_and_exhausted_errors_are_reraised():
+    slept: list[float] = []
+    policy = RetryPolicy(max_attempts=2, sleep=slept.append)
+    with pytest.raises(_HTTPError):
+        policy.call(_flaky([_HTTPError(400)]))
+    assert slept == []
+    with pytest.raises(_HTTPError):
+        policy.call(_flaky([_HTTPError(500)] * 5))
+    assert len(slept) == 1
+    assert policy.metrics.snapshot() == {"calls": 2, "retries": 1, "failures": 1, "shed": 0}
+
+
+def test_deadline_stops_retries():
+    slept: list[float] = []
+    policy = RetryPolicy(max_attempts=10, deadline_s=1.0, sleep=slept.append)
+    with pytest.raises(_HTTPError):
+        policy.call(_flaky([_HTTPError(503, {"retry-after": "5"})] * 3))
+    assert slept == []
+
+
+def test_breaker_opens_and_sheds():
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout_s=60.0)
+    policy = RetryPolicy(max_attempts=1, breaker=breaker, sleep=lambda _: None)
+    for _ in range(2):
+        with pytest.raises(_HTTPError):
+            policy.call(_flaky([_HTTPError(502)]))
+    assert breaker.state == "open"
+    with pytest.raises(CircuitOpenError):
+        policy.call(lambda: "ok")
+    assert policy.metrics.snapshot()["shed"] == 1
+
+    breaker.reset_timeout_s = 0.0
+    assert breaker.state == "half_open"
+    assert policy.call(lambda: "ok") == "ok"
+    assert breaker.state == "closed"
+
+
+def test_cancelled_half_open_trial_releases_the_breaker():
+    import asyncio
+
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout_s=0.0)
+    policy = RetryPolicy(max_attempts=1, breaker=breaker, sleep=lambda _: None)
+    with pytest.raises(_HTTPError):
+        policy.call(_flaky([_HTTPError(503)]))
+    assert breaker.state == "half_open"
+
+    async def _hang():
+        await asyncio.sleep(10)
+
+    async def _cancel_trial():
+        task = asyncio.create_task(policy.acall(_hang))
+        await asyncio.sleep(0)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    asyncio.run(_cancel_trial())
+    assert policy.call(lambda: "ok") == "ok"
+    assert breaker.state == "closed"
+
+
+def test_transport_errors_are_retried_and_open_the_breaker():
+    import httpx
+    import openai
+    from qdrant_client.http.exceptions import ResponseHandlingException
+
+    request = httpx.Request("GET", "http://x")
+    policy = RetryPolicy()
+    for e in [
+        openai.APIConnectionError(request=request),
+        openai.APITimeoutError(request=request),
+        httpx.ConnectError("down"),
+        httpx.ReadTimeout("slow"),
+        ResponseHandlingException(ConnectionError("down")),
+    ]:
+        assert policy.is_retryable(e), e
+
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout_s=60.0)
+    policy = RetryPolicy(max_attempts=2, breaker=breaker, sleep=lambda _: None)
+    for _ in range(2):
+        with pytest.raises(httpx.ConnectError):
+            policy.call(_flaky([httpx.ConnectError("down")] * 2))
+    assert breaker.state == "open"
+
+
+def test_non_http_error_does_not_close_the_breaker():
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout_s=60.0)
+    policy = RetryPolicy(max_attempts=1, breaker=breaker)
+    with pytest.raises(_HTTPError):
+        policy.call(_flaky([_HTTPError(503)]))
+    with pytest.raises(ValueError):
+        policy.call(_flaky([ValueError("bug")]))
+    with pytest.raises(_HTTPError):
+        policy.call(_flaky([_HTTPError(503)]))
+    assert breaker.state == "open"
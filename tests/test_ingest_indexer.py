@@ -0,0 +1,105 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import numpy as np
+
+from kit_common.models import Chunk
+from kit_common.utils import make_id
+from kit_ingest import IncrementalIndexer, Manifest, point_id
+from kit_vector import CollectionParams, NumpyBackend
+
+
+class _CountingClient:
+    def __init__(self):
+        self.embedded: list[str] = []
+
+    def embed_array(self, texts, *, model=None, batch_size=64, **_):  # noqa: ANN001, ANN003
+        self.embedded.extend(texts)
+        return np.array([[len(t), 1.0, 0.5] for t in texts], dtype=np.float32)
+
+
+def _chunks(doc_id: str, texts: list[str]) -> list[Chunk]:
+    return [Chunk(id=make_id(doc_id, str(i)), doc_id=doc_id, text=t) for i, t in enumerate(texts)]
+
+
+def _indexer(tmp_path: Path) -> tuple[IncrementalIndexer, NumpyBackend, _CountingClient]:
+    backend = NumpyBackend()
+    backend.ensure_collection(CollectionParams(name="c", vector_size=3, distance="cosine"))
+    client = _CountingClient()
+    manifest = Manifest(str(tmp_path / "manifest.db"))
+    return (
+        IncrementalIndexer(backend, "c", manifest, client=client, embed_model="m"),
+        backend,
+        client,
+    )
+
+
+def test_incremental_indexer_embeds_only_changed_chunks(tmp_path: Path):
+    indexer, backend, client = _indexer(tmp_path)
+    stats = indexer.index([("a", _chunks("a", ["one", "two"])), ("b", _chunks("b", ["three"]))])
+    assert (stats.added, stats.updated, stats.unchanged, stats.deleted) == (3, 0, 0, 0)
+    assert backend.count("c") == 3
+
+    client.embedded.clear()
+    stats = indexer.index([("a", _chunks("a", ["one", "TWO"])), ("b", _chunks("b", ["three"]))])
+    assert (stats.added, stats.updated, stats.unchanged, stats.deleted) == (0, 1, 2, 0)
+    assert client.embedded == ["TWO"]
+
+    client.embedded.clear()
+    stats = indexer.index([("a", _chunks("a", ["one"]))])
+    assert (stats.added, stats.updated, stats.unchanged, stats.deleted) == (0, 0, 1, 1)
+    assert client.embedded == []
+    assert backend.count("c") == 2
+
+    stats = indexer.index([("a", _chunks("a", ["one"]))], prune=True)
+    assert stats.deleted == 1
+    assert backend.count("c") == 1
+    assert indexer.manifest.doc_ids("c") == {"a"}
+
+
+def test_incremental_indexer_manifest_survives_restart(tmp_path: Path):
+    indexer, backend, _ = _indexer(tmp_path)
+    indexer.index([("a", _chunks("a", ["one", "two"]))])
+    indexer.manifest.close()
+
+    client = _CountingClient()
+    again = IncrementalIndexer(
+        backend, "c", Manifest(str(tmp_path / "manifest.db")), client=client, embed_model="m"
+    )
+    stats = again.index([("a", _chunks("a", ["one", "two"]))])
+    assert stats.unchanged == 2 and client.embedded == []
+    # a different embedding model invalidates every hash
+    other = IncrementalIndexer(backend, "c", again.manifest, client=client, embed_model="m2")
+    assert other.index([("a", _chunks("a", ["one", "two"]))]).updated == 2
+
+    assert again.remove(["a"]) == 2
+    assert backend.count("c") == 0
+    assert again.manifest.chunks("c", "a") == {}
+
+
+def test_point_id_is_uuid_for_make_id_hashes():
+    pid = point_id("0123456789abcdef0123456789abcdef01234567")
+    assert pid == "01234567-89ab-cdef-0123-456789abcdef"
+    assert (
+        point_id("doc-1:chunk-0-not-a-hex-digest-at-all") == "doc-1:chunk-0-not-a-hex-digest-at-all"
+    )
+
+
+def test_chunk_moved_to_a_document_flushed_earlier_is_not_deleted(tmp_path: Path):
+    backend = NumpyBackend()
+    backend.ensure_collection(CollectionParams(name="c", vector_size=3, distance="cosine"))
+    manifest = Manifest(str(tmp_path / "manifest.db"))
+    indexer = IncrementalIndexer(
+        backend, "c", manifest, client=_CountingClient(), embed_model="m", flush_size=1
+    )
+    shared = Chunk(id=make_id("shared"), doc_id="a", text="shared text")
+    indexer.index([("a", [shared])])
+    moved = shared.model_copy(update={"doc_id": "b"})
+    # "b" is flushed (flush_size=1) before "a" reports the chunk as gone
+    stats = indexer.index([("b", [moved]), ("a", [])])
+    assert stats.deleted == 1
+    assert backend.count("c") == 1
+    assert backend.search("c", [1.0, 1.0, 0.5], k=1)[0].payload["doc_id"] == "b"
+    assert manifest.chunks("c", "a") == {}
+    assert list(manifest.chunks("c", "b")) == [shared.id]
@@ -0,0 +1,216 @@
+from __future__ import annotations
+
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+import numpy as np
+
+from kit_common.models import Document
+from kit_common.utils import make_id
+from kit_ingest import (
+    Checkpoint,
+    Pipeline,
+    Stage,
+    chunk_document,
+    ingest_pipeline,
+    normalize_document,
+)
+from kit_vector import CollectionParams, NumpyBackend
+
+
+class _Item:
+    def __init__(self, id: str, value: int):  # noqa: A002
+        self.id = id
+        self.value = value
+
+
+def _square(value: int) -> int:
+    return value * value
+
+
+def test_pipeline_runs_thread_and_process_stages_with_batches():
+    out: list[int] = []
+    lock = threading.Lock()
+
+    def _collect(values: list[int]) -> list[None]:
+        with lock:
+            out.extend(values)
+        return [None] * len(values)
+
+    pipe = Pipeline(
+        [
+            Stage("value", lambda item: item.value, workers=2),
+            Stage("square", _square, workers=2, mode="process"),
+            Stage("collect", _collect, batch_size=4),
+        ]
+    )
+    stats = pipe.run(_Item(str(i), i) for i in range(20))
+    assert sorted(out) == [i * i for i in range(20)]
+    assert stats["value"]["items"] == stats["collect"]["items"] == 20
+    assert stats["collect"]["errors"] == 0
+    assert pipe.submitted == 20
+
+
+def test_pipeline_bounded_queues_apply_backpressure():
+    produced = 0
+    peak = 0
+
+    def _source():
+        nonlocal produced
+        for i in range(30):
+            produced += 1
+            yield _Item(str(i), i)
+
+    def _slow(value: int) -> int:
+        nonlocal peak
+        peak = max(peak, produced - done)
+        time.sleep(0.002)
+        return value
+
+    done = 0
+
+    def _sink(value: int) -> None:
+        nonlocal done
+        done += 1
+
+    pipe = Pipeline(
+        [
+            Stage("fast", lambda item: item.value, queue_size=2),
+            Stage("slow", _slow, queue_size=2),
+            Stage("sink", _sink, queue_size=2),
+        ]
+    )
+    pipe.run(_source())
+    assert done == 30
+    # the source is never more than the queue capacities plus in-hand items ahead
+    assert peak <= 10
+    assert pipe.stats()["slow"]["items_per_s"] > 0
+
+
+def test_pipeline_throughput_is_set_by_the_slowest_stage():
+    def _sleep(s: float):
+        def fn(x):  # noqa: ANN001
+            time.sleep(s)
+            return x
+
+        return fn
+
+    pipe = Pipeline(
+        [Stage("a", _sleep(0.01)), Stage("b", _sleep(0.03)), Stage("c", _sleep(0.01))],
+        key=str,
+    )
+    t0 = time.perf_counter()
+    pipe.run(range(20))
+    elapsed = time.perf_counter() - t0
+    # stage-by-stage would take 20 * 0.05 = 1.0 s; pipelined is ~20 * 0.03
+    assert elapsed < 0.85
+
+
+def test_pipeline_checkpoint_resumes_after_failures(tmp_path: Path):
+    ckpt = Checkpoint(str(tmp_path / "ckpt.db"), name="t")
+    seen: list[int] = []
+
+    def _flaky(item: _Item) -> int:
+        if item.value % 5 == 0:
+            raise RuntimeError("boom")
+        seen.append(item.value)
+        return item.value
+
+    pipe = Pipeline([Stage("work", _flaky), Stage("sink", lambda v: None)], checkpoint=ckpt)
+    stats = pipe.run(_Item(str(i), i) for i in range(10))
+    assert stats["work"]["errors"] == 2
+    assert {k for k, stage, _ in pipe.failed} == {"0", "5"}
+    assert ckpt.done([str(i) for i in range(10)]) == {str(i) for i in range(10)} - {"0", "5"}
+
+    seen.clear()
+    pipe = Pipeline(
+        [Stage("work", lambda item: item.value), Stage("sink", lambda v: None)],
+        checkpoint=Checkpoint(str(tmp_path / "ckpt.db"), name="t"),
+    )
+    pipe.run(_Item(str(i), i) for i in range(10))
+    assert pipe.submitted == 2 and pipe.skipped == 8
+
+
+class _FakeClient:
+    def embed_array(self, texts, *, model=None, **_):  # noqa: ANN001, ANN003
+        return np.array([[len(t), 1.0, 0.5] for t in texts], dtype=np.float32)
+
+
+def test_ingest_pipeline_end_to_end(tmp_path: Path):
+    md = tmp_path / "notes.md"
+    md.write_text("# Title\n\nSome   notes\r\nabout kits.\n", encoding="utf-8")
+    docs = [
+        Document(id="a", text="alpha beta gamma " * 40, source="a.txt"),
+        Document(id="b", text="", source=str(md)),
+    ]
+    backend = NumpyBackend()
+    backend.ensure_collection(CollectionParams(name="c", vector_size=3, distance="cosine"))
+    ckpt = Checkpoint()
+    pipe = ingest_pipeline(
+        backend,
+        "c",
+        client=_FakeClient(),
+        checkpoint=ckpt,
+        max_tokens=64,
+        overlap=8,
+        estimator="char",
+        chunk_workers=1,
+    )
+    stats = pipe.run(docs)
+    assert list(stats) == ["extract", "normalize", "chunk", "embed", "upsert"]
+    assert stats["upsert"]["items"] == 2 and not pipe.failed
+    assert backend.count("c") > 2
+    texts = [r.payload["text"] for r in backend.search("c", [1.0, 1.0, 0.5], k=50)]
+    assert any("Some notes\nabout kits." in t for t in texts)
+    assert ckpt.done(["a", "b"]) == {"a", "b"}
+    pipe.run(docs)
+    assert pipe.skipped == 2
+
+
+def test_normalize_document_keeps_page_offsets():
+    doc = Document(
+        id="p",
+        text="one  two\n\nthree   four",
+        metadata={"page_offsets": [[1, 0], [2, 10]]},
+    )
+    out = normalize_document(doc)
+    assert out.text == "one two\n\nthree four"
+    assert out.metadata["page_offsets"] == [[1, 0], [2, 9]]
+
+
+def test_pipeline_survives_a_failing_checkpoint():
+    class _BrokenCheckpoint(Checkpoint):
+        def mark(self, keys: list[str]) -> None:
+            if "3" in keys:
+                raise sqlite3.OperationalError("database is locked")
+            super().mark(keys)
+
+    ckpt = _BrokenCheckpoint()
+    pipe = Pipeline(
+        [Stage("work", lambda item: item.value, queue_size=1), Stage("sink", lambda v: None)],
+        checkpoint=ckpt,
+    )
+    # the sink's only worker keeps draining its queue after the failed mark
+    done = threading.Thread(
+        target=pipe.run, args=([_Item(str(i), i) for i in range(20)],), daemon=True
+    )
+    done.start()
+    done.join(timeout=5)
+    assert not done.is_alive()
+    assert [(k, stage) for k, stage, _ in pipe.failed] == [("3", "sink")]
+    assert ckpt.done([str(i) for i in range(20)]) == {str(i) for i in range(20)} - {"3"}
+
+
+def test_chunk_document_ids_include_the_page():
+    doc = Document(
+        id="p",
+        text="first page text\n\nsecond page text",
+        source="p.pdf",
+        metadata={"page_offsets": [[1, 0], [2, 17]]},
+    )
+    chunks = chunk_document(doc, max_tokens=4, overlap=0, estimator="char")
+    assert {c.page for c in chunks} == {1, 2}
+    for c in chunks:
+        assert c.id == make_id("p", str(c.page), str(c.start), str(c.end), c.text[:32])
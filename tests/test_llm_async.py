@@ -0,0 +1,78 @@
+from __future__ import annotations
+
+import asyncio
+import types
+
+import numpy as np
+import pytest
+
+import kit_common.retry as retry_mod
+from kit_common.config import Settings
+from kit_llm.chat import achat
+from kit_llm.client import get_default_async_client
+from kit_llm.embed import aembed_texts
+from kit_llm.errors import LLMError
+
+
+class _FakeAsyncEmbeddings:
+    def __init__(self):
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def create(self, model: str, input: list[str], timeout: float):  # noqa: ARG002
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        await asyncio.sleep(0.01)
+        self.in_flight -= 1
+        data = [types.SimpleNamespace(embedding=[float(len(t)), 3.0, 4.0]) for t in input]
+        return types.SimpleNamespace(data=data)
+
+
+class _FakeAsyncCompletions:
+    def __init__(self, fail_status: int | None = None):
+        self.fail_status = fail_status
+        self.calls: list[dict] = []
+
+    async def create(self, **kwargs):  # noqa: ANN003
+        self.calls.append(kwargs)
+        if self.fail_status is not None:
+            e = Exception("rate limit")
+            setattr(e, "status_code", self.fail_status)
+            raise e
+        msg = types.SimpleNamespace(content="ok")
+        return types.SimpleNamespace(choices=[types.SimpleNamespace(message=msg)])
+
+
+def _install(fake_openai, completions=_FakeAsyncCompletions):  # noqa: ANN001
+    fake_openai.install(_FakeAsyncEmbeddings, completions, asynchronous=True)
+
+
+def test_async_embed_texts_concurrent_and_ordered(fake_openai):
+    _install(fake_openai)
+    client = get_default_async_client(Settings(llm_embed_model="m"))
+    texts = ["x" * (i + 1) for i in range(10)]
+    vecs = asyncio.run(client.embed_texts(texts, batch_size=2, concurrency=3))
+    assert len(vecs) == 10
+    assert all(abs(np.linalg.norm(v) - 1) < 1e-5 for v in vecs)
+    assert vecs[7][0] > vecs[1][0]
+    assert client._client.embeddings.max_in_flight == 3
+
+
+def test_async_helpers_and_nonblocking_retries(monkeypatch, fake_openai):
+    _install(fake_openai)
+    monkeypatch.setenv("LLM_EMBED_MODEL", "m")
+    monkeypatch.setenv("LLM_CHAT_MODEL", "c")
+    assert len(asyncio.run(aembed_texts(["a", "b"]))) == 2
+    resp = asyncio.run(achat([{"role": "user", "content": "hi"}], system="sys"))
+    assert resp["content"] == "ok"
+
+    slept: list[float] = []
+
+    async def _fake_sleep(delay: float) -> None:
+        slept.append(delay)
+
+    _install(fake_openai, lambda: _FakeAsyncCompletions(fail_status=429))
+    monkeypatch.setattr(retry_mod.asyncio, "sleep", _fake_sleep)
+    with pytest.raises(LLMError):
+        asyncio.run(achat([{"role": "user", "content": "hi"}]))
+    assert len(slept) == 2 and all(0 <= d <= 1.0 for d in slept)
@@ -0,0 +1,44 @@
+from __future__ import annotations
+
+from kit_common.config import Settings
+from kit_llm.batching import is_batch_too_large, plan_batches
+from kit_llm.client import get_default_client
+
+
+def test_plan_batches_respects_token_budget_and_item_cap():
+    counts = [10, 10, 10, 50, 5, 5, 5, 5]
+    plans = plan_batches(["x"] * len(counts), max_items=3, max_tokens=30, token_counts=counts)
+    assert [(p.start, p.end) for p in plans] == [(0, 3), (3, 4), (4, 7), (7, 8)]
+    assert [p.tokens for p in plans] == [30, 50, 15, 5]
+    # without a budget it is plain fixed-size batching
+    assert [(p.start, p.end) for p in plan_batches(["x"] * 5, max_items=2)] == [
+        (0, 2),
+        (2, 4),
+        (4, 5),
+    ]
+
+
+def test_embed_texts_splits_batch_rejected_as_too_large(fake_openai):
+    sizes: list[int] = []
+    ok: list[int] = []
+
+    class _LimitedEmbeddings:
+        def create(self, model: str, input: list[str], timeout: float):  # noqa: ARG002
+            sizes.append(len(input))
+            if len(input) > 2:
+                e = Exception("Requested 9000 tokens, max 8192 tokens per request: too many tokens")
+                setattr(e, "status_code", 400)
+                raise e
+            ok.append(len(input))
+            return fake_openai.embedding_response([[float(len(t)), 0.0] for t in input])
+
+    fake_openai.install(embeddings=_LimitedEmbeddings)
+    client = get_default_client(Settings(llm_embed_model="m"), cached=False)
+    texts = ["a" * (i + 1) for i in range(7)]
+    vecs = client.embed_texts(texts, batch_size=7, normalize=False)
+    assert [v[0] for v in vecs] == [float(i + 1) for i in range(7)]
+    assert sizes[0] == 7 and max(ok) <= 2 and sum(ok) == 7
+
+    not_large = Exception("bad request")
+    setattr(not_large, "status_code", 400)
+    assert not is_batch_too_large(not_large)
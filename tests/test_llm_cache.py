@@ -0,0 +1,161 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import numpy as np
+
+from kit_llm.cache import CachedChatClient, CachedLLMClient, ChatCache, EmbeddingStore
+
+
+class _RecordingClient:
+    def __init__(self):
+        self.calls: list[list[str]] = []
+
+    def embed_texts(self, texts, *, model=None, batch_size=64, normalize=True, timeout_s=60.0):  # noqa: ANN001
+        self.calls.append(list(texts))
+        return [[float(len(t)), 1.0] for t in texts]
+
+    def chat(self, messages, **kwargs):  # noqa: ANN001, ANN003
+        return {"content": "ok", "raw": None}
+
+
+def test_cached_client_only_embeds_misses_in_order(tmp_path: Path):
+    inner = _RecordingClient()
+    store = EmbeddingStore(str(tmp_path / "emb.sqlite"))
+    client = CachedLLMClient(inner, store)
+    first = client.embed_texts(["a", "bb", "a"], model="m")
+    assert inner.calls == [["a", "bb"]]
+    second = client.embed_texts(["ccc", "bb", "a"], model="m")
+    assert inner.calls[-1] == ["ccc"]
+    assert second == [[3.0, 1.0], [2.0, 1.0], [1.0, 1.0]]
+    assert first[0] == first[2]
+    # other model or normalize flag is a different key
+    client.embed_texts(["a"], model="m", normalize=False)
+    assert inner.calls[-1] == ["a"]
+    assert client.chat([])["content"] == "ok"
+
+    # persisted across store instances
+    again = CachedLLMClient(inner, EmbeddingStore(str(tmp_path / "emb.sqlite")))
+    n_calls = len(inner.calls)
+    again.embed_texts(["bb", "ccc"], model="m")
+    assert len(inner.calls) == n_calls
+    assert again.stats()["hit_rate"] == 1.0
+
+
+def test_embedding_store_evicts_least_recently_used():
+    store = EmbeddingStore(max_entries=2)
+    store.put_many({"k1": [1.0], "k2": [2.0]})
+    store.get_many(["k1"])
+    store.put_many({"k3": [3.0]})
+    got = store.get_many(["k1", "k2", "k3"])
+    assert sorted(got) == ["k1", "k3"]
+    assert np.allclose(got["k3"], [3.0])
+
+
+def test_cached_client_embed_array_merges_hits_and_misses():
+    class _ArrayClient(_RecordingClient):
+        def embed_array(self, texts, **kwargs):  # noqa: ANN001, ANN003
+            self.calls.append(list(texts))
+            return np.asarray([[float(len(t)), 1.0] for t in texts], dtype=np.float32)
+
+    inner = _ArrayClient()
+    client = CachedLLMClient(inner)
+    client.embed_array(["a", "bb"], model="m")
+    arr = client.embed_array(["ccc", "a", "bb"], model="m")
+    assert inner.calls[-1] == ["ccc"]
+    assert arr.dtype == np.float32 and arr[:, 0].tolist() == [3.0, 1.0, 2.0]
+
+
+class _ChatClient:
+    # toy embedding: questions mentioning "install" point one way, others another
+    def __init__(self):
+        self.chats = 0
+
+    def chat(self, messages, **kwargs):  # noqa: ANN001, ANN003
+        self.chats += 1
+        return {"content": f"answer {self.chats}", "raw": None}
+
+    def embed_array(self, texts, *, model=None):  # noqa: ANN001
+        return np.array(
+            [[1.0, 0.1] if "install" in t else [0.0, 1.0] for t in texts], dtype=np.float32
+        )
+
+
+def test_chat_cache_exact_hits_ttl_and_size():
+    now = [0.0]
+    cache = ChatCache(max_entries=2, ttl_s=10.0, clock=lambda: now[0])
+    inner = _ChatClient()
+    client = CachedChatClient(inner, cache)
+    q = [{"role": "user", "content": "hi"}]
+    assert client.chat(q, model="m")["content"] == "answer 1"
+    hit = client.chat(q, model="m")
+    assert hit["content"] == "answer 1" and hit["cached"] == "exact" and inner.chats == 1
+    # temperature and model are part of the key
+    client.chat(q, model="m", temperature=0.7)
+    client.chat(q, model="other")
+    assert inner.chats == 3 and len(cache) == 2
+    # the first entry was evicted by size
+    client.chat(q, model="m")
+    assert inner.chats == 4
+    now[0] = 11.0
+    client.chat(q, model="m")
+    assert inner.chats == 5
+    assert client.stats()["hits"] == 1
+
+
+def test_chat_cache_semantic_mode_reuses_close_questions_in_scope():
+    inner = _ChatClient()
+    client = CachedChatClient(inner, ChatCache(semantic_threshold=0.95))
+    system = {"role": "system", "content": "be brief"}
+    client.chat([system, {"role": "user", "content": "how to install?"}], model="m")
+    res = client.chat([system, {"role": "user", "content": "how do I install it"}], model="m")
+    assert res["cached"] == "semantic" and inner.chats == 1
+    # dissimilar question, or a different system prompt, goes to the model
+    client.chat([system, {"role": "user", "content": "what is the licence?"}], model="m")
+    client.chat(
+        [{"role": "system", "content": "be verbose"}, {"role": "user", "content": "install?"}],
+        model="m",
+    )
+    assert inner.chats == 3
+
+
+def test_cached_client_reports_hits_on_the_embed_total_event(fake_openai):
+    import kit_llm.client as client_mod
+    from kit_common.config import Settings
+
+    class _Embeddings:
+        def create(self, model, input, timeout):  # noqa: A002, ANN001, ARG002
+            return fake_openai.embedding_response([[float(len(t)), 1.0] for t in input])
+
+    class _Events(list):
+        def info(self, event, extra=None):  # noqa: ANN001
+            self.append((event, extra or {}))
+
+    fake_openai.install(embeddings=_Embeddings)
+    inner = client_mod.get_default_client(Settings(), cached=False)
+    client = CachedLLMClient(inner)
+    events = _Events()
+    inner._log = client._log = events  # type: ignore[attr-defined]
+    client.embed_texts(["a", "a", "b"], model="m")
+    client.embed_texts(["a", "a", "c"], model="m")
+    client.embed_array(["b", "c"], model="m")
+    assert client.stats() == {"hits": 3, "misses": 3, "hit_rate": 0.5}
+    totals = [extra for event, extra in events if event == "embed_total"]
+    # one embed_total per call, whether or not the wrapped client was reached
+    assert [(e["texts"], e["cache_hits"], e["cache_misses"]) for e in totals] == [
+        (2, 0, 2),
+        (1, 1, 1),
+        (0, 2, 0),
+    ]
+    assert totals[-1]["hit_rate"] == 1.0
+    assert {event for event, _ in events} == {"embed_batch", "embed_total"}
+
+
+def test_cached_client_counts_concurrent_calls():
+    from concurrent.futures import ThreadPoolExecutor
+
+    client = CachedLLMClient(_RecordingClient())
+    with ThreadPoolExecutor(max_workers=8) as ex:
+        list(ex.map(lambda i: client.embed_texts([f"t{i % 10}", "shared"], model="m"), range(200)))
+    stats = client.stats()
+    assert stats["hits"] + stats["misses"] == 400
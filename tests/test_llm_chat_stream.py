@@ -0,0 +1,191 @@
+from __future__ import annotations
+
+import asyncio
+import types
+
+import kit_llm.client as client_mod
+from kit_common.config import Settings
+from kit_llm.chat import achat_stream, chat_stream
+from kit_llm.client import get_default_client
+
+
+def _chunks():
+    def delta(**kw):  # noqa: ANN003
+        base = {"content": None, "tool_calls": None}
+        base.update(kw)
+        return types.SimpleNamespace(
+            choices=[types.SimpleNamespace(delta=types.SimpleNamespace(**base))]
+        )
+
+    fn = types.SimpleNamespace(name="lookup", arguments='{"q": ')
+    tc = types.SimpleNamespace(index=0, id="call_1", function=fn)
+    return [
+        delta(content="Hel"),
+        delta(content="lo"),
+        delta(tool_calls=[tc]),
+        types.SimpleNamespace(choices=[]),
+    ]
+
+
+class _StreamCompletions:
+    def __init__(self):
+        self.kwargs: dict = {}
+
+    def create(self, **kwargs):  # noqa: ANN003
+        self.kwargs = kwargs
+        return iter(_chunks())
+
+
+class _AsyncStreamCompletions:
+    async def create(self, **kwargs):  # noqa: ANN003
+        async def _gen():
+            for c in _chunks():
+                yield c
+
+        return _gen()
+
+
+class _Log:
+    def __init__(self):
+        self.records: list[tuple[str, dict]] = []
+
+    def info(self, msg, extra=None):  # noqa: ANN001
+        self.records.append((msg, extra or {}))
+
+
+def test_chat_stream_yields_deltas_and_logs_ttft(monkeypatch, fake_openai):
+    fake_openai.install(completions=_StreamCompletions)
+    client = get_default_client(Settings(llm_chat_model="m"), cached=False)
+    log = _Log()
+    client._log = log
+    events = list(client.chat_stream([{"role": "user", "content": "hi"}]))
+    assert "".join(e["content"] for e in events if e["type"] == "content") == "Hello"
+    assert events[-1] == {
+        "type": "tool_call",
+        "index": 0,
+        "id": "call_1",
+        "name": "lookup",
+        "arguments": '{"q": ',
+    }
+    assert client._client.chat.completions.kwargs["stream"] is True
+    msg, extra = log.records[-1]
+    assert (
+        msg == "chat_call"
+        and extra["stream"]
+        and extra["chunks"] == 2
+        and extra["ttft_ms"] is not None
+    )
+
+    monkeypatch.setenv("LLM_CHAT_MODEL", "m")
+    assert [e["type"] for e in chat_stream([{"role": "user", "content": "hi"}], system="s")][
+        :2
+    ] == [
+        "content",
+        "content",
+    ]
+
+
+def test_achat_stream(monkeypatch, fake_openai):
+    fake_openai.install(completions=_AsyncStreamCompletions, asynchronous=True)
+    monkeypatch.setenv("LLM_CHAT_MODEL", "m")
+
+    async def _collect():
+        return [e async for e in achat_stream([{"role": "user", "content": "hi"}])]
+
+    events = asyncio.run(_collect())
+    assert [e.get("content") for e in events if e["type"] == "content"] == ["Hel", "lo"]
+    assert events[-1]["type"] == "tool_call"
+
+
+class _ClosingStream:
+    def __init__(self, chunks, fail_after=None):  # noqa: ANN001
+        self.chunks = list(chunks)
+        self.fail_after = fail_after
+        self.closed = False
+
+    def __iter__(self):
+        for i, c in enumerate(self.chunks):
+            if self.fail_after is not None and i == self.fail_after:
+                raise ConnectionResetError("peer reset")
+            yield c
+
+    def close(self):
+        self.closed = True
+
+
+def test_chat_stream_closes_stream_wraps_errors_and_validates_eagerly(fake_openai):
+    import pytest
+
+    from kit_common.errors import ConfigError
+    from kit_llm.errors import LLMError
+
+    streams: list[_ClosingStream] = []
+
+    class _Completions:
+        fail_after = None
+
+        def create(self, **kwargs):  # noqa: ANN003
+            streams.append(_ClosingStream(_chunks(), self.fail_after))
+            return streams[-1]
+
+    fake_openai.install(completions=_Completions)
+    client = get_default_client(Settings(llm_chat_model="m"), cached=False)
+    msgs = [{"role": "user", "content": "hi"}]
+
+    it = client.chat_stream(msgs)
+    assert next(it)["content"] == "Hel"
+    it.close()
+    assert streams[-1].closed
+
+    client._client.chat.completions.fail_after = 1
+    with pytest.raises(LLMError, match="peer reset"):
+        list(client.chat_stream(msgs))
+    assert streams[-1].closed
+
+    bare = get_default_client(Settings(), cached=False)
+    with pytest.raises(ConfigError):
+        bare.chat_stream(msgs)
+
+
+def test_async_chat_stream_closes_stream_and_validates_eagerly(fake_openai):
+    import pytest
+
+    from kit_common.errors import ConfigError
+
+    closed: list[bool] = []
+
+    class _AsyncStream:
+        def __init__(self):
+            self._it = iter(_chunks())
+
+        def __aiter__(self):
+            return self
+
+        async def __anext__(self):
+            try:
+                return next(self._it)
+            except StopIteration:
+                raise StopAsyncIteration from None
+
+        async def close(self):
+            closed.append(True)
+
+    class _Completions:
+        async def create(self, **kwargs):  # noqa: ANN003
+            return _AsyncStream()
+
+    fake_openai.install(completions=_Completions, asynchronous=True)
+    client = client_mod.get_default_async_client(Settings(llm_chat_model="m"), cached=False)
+
+    async def _first():
+        stream = client.chat_stream([{"role": "user", "content": "hi"}])
+        async for event in stream:
+            break
+        await stream.aclose()
+        return event
+
+    assert asyncio.run(_first())["content"] == "Hel"
+    assert closed == [True]
+    bare = client_mod.get_default_async_client(Settings(), cached=False)
+    with pytest.raises(ConfigError):
+        bare.chat_stream([{"role": "user", "content": "hi"}])
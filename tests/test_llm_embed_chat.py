@@ -95,3 +95,48 @@ def test_embed_requires_model(monkeypatch):
     with pytest.raises(ConfigError):
         embed_texts(["x"])  # no model configured
 
+
+def test_embed_texts_concurrent_batches_keep_order(fake_openai):
+    import threading
+    import time
+
+    in_flight = {"now": 0, "max": 0}
+    lock = threading.Lock()
+
+    class _SlowEmbeddings:
+        def create(self, model: str, input: list[str], timeout: float):  # noqa: ARG002
+            with lock:
+                in_flight["now"] += 1
+                in_flight["max"] = max(in_flight["max"], in_flight["now"])
+            time.sleep(0.02)
+            with lock:
+                in_flight["now"] -= 1
+            return fake_openai.embedding_response([[float(t), 1.0] for t in input])
+
+    fake_openai.install(embeddings=_SlowEmbeddings)
+    client = get_default_client(Settings(llm_embed_model="m"))
+    texts = [str(i) for i in range(20)]
+    vecs = client.embed_texts(texts, batch_size=3, normalize=False, concurrency=4)
+    assert [v[0] for v in vecs] == [float(i) for i in range(20)]
+    assert in_flight["max"] > 1
+
+
+def test_default_client_is_cached_per_settings(monkeypatch):
+    from kit_llm.client import clear_client_cache
+
+    _install_fake_openai(monkeypatch)
+    a = get_default_client(Settings(llm_embed_model="m1"))
+    assert get_default_client(Settings(llm_embed_model="m1")) is a
+    assert get_default_client(Settings(llm_embed_model="m2")) is not a
+    assert get_default_client(Settings(llm_embed_model="m1"), cached=False) is not a
+    clear_client_cache()
+    assert get_default_client(Settings(llm_embed_model="m1")) is not a
+
+
+def test_embed_array_returns_contiguous_float32(monkeypatch):
+    _install_fake_openai(monkeypatch)
+    client = get_default_client(Settings(llm_embed_model="m"))
+    arr = client.embed_array(["a", "b", "c", "d", "e"], batch_size=2)
+    assert arr.shape == (5, 1536) and arr.dtype == np.float32 and arr.flags["C_CONTIGUOUS"]
+    assert np.allclose(np.linalg.norm(arr, axis=1), 1.0, atol=1e-5)
+    assert np.allclose(arr, np.asarray(client.embed_texts(["a", "b", "c", "d", "e"], batch_size=2)))
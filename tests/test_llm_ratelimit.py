@@ -0,0 +1,121 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import kit_llm.client as client_mod
+from kit_common.config import Settings
+from kit_llm.client import _OpenAILLMClient
+from kit_llm.ratelimit import RateLimiter
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+    def sleep(self, s: float) -> None:
+        self.now += s
+
+
+def test_buckets_refill_and_reserve_in_order():
+    clock = _Clock()
+    limiter = RateLimiter(rpm=2, tpm=100, clock=clock, sleep=clock.sleep)
+    assert limiter.acquire(10) == 0
+    assert limiter.acquire(10) == 0
+    # request bucket is empty: one request refills in 30 s
+    assert limiter.acquire(10) == 30.0
+    # 30 s later the token bucket is full again (70 + 50, capped at 100);
+    # 150 tokens leave it 50 in debt, which takes another 30 s to repay
+    assert limiter.acquire(150) == 30.0
+    assert limiter.stats() == {"waits": 2, "waited_s": 60.0}
+
+
+def test_sqlite_backend_shares_quota_between_limiters(tmp_path: Path):
+    clock = _Clock()
+    db = str(tmp_path / "quota.db")
+    a = RateLimiter(rpm=1, path=db, clock=clock, sleep=clock.sleep)
+    b = RateLimiter(rpm=1, path=db, clock=clock, sleep=clock.sleep)
+    assert a.acquire() == 0
+    assert b.acquire() == 60.0
+    a.close()
+    b.close()
+
+
+def test_client_waits_for_capacity_before_each_call(monkeypatch, fake_openai):
+    clock = _Clock()
+    events: list[tuple[str, float]] = []
+
+    class _Embeddings:
+        def create(self, model: str, input: list[str], timeout: float):  # noqa: ARG002
+            events.append(("embed", clock.now))
+            return fake_openai.embedding_response([[1.0, 0.0] for _ in input])
+
+    fake_openai.install(embeddings=_Embeddings)
+    limiter = RateLimiter(rpm=60, tpm=8, clock=clock, sleep=clock.sleep)
+    client = _OpenAILLMClient(Settings(llm_embed_model="m"), rate_limiter=limiter)
+    # char estimator is fine here: 4 chars ~ 1 token
+    monkeypatch.setattr(client_mod, "get_token_estimator", lambda: _CharCount())
+    client.embed_texts(["aaaa"] * 4, batch_size=2, normalize=False)
+    assert [t - 1000.0 for _, t in events] == [0.0, 0.0]
+    client.embed_texts(["a" * 32], normalize=False)
+    # 4 of 8 tokens are left: the 8-token request waits for the other 4 (30 s)
+    assert events[-1][1] - 1000.0 == 30.0
+
+
+class _CharCount:
+    def count(self, text: str) -> int:
+        return len(text) // 4
+
+
+def test_retries_do_not_spend_quota_again(fake_openai):
+    from kit_common.retry import RetryPolicy
+
+    class _Flaky(Exception):
+        status_code = 503
+
+    attempts: list[int] = []
+
+    class _Embeddings:
+        def create(self, model: str, input: list[str], timeout: float):  # noqa: ARG002
+            attempts.append(1)
+            if len(attempts) < 3:
+                raise _Flaky("unavailable")
+            return fake_openai.embedding_response([[1.0]])
+
+    fake_openai.install(embeddings=_Embeddings)
+    clock = _Clock()
+    limiter = RateLimiter(rpm=60, clock=clock, sleep=clock.sleep)
+    policy = RetryPolicy(max_attempts=3, sleep=lambda _: None)
+    client = _OpenAILLMClient(
+        Settings(llm_embed_model="m"), retry_policy=policy, rate_limiter=limiter
+    )
+    client.embed_texts(["a"], normalize=False)
+    assert len(attempts) == 3
+    requests, _, _ = limiter._state
+    assert requests == 59.0
+
+
+def test_aacquire_runs_sqlite_reservation_off_the_event_loop(tmp_path: Path, monkeypatch):
+    import asyncio
+    import threading
+
+    clock = _Clock()
+    limiter = RateLimiter(rpm=60, path=str(tmp_path / "quota.db"), clock=clock)
+    threads: list[str] = []
+    reserve = limiter._reserve
+
+    def _spy(tokens: int) -> float:
+        threads.append(threading.current_thread().name)
+        return reserve(tokens)
+
+    monkeypatch.setattr(limiter, "_reserve", _spy)
+
+    async def _main() -> str:
+        await limiter.aacquire()
+        return threading.current_thread().name
+
+    loop_thread = asyncio.run(_main())
+    assert threads and threads[0] != loop_thread
+    limiter.close()
@@ -0,0 +1,163 @@
+from __future__ import annotations
+
+import pytest
+
+from kit_common.errors import ValidationError
+from kit_vector import CollectionParams, NumpyBackend, compile_filter
+from kit_vector.filters import matches
+
+
+def test_compile_filter_dsl_and_native_passthrough():
+    flt = {"tenant": "x", "page": {"gte": 3, "lt": 10}, "source": ["a", "b"], "lang": {"ne": "de"}}
+    assert compile_filter(flt) == {
+        "must": [
+            {"key": "tenant", "match": {"value": "x"}},
+            {"key": "page", "range": {"gte": 3, "lt": 10}},
+            {"key": "source", "match": {"any": ["a", "b"]}},
+        ],
+        "must_not": [{"key": "lang", "match": {"value": "de"}}],
+    }
+    native = {"should": [{"key": "tenant", "match": {"value": "x"}}]}
+    assert compile_filter(native) is native
+    assert compile_filter({}) is None and compile_filter(None) is None
+    assert compile_filter({"doc_id": None}) == {"must": [{"is_empty": {"key": "doc_id"}}]}
+    with pytest.raises(ValidationError):
+        compile_filter({"page": {"between": [1, 2]}})
+    with pytest.raises(ValidationError):
+        compile_filter({"must": [{"key": "tenant", "match": {"value": "x"}}], "page": 3})
+
+
+def test_matches_evaluates_dsl_and_nested_keys():
+    payload = {"tenant": "x", "page": 4, "metadata": {"lang": "en"}}
+    assert matches(payload, {"tenant": "x", "page": {"gte": 3}})
+    assert not matches(payload, {"tenant": "x", "page": {"gt": 4}})
+    assert matches(payload, {"metadata.lang": {"in": ["en", "ru"]}})
+    assert not matches(payload, {"metadata.lang": {"nin": ["en"]}})
+    assert matches(payload, {"source": None})
+    assert matches(payload, None)
+
+
+def test_numpy_backend_payload_index_narrows_filtered_search():
+    backend = NumpyBackend()
+    params = CollectionParams(
+        name="c",
+        vector_size=2,
+        distance="dot",
+        payload_indexes={"tenant": "keyword", "page": "integer"},
+    )
+    backend.ensure_collection(params)
+    payloads = [{"tenant": f"t{i % 3}", "page": i} for i in range(30)]
+    backend.upsert(
+        "c", [[1.0, float(i)] for i in range(30)], payloads, ids=[str(i) for i in range(30)]
+    )
+    res = backend.search("c", [0.0, 1.0], k=3, filter={"tenant": "t1", "page": {"lt": 20}})
+    assert [r.id for r in res] == ["19", "16", "13"]
+    # re-upserting moves a row to another tenant in the index
+    backend.upsert("c", [[1.0, 100.0]], [{"tenant": "t2", "page": 1}], ids=["19"])
+    res = backend.search("c", [0.0, 1.0], k=1, filter={"tenant": ["t1"]})
+    assert [r.id for r in res] == ["28"]
+    assert backend.search("c", [0.0, 1.0], k=1, filter={"tenant": "t2"})[0].id == "19"
+
+
+@pytest.mark.filterwarnings("ignore::UserWarning")
+def test_none_filter_agrees_between_python_and_qdrant(monkeypatch):
+    qdrant_client = pytest.importorskip("qdrant_client")
+    import kit_vector.qdrant_backend as qb
+    from kit_vector import QdrantBackend
+
+    payloads = [{"doc_id": "d"}, {"doc_id": None}, {}, {"doc_id": []}]
+    ids = [f"00000000-0000-0000-0000-00000000000{i}" for i in range(4)]
+    expected = {ids[i] for i, p in enumerate(payloads) if matches(p, {"doc_id": None})}
+    assert expected == set(ids[1:])
+    # a native is_null only matches an explicit null
+    native = {"must": [{"is_null": {"key": "doc_id"}}]}
+    assert [matches(p, native) for p in payloads] == [False, True, False, False]
+
+    monkeypatch.setattr(qb, "QdrantClient", lambda **_: qdrant_client.QdrantClient(":memory:"))
+    backend = QdrantBackend(url="http://localhost:6333")
+    backend.ensure_collection(CollectionParams(name="n", vector_size=2, distance="dot"))
+    backend.upsert("n", [[1.0, 0.0]] * 4, payloads, ids=ids)
+    hits = backend.search("n", [1.0, 0.0], k=10, filter={"doc_id": None})
+    assert {h.id for h in hits} == expected
+    hits = backend.search("n", [1.0, 0.0], k=10, filter=native)
+    assert {h.id for h in hits} == {ids[1]}
+
+
+@pytest.mark.filterwarnings("ignore::UserWarning")
+def test_list_payloads_agree_between_python_numpy_and_qdrant(monkeypatch):
+    qdrant_client = pytest.importorskip("qdrant_client")
+    import kit_vector.qdrant_backend as qb
+    from kit_vector import QdrantBackend
+
+    payloads = [
+        {"tags": ["a", "b"], "n": [1, 5]},
+        {"tags": ["a"], "n": [7]},
+        {"tags": ["c", "d"], "n": 3},
+        {"tags": [], "n": []},
+        {},
+        {"tags": "a", "n": None},
+        {"tags": None},
+    ]
+    ids = [f"00000000-0000-0000-0000-00000000000{i}" for i in range(len(payloads))]
+    filters = [
+        {"tags": "a"},
+        {"tags": ["a", "d"]},
+        {"tags": {"nin": ["a"]}},
+        {"tags": {"nin": ["a", "b"]}},
+        {"tags": {"ne": "a"}},
+        {"n": {"gte": 4}},
+        {"n": {"lt": 4}},
+        {"tags": "a", "n": {"gt": 2}},
+    ]
+    params = CollectionParams(
+        name="p", vector_size=2, distance="dot", payload_indexes={"tags": "keyword"}
+    )
+    numpy_backend = NumpyBackend()
+    numpy_backend.ensure_collection(params)
+    numpy_backend.upsert("p", [[1.0, 0.0]] * len(payloads), payloads, ids=ids)
+    monkeypatch.setattr(qb, "QdrantClient", lambda **_: qdrant_client.QdrantClient(":memory:"))
+    qdrant_backend = QdrantBackend(url="http://localhost:6333")
+    qdrant_backend.ensure_collection(params)
+    qdrant_backend.upsert("p", [[1.0, 0.0]] * len(payloads), payloads, ids=ids)
+
+    for flt in filters:
+        expected = {ids[i] for i, p in enumerate(payloads) if matches(p, flt)}
+        for backend in (numpy_backend, qdrant_backend):
+            hits = backend.search("p", [1.0, 0.0], k=10, filter=flt)
+            assert {h.id for h in hits} == expected, (flt, backend)
+    assert {i for i, p in enumerate(payloads) if matches(p, {"tags": "a"})} == {0, 1, 5}
+    assert {i for i, p in enumerate(payloads) if matches(p, {"tags": {"nin": ["a"]}})} == {0, 2}
+
+
+def test_numpy_backend_indexes_exact_match_fields_and_logs_scans_once(monkeypatch):
+    import kit_vector.numpy_backend as nb
+
+    class _Events(list):
+        def info(self, event, extra=None):  # noqa: ANN001
+            self.append((event, extra or {}))
+
+    backend = NumpyBackend()
+    backend._log = events = _Events()  # type: ignore[assignment]
+    backend.ensure_collection(CollectionParams(name="c", vector_size=2, distance="dot"))
+    payloads = [{"tenant": f"t{i % 10}", "page": i} for i in range(100)]
+    vectors = [[1.0, float(i)] for i in range(100)]
+    backend.upsert("c", vectors, payloads, ids=[str(i) for i in range(100)])
+    checked: list[dict] = []
+
+    def _spy(payload, flt):  # noqa: ANN001
+        checked.append(payload)
+        return matches(payload, flt)
+
+    monkeypatch.setattr(nb, "matches", _spy)
+    res = backend.search("c", [0.0, 1.0], k=2, filter={"tenant": "t3"})
+    assert [r.id for r in res] == ["93", "83"]
+    # the undeclared field was indexed, so only its ten rows were tested
+    assert len(checked) == 10 and "tenant" in backend._collections["c"].index
+    backend.upsert("c", [[1.0, 500.0]], [{"tenant": "t3", "page": 0}], ids=["0"])
+    assert backend.search("c", [0.0, 1.0], k=1, filter={"tenant": "t3"})[0].id == "0"
+
+    checked.clear()
+    for _ in range(3):
+        backend.search("c", [0.0, 1.0], k=1, filter={"page": {"gte": 50}})
+    assert len(checked) == 300
+    assert [extra["fields"] for event, extra in events if event == "filter_scan"] == [["page"]]
@@ -0,0 +1,152 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from kit_common.config import Settings
+from kit_common.errors import ValidationError
+from kit_vector import CollectionParams, NumpyBackend, get_default_backend
+
+
+def _backend() -> NumpyBackend:
+    backend = NumpyBackend()
+    backend.ensure_collection(CollectionParams(name="c", vector_size=3, distance="cosine"))
+    vecs = np.array([[1, 0, 0], [0, 1, 0], [0, 0, 1], [1, 1, 0]], dtype=np.float32)
+    payloads = [
+        {"tenant": "a", "n": 1},
+        {"tenant": "b", "n": 2},
+        {"tenant": "a", "n": 3},
+        {"tenant": "b", "n": 4},
+    ]
+    backend.upsert("c", vecs, payloads, ids=["x", "y", "z", "w"])
+    return backend
+
+
+def test_numpy_backend_cosine_top_k_and_filters():
+    backend = _backend()
+    res = backend.search("c", [2.0, 0.0, 0.0], k=2)
+    assert [r.id for r in res] == ["x", "w"]
+    assert res[0].score == pytest.approx(1.0)
+    res = backend.search(
+        "c", [1.0, 0.0, 0.0], k=5, filter={"must": [{"key": "tenant", "match": {"value": "b"}}]}
+    )
+    assert [r.id for r in res] == ["w", "y"]
+    flt = {
+        "must": [{"key": "n", "range": {"gte": 2}}],
+        "must_not": [{"key": "tenant", "match": {"value": "b"}}],
+    }
+    assert [r.id for r in backend.search("c", [1.0, 0.0, 0.0], filter=flt)] == ["z"]
+
+    # upsert of an existing id replaces it in place
+    backend.upsert("c", [[0.0, 0.0, 1.0]], [{"tenant": "a"}], ids=["x"])
+    assert backend.count("c") == 4
+    assert {r.id for r in backend.search("c", [0.0, 0.0, 1.0], k=2)} == {"x", "z"}
+
+    batch = backend.search_batch(
+        "c", np.eye(3, dtype=np.float32), k=1, filter=[None, None, {"must": []}]
+    )
+    assert [hits[0].id for hits in batch] == ["w", "y", batch[2][0].id]
+    assert batch[2][0].id in {"x", "z"}
+    with pytest.raises(ValidationError):
+        backend.search_batch("c", np.eye(3, dtype=np.float32), filter=[None, None])
+    with pytest.raises(ValidationError):
+        backend.search("missing", [1.0, 0.0, 0.0])
+
+
+def test_numpy_backend_save_load_and_mmap(tmp_path: Path):
+    backend = _backend()
+    backend.save(str(tmp_path))
+    for mmap in (False, True):
+        again = NumpyBackend.load(str(tmp_path), mmap=mmap)
+        assert [r.id for r in again.search("c", [0.0, 1.0, 0.0], k=1)] == ["y"]
+        assert again.search("c", [0.0, 1.0, 0.0], k=1)[0].payload == {"tenant": "b", "n": 2}
+        # writes after mapping go to copy-on-write pages and an in-memory tail
+        again.upsert("c", [[0.0, 1.0, 1.0]], [{}], ids=["v"])
+        assert again.count("c") == 5
+
+
+def test_default_backend_selected_by_settings(tmp_path: Path):
+    backend = get_default_backend(Settings(vector_backend="numpy", vector_path=str(tmp_path)))
+    assert isinstance(backend, NumpyBackend) and backend.path == str(tmp_path)
+    with pytest.raises(ValueError):
+        get_default_backend(Settings(vector_backend="nope"))
+
+
+@pytest.mark.parametrize("quantization", ["scalar", "binary"])
+def test_numpy_backend_quantized_search_rescores_with_floats(tmp_path: Path, quantization):
+    rng = np.random.default_rng(0)
+    data = rng.standard_normal((500, 32)).astype(np.float32)
+    queries = data[:20] + 0.05 * rng.standard_normal((20, 32)).astype(np.float32)
+    params = CollectionParams(
+        name="q", vector_size=32, distance="cosine", quantization=quantization, oversampling=4.0
+    )
+    backend = NumpyBackend()
+    backend.ensure_collection(params)
+    backend.upsert("q", data, [{"i": i} for i in range(500)], ids=[str(i) for i in range(500)])
+    hits = backend.search_batch("q", queries, k=3)
+    assert [h[0].id for h in hits] == [str(i) for i in range(20)]
+    # rescored results carry exact cosine scores
+    exact = float(data[0] @ queries[0] / np.linalg.norm(data[0]) / np.linalg.norm(queries[0]))
+    assert hits[0][0].score == pytest.approx(exact, rel=1e-5)
+
+    backend.save(str(tmp_path))
+    again = NumpyBackend.load(str(tmp_path), mmap=True)
+    assert [h[0].id for h in again.search_batch("q", queries[:5], k=1)] == ["0", "1", "2", "3", "4"]
+
+
+def test_numpy_backend_delete_swaps_last_row_and_keeps_indexes(tmp_path: Path):
+    params = CollectionParams(
+        name="d",
+        vector_size=3,
+        distance="cosine",
+        quantization="scalar",
+        payload_indexes={"tenant": "keyword"},
+    )
+    backend = NumpyBackend()
+    backend.ensure_collection(params)
+    vecs = np.array([[1, 0, 0], [0, 1, 0], [0, 0, 1], [1, 1, 0]], dtype=np.float32)
+    payloads = [{"tenant": "a"}, {"tenant": "b"}, {"tenant": "a"}, {"tenant": "b"}]
+    backend.upsert("d", vecs, payloads, ids=["x", "y", "z", "w"])
+    assert backend.delete("d", ["y", "missing"]) == 1
+    assert backend.count("d") == 3
+    assert [r.id for r in backend.search("d", [0.0, 1.0, 0.0], k=1)] == ["w"]
+    assert [r.id for r in backend.search("d", [0.0, 1.0, 0.0], filter={"tenant": "b"})] == ["w"]
+    hits = backend.search("d", [1.0, 0.0, 0.0], filter={"tenant": "a"})
+    assert {r.id for r in hits} == {"x", "z"}
+
+    backend.save(str(tmp_path))
+    again = NumpyBackend.load(str(tmp_path), mmap=True)
+    assert again.delete("d", ["x"]) == 1
+    assert {r.id for r in again.search("d", [1.0, 0.0, 0.0], k=5)} == {"z", "w"}
+
+
+def test_numpy_backend_mmap_keeps_codes_on_disk_and_grows_without_copying(tmp_path: Path):
+    rng = np.random.default_rng(1)
+    data = rng.standard_normal((300, 16)).astype(np.float32)
+    params = CollectionParams(name="m", vector_size=16, distance="cosine", quantization="scalar")
+    backend = NumpyBackend()
+    backend.ensure_collection(params)
+    backend.ensure_collection(CollectionParams(name="empty", vector_size=16, distance="dot"))
+    backend.upsert("m", data, [{"i": i} for i in range(300)], ids=[str(i) for i in range(300)])
+    backend.save(str(tmp_path))
+    assert (tmp_path / "m.codes.npy").exists() and (tmp_path / "m.scales.npy").exists()
+
+    again = NumpyBackend.load(str(tmp_path), mmap=True)
+    col = again._collections["m"]
+    # codes are mapped from disk, not re-quantized from the floats
+    assert isinstance(col.codes.head, np.memmap) and isinstance(col.matrix.head, np.memmap)
+    extra = rng.standard_normal((50, 16)).astype(np.float32)
+    again.upsert("m", extra, [{}] * 50, ids=[f"n{i}" for i in range(50)])
+    again.delete("m", ["0", "n3"])
+    assert isinstance(col.matrix.head, np.memmap) and isinstance(col.codes.head, np.memmap)
+    assert again.count("m") == 348
+    assert again.search("m", extra[7], k=1)[0].id == "n7"
+    assert again.search("m", data[5], k=1)[0].id == "5"
+
+    again.save(str(tmp_path / "out"))
+    final = NumpyBackend.load(str(tmp_path / "out"))
+    assert final.count("m") == 348 and final.count("empty") == 0
+    assert final.search("m", extra[7], k=1)[0].id == "n7"
+    assert final.search("m", data[299], k=1)[0].id == "299"
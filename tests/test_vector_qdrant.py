@@ -5,7 +5,7 @@ import os
 import pytest
 
 from kit_vector import QdrantBackend, CollectionParams
-from kit_common.errors import ExternalServiceError
+from kit_common.errors import ExternalServiceError, ValidationError
 
 
 def test_qdrant_backend_init_without_client(monkeypatch):
@@ -34,3 +34,244 @@ def test_qdrant_e2e_small(monkeypatch):
     res = backend.search(params.name, vectors[1], k=2)
     assert len(res) >= 1
     assert res[0].id in ids
+
+
+class _FakeQdrantClient:
+    def __init__(self, *args, **kwargs):  # noqa: ANN002, ANN003
+        self.calls: list[tuple[str, dict]] = []
+
+    def __getattr__(self, name):  # noqa: ANN001
+        def _record(**kwargs):  # noqa: ANN003
+            self.calls.append((name, kwargs))
+            return []
+
+        return _record
+
+
+def test_qdrant_upsert_and_search_accept_ndarray(monkeypatch):
+    import numpy as np
+
+    import kit_vector.qdrant_backend as qb
+
+    monkeypatch.setattr(qb, "QdrantClient", _FakeQdrantClient)
+    backend = QdrantBackend(url="http://localhost:6333")
+    vecs = np.eye(3, dtype=np.float32)
+    n = backend.upsert("c", vecs, [{"text": "a"}], ids=["a", "b", "c"])
+    assert n == 3
+    name, kwargs = backend._client.calls[-1]
+    assert name == "upload_collection"
+    assert kwargs["vectors"] is vecs
+    assert kwargs["payload"] == [{"text": "a"}, {}, {}]
+    backend.search("c", vecs[0], k=2)
+    name, kwargs = backend._client.calls[-1]
+    assert kwargs["query_vector"] is not None and isinstance(kwargs["query_vector"], np.ndarray)
+
+
+def test_qdrant_upsert_many_sends_columnar_batches_with_final_barrier(monkeypatch):
+    import numpy as np
+
+    import kit_vector.qdrant_backend as qb
+
+    monkeypatch.setattr(qb, "QdrantClient", _FakeQdrantClient)
+    backend = QdrantBackend(url="http://localhost:6333", prefer_grpc=True)
+    vecs = np.arange(20, dtype=np.float32).reshape(10, 2)
+    ids = [f"id{i}" for i in range(10)]
+    n = backend.upsert_many("c", vecs, [{"i": i} for i in range(10)], ids, batch_size=3, parallel=2)
+    assert n == 10
+    calls = [kw for name, kw in backend._client.calls if name == "upsert"]
+    assert [len(kw["points"].ids) for kw in calls] == [3, 3, 3, 1]
+    # every batch is fire-and-forget; a waiting no-op delete on all shards is the barrier
+    assert [kw["wait"] for kw in calls] == [False, False, False, False]
+    name, kwargs = backend._client.calls[-1]
+    assert name == "delete" and kwargs["wait"] is True
+    assert kwargs["points_selector"].filter.must[0].has_id == []
+    assert calls[-1]["points"].ids == ["id9"] and calls[-1]["points"].payloads == [{"i": 9}]
+    assert sorted(i for kw in calls for i in kw["points"].ids) == sorted(ids)
+
+    # plain upsert goes through the same columnar path and waits for every batch
+    backend.upsert("c", [[0.0, 1.0]], [{"text": "a"}], ids=["x"])
+    name, kwargs = backend._client.calls[-1]
+    assert name == "upsert" and kwargs["wait"] is True and kwargs["points"].vectors == [[0.0, 1.0]]
+
+
+def test_qdrant_search_batch_is_one_request_in_query_order(monkeypatch):
+    import types
+
+    import numpy as np
+
+    import kit_vector.qdrant_backend as qb
+
+    class _BatchClient(_FakeQdrantClient):
+        def _hits(self, requests):  # noqa: ANN001
+            self.calls.append(("batch", {"requests": requests}))
+            return [
+                [
+                    types.SimpleNamespace(id=i, score=1.0 - j / 10, payload={"q": i})
+                    for j in range(2)
+                ]
+                for i, _ in enumerate(requests)
+            ]
+
+        def search_batch(self, collection_name, requests):  # noqa: ANN001, ARG002
+            return self._hits(requests)
+
+        def query_batch_points(self, collection_name, requests):  # noqa: ANN001, ARG002
+            return [types.SimpleNamespace(points=h) for h in self._hits(requests)]
+
+    monkeypatch.setattr(qb, "QdrantClient", _BatchClient)
+    backend = QdrantBackend(url="http://localhost:6333")
+    queries = np.eye(3, dtype=np.float32)
+    filters = [None, {"must": [{"key": "tenant", "match": {"value": "a"}}]}, None]
+    res = backend.search_batch("c", queries, k=2, filter=filters)
+    # one search request, after a one-off lookup of the collection's quantization config
+    assert [name for name, _ in backend._client.calls] == ["get_collection", "batch"]
+    assert [[r.payload["q"] for r in hits] for hits in res] == [[0, 0], [1, 1], [2, 2]]
+    requests = backend._client.calls[1][1]["requests"]
+    assert requests[0].filter is None and requests[1].filter is not None
+    assert requests[2].limit == 2 and requests[2].with_payload is True
+    assert backend.search_batch("c", []) == []
+    with pytest.raises(ValidationError):
+        backend.search_batch("c", queries, filter=filters[:2])
+
+
+def test_qdrant_quantization_config_and_search_params(monkeypatch):
+    import kit_vector.qdrant_backend as qb
+
+    monkeypatch.setattr(qb, "QdrantClient", _FakeQdrantClient)
+    backend = QdrantBackend(url="http://localhost:6333")
+    params = CollectionParams(
+        name="q", vector_size=4, distance="cosine", quantization="binary", on_disk=True
+    )
+    backend.ensure_collection(params)
+    name, kwargs = backend._client.calls[-1]
+    assert name == "create_collection"
+    assert kwargs["vectors_config"].on_disk is True
+    assert kwargs["quantization_config"].binary.always_ram is True
+    backend.search("q", [0.0, 1.0, 0.0, 0.0], k=2)
+    sp = backend._client.calls[-1][1]["search_params"]
+    assert sp.quantization.rescore is True and sp.quantization.oversampling == 2.0
+
+    backend.ensure_collection(
+        CollectionParams(name="s", vector_size=4, distance="dot", quantization="scalar")
+    )
+    assert backend._client.calls[-1][1]["quantization_config"].scalar.type == qb.ScalarType.INT8
+    backend.search("plain", [0.0, 1.0, 0.0, 0.0])
+    assert backend._client.calls[-1][1]["search_params"] is None
+
+
+def test_qdrant_payload_indexes_and_filter_dsl(monkeypatch):
+    import types
+
+    import kit_vector.qdrant_backend as qb
+
+    class _ExistingCollection(_FakeQdrantClient):
+        def collection_exists(self, collection_name):  # noqa: ANN001, ARG002
+            return True
+
+        def get_collection(self, collection_name):  # noqa: ANN001, ARG002
+            return types.SimpleNamespace(payload_schema={"tenant": object()})
+
+    monkeypatch.setattr(qb, "QdrantClient", _ExistingCollection)
+    backend = QdrantBackend(url="http://localhost:6333")
+    params = CollectionParams(
+        name="c",
+        vector_size=4,
+        distance="cosine",
+        payload_indexes={"tenant": "keyword", "page": "integer"},
+    )
+    backend.ensure_collection(params)
+    created = [kw for name, kw in backend._client.calls if name == "create_payload_index"]
+    assert [(kw["field_name"], kw["field_schema"]) for kw in created] == [
+        ("page", qb.PayloadSchemaType.INTEGER)
+    ]
+
+    backend.search("c", [0.0, 1.0, 0.0, 0.0], filter={"tenant": "x", "page": {"gte": 3}})
+    qfilter = backend._client.calls[-1][1]["query_filter"]
+    assert qfilter.must[0].key == "tenant" and qfilter.must[0].match.value == "x"
+    assert qfilter.must[1].range.gte == 3
+
+
+def test_qdrant_delete_by_point_ids(monkeypatch):
+    import kit_vector.qdrant_backend as qb
+
+    monkeypatch.setattr(qb, "QdrantClient", _FakeQdrantClient)
+    backend = QdrantBackend(url="http://localhost:6333")
+    assert backend.delete("c", []) == 0
+    assert backend._client.calls == []
+    assert backend.delete("c", ["a", "b"]) == 2
+    name, kwargs = backend._client.calls[-1]
+    assert name == "delete"
+    assert kwargs["points_selector"].points == ["a", "b"]
+    assert kwargs["wait"] is True
+
+
+@pytest.mark.filterwarnings("ignore::UserWarning")
+def test_qdrant_backend_against_in_memory_client(monkeypatch):
+    import numpy as np
+
+    import kit_vector.qdrant_backend as qb
+
+    qdrant_client = pytest.importorskip("qdrant_client")
+    monkeypatch.setattr(qb, "QdrantClient", lambda **_: qdrant_client.QdrantClient(":memory:"))
+    backend = QdrantBackend(url="http://localhost:6333")
+    params = CollectionParams(
+        name="mem",
+        vector_size=3,
+        distance="cosine",
+        quantization="scalar",
+        payload_indexes={"tenant": "keyword"},
+    )
+    backend.ensure_collection(params)
+    vecs = np.array([[1, 0, 0], [0, 1, 0], [0, 0, 1], [1, 1, 0]], dtype=np.float32)
+    payloads = [{"tenant": "a"}, {"tenant": "b"}, {"tenant": "a"}, {"tenant": "b"}]
+    ids = [f"00000000-0000-0000-0000-00000000000{i}" for i in range(4)]
+    backend.upsert("mem", vecs.tolist(), payloads, ids=ids)
+
+    res = backend.search("mem", vecs[0], k=2)
+    assert [r.id for r in res] == [ids[0], ids[3]]
+    assert res[0].payload == {"tenant": "a"}
+    res = backend.search("mem", [1.0, 0.0, 0.0], k=5, filter={"tenant": "b"})
+    assert [r.id for r in res] == [ids[3], ids[1]]
+    batch = backend.search_batch("mem", vecs[[1, 3]], k=1, filter=[None, {"tenant": "a"}])
+    assert [[r.id for r in hits] for hits in batch] == [[ids[1]], [ids[0]]]
+    assert backend.delete("mem", [ids[0]]) == 1
+    assert [r.id for r in backend.search("mem", vecs[0], k=1)] == [ids[3]]
+    # the fire-and-forget bulk path ends with a barrier that deletes nothing
+    assert backend.upsert_many("mem", vecs[:1], [{"tenant": "a"}], ids[:1], batch_size=1) == 1
+    assert backend._client.count("mem").count == 4
+
+
+def test_qdrant_search_params_for_collection_set_up_elsewhere(monkeypatch):
+    import types
+
+    import kit_vector.qdrant_backend as qb
+
+    class _ExistingCollections(_FakeQdrantClient):
+        def get_collection(self, collection_name):  # noqa: ANN001
+            self.calls.append(("get_collection", {"collection_name": collection_name}))
+            quantized = qb.ScalarQuantization(
+                scalar=qb.ScalarQuantizationConfig(type=qb.ScalarType.INT8)
+            )
+            config = types.SimpleNamespace(
+                quantization_config=quantized if collection_name == "quant" else None
+            )
+            return types.SimpleNamespace(config=config)
+
+    monkeypatch.setattr(qb, "QdrantClient", _ExistingCollections)
+    # a second backend, e.g. a fresh process, searches without calling ensure_collection
+    backend = QdrantBackend(url="http://localhost:6333")
+    backend.search("quant", [1.0, 0.0, 0.0])
+    backend.search("quant", [0.0, 1.0, 0.0])
+    backend.search_batch("quant", [[1.0, 0.0, 0.0]])
+    backend.search("plain", [1.0, 0.0, 0.0])
+    calls = backend._client.calls
+    assert [kw["collection_name"] for name, kw in calls if name == "get_collection"] == [
+        "quant",
+        "plain",
+    ]
+    searches = [kw for name, kw in calls if name == "search"]
+    sp = searches[0]["search_params"]
+    assert sp.quantization.rescore is True and sp.quantization.oversampling == 2.0
+    assert searches[1]["search_params"] is sp and searches[2]["search_params"] is None
+    batch = [kw for name, kw in calls if name in ("search_batch", "query_batch_points")]
+    assert batch[0]["requests"][0].params is sp
@@ -0,0 +1,86 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+from kit_common.models import Chunk, SearchResult
+from kit_vector import BM25Index, CollectionParams, NumpyBackend, hybrid_search, rrf_fuse
+
+_TEXTS = {
+    "a": "Replace filter cartridge AB-1234 every six months",
+    "b": "The pump uses cartridge XZ-77 and a standard filter",
+    "c": "Installation guide for the pump and the controller",
+    "d": "Warranty terms are described in article 5.1 of the contract",
+}
+
+
+def _index() -> BM25Index:
+    index = BM25Index()
+    chunks = [Chunk(id=k, text=v, metadata={"lang": "en"}) for k, v in _TEXTS.items()]
+    index.add_chunks(chunks)
+    return index
+
+
+def test_bm25_ranks_exact_keywords_and_supports_delete():
+    index = _index()
+    assert [r.id for r in index.search("ab-1234")] == ["a"]
+    assert [r.id for r in index.search("article 5.1")] == ["d"]
+    res = index.search("pump filter", k=2)
+    # "b" has both terms; the others have one each
+    assert len(res) == 2 and res[0].id == "b"
+    assert index.search("ab-1234")[0].payload["text"] == _TEXTS["a"]
+
+    assert index.delete(["a", "missing"]) == 1
+    assert index.search("ab-1234") == [] and len(index) == 3
+    # re-adding an id replaces its text
+    index.add(["b"], ["nothing relevant"])
+    assert "b" not in {r.id for r in index.search("pump")}
+    only_c = {"must": [{"key": "id", "match": {"value": "c"}}]}
+    assert [r.id for r in index.search("pump", filter=only_c)] == ["c"]
+
+
+def test_bm25_save_load_roundtrip(tmp_path: Path):
+    index = _index()
+    index.delete(["c"])
+    path = str(tmp_path / "bm25.npz")
+    index.save(path)
+    again = BM25Index.load(path)
+    assert len(again) == 3
+    for q in ("cartridge", "warranty contract", "pump"):
+        assert [(r.id, round(r.score, 5)) for r in again.search(q)] == [
+            (r.id, round(r.score, 5)) for r in index.search(q)
+        ]
+    again.add(["e"], ["cartridge cartridge cartridge"])
+    assert again.search("cartridge")[0].id == "e"
+
+
+def test_rrf_and_hybrid_search_combine_dense_and_sparse():
+    a = [SearchResult(id="x", score=0.9, payload={}), SearchResult(id="y", score=0.5, payload={})]
+    b = [
+        SearchResult(id="y", score=7.0, payload={"t": 1}),
+        SearchResult(id="z", score=3.0, payload={}),
+    ]
+    fused = rrf_fuse([a, b], k=3)
+    assert [r.id for r in fused] == ["y", "x", "z"]
+    assert fused[0].payload == {"t": 1}
+
+    backend = NumpyBackend()
+    backend.ensure_collection(CollectionParams(name="c", vector_size=2, distance="cosine"))
+    # dense vectors that know nothing about the part number
+    backend.upsert(
+        "c", [[1.0, 0.0], [0.9, 0.1], [0.0, 1.0], [0.1, 0.9]], [{}] * 4, ids=list(_TEXTS)
+    )
+    res = hybrid_search(backend, "c", _index(), "AB-1234", [0.0, 1.0], k=2, candidates=2)
+    assert "a" in {r.id for r in res}
+    assert backend.search("c", [0.0, 1.0], k=2)[0].id != "a"
+
+
+def test_bm25_repeated_id_in_one_add_keeps_the_last_text():
+    index = BM25Index()
+    assert index.add(["a", "a", "b"], ["apple pie", "apple tart", "banana"]) == 2
+    assert len(index) == 2
+    hits = index.search("apple")
+    assert [h.id for h in hits] == ["a"] and hits[0].score > 0
+    assert [h.id for h in index.search("tart")] == ["a"]
+    assert index.search("pie") == []
+    index.delete(["a"])
+    assert index.search("apple") == []